@@ -0,0 +1,145 @@
+from collections import namedtuple
+import queue
+import threading
+
+# One event time of a simulation streamed from a worker: the engine's events,
+# the ready-queue changes they caused (pushes carry the remaining burst at
+# that time, so the UI never reads the table the worker is changing), what each CPU is running afterwards
+# ((pid, remaining burst) or None per core) and the remaining burst of every
+# process that was preempted or completed.
+SimulationStep = namedtuple("SimulationStep", ["time", "events", "queue_ops", "running", "remaining"])
+
+
+class Cancelled(Exception):
+    """Raised inside a background job once it has been cancelled."""
+
+
+class BackgroundJob:
+    """
+    Runs target(job) on a daemon thread and hands its output to the Tk thread.
+
+    The target sends messages with job.put(), which blocks while the bounded
+    queue is full, so a fast producer can never run more than maxsize
+    messages ahead of the UI. job.progress() records the latest progress
+    without queueing. Both raise Cancelled once cancel() has been called, so
+    the worker stops at its next checkpoint. The UI calls drain() on a fixed
+    `after` cadence; once finished is True and the queue is empty, result or
+    error holds the target's outcome.
+    """
+
+    def __init__(self, target, maxsize=64, name="background-job"):
+        self.target = target
+        self.result = None
+        self.error = None
+        self.fraction = 0.0
+        self.status = ""
+        self._queue = queue.Queue(maxsize)
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def finished(self):
+        """True once the target has returned (or failed) and every message has been drained."""
+        return not self._thread.is_alive() and self._queue.empty()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def put(self, message):
+        """Queues a message for the UI, waiting for room; raises Cancelled if cancelled meanwhile."""
+        while True:
+            self.check()
+            try:
+                self._queue.put(message, timeout=0.05)
+                return
+            except queue.Full:
+                pass
+
+    def progress(self, fraction, status=None):
+        self.check()
+        self.fraction = fraction
+        if status is not None:
+            self.status = status
+
+    def drain(self, limit=None):
+        """Returns the queued messages (at most limit) without waiting."""
+        messages = []
+        while limit is None or len(messages) < limit:
+            try:
+                messages.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return messages
+
+    def _run(self):
+        try:
+            self.result = self.target(self)
+        except Cancelled:
+            pass
+        except Exception as e:
+            self.error = e
+
+
+class _QueueLog:
+    """Ready-queue listener that logs changes for the UI instead of drawing them."""
+
+    def __init__(self):
+        self.ops = []
+
+    def on_push(self, p, key):
+        self.ops.append(("push", p['pid'], key, p['remaining_burst']))
+
+    def on_pop(self, p):
+        self.ops.append(("pop", p['pid']))
+
+    def take(self):
+        ops, self.ops = self.ops, []
+        return ops
+
+
+def stream_engine(job, engine, recorder=None, chunk=256):
+    """
+    Job target: runs a scheduling engine to completion, putting lists of up to
+    chunk SimulationSteps. Each list is sent as (steps, horizon), where horizon
+    is the time of the engine's next event (None once finished): nothing
+    happens between the last step and the horizon, so the UI may show any
+    time before it. Returns the recorder's finished Trace, if given one.
+    """
+    log = _QueueLog()
+    for ready_queue in engine.ready_queues():
+        ready_queue.listener = log
+    if isinstance(engine.processes, list):
+        lookup = {p['pid']: p for p in engine.processes}
+    else:
+        lookup = engine.processes.pid_map()
+
+    steps = []
+    while not engine.finished:
+        t = engine.next_event_time()
+        events = engine.advance(t)
+        if recorder is not None:
+            recorder.record(events)
+        running = tuple(
+            None if p is None else (p['pid'], engine.remaining_at(t, core))
+            for core, p in enumerate(engine.running())
+        )
+        remaining = {event.pid: lookup[event.pid]['remaining_burst']
+                     for event in events if event.kind in ("preempt", "complete")}
+        steps.append(SimulationStep(t, events, log.take(), running, remaining))
+        if len(steps) >= chunk:
+            job.put((steps, engine.next_event_time()))
+            steps = []
+    job.put((steps, None))
+    return recorder.finish() if recorder is not None else None
@@ -0,0 +1,164 @@
+"""
+Headless batch runner for the scheduling simulator.
+
+Runs every combination of images, grid sizes, arrival modes, algorithms and
+(for Round Robin, MLFQ and CFS) time quanta across a process pool, and streams one result
+row per run to CSV or JSON Lines as soon as it finishes.
+
+Example:
+    python batch.py photo.jpg scan.png --grid-sizes 10 50 100 \\
+        --algorithms FCFS SJF "Round Robin" --quanta 2 4 8 -o results.csv
+"""
+import argparse
+import csv
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+from scheduler import ALGORITHMS, QUANTUM_ALGORITHMS, SchedulingEngine, average_times
+from metrics import SchedulingMetrics
+from workload import build_processes
+
+CANVAS_SIZE = 350       # Same grid canvas the GUI lays blocks over
+ARRIVAL_MODES = ("random", "zero")
+# Tail latencies and the other streaming metrics added to each row
+METRIC_FIELDS = (
+    "waiting_time_p50", "waiting_time_p95", "waiting_time_p99",
+    "turnaround_time_p50", "turnaround_time_p95", "turnaround_time_p99",
+    "response_time_mean", "response_time_p50", "response_time_p95", "response_time_p99",
+    "throughput", "utilization", "context_switches", "fairness_slowdown", "max_slowdown",
+)
+
+FIELDS = (
+    "image", "grid_size", "arrival", "seed", "algorithm", "time_quantum",
+    "processes", "avg_waiting_time", "avg_turnaround_time", "idle_time",
+    "makespan", "wall_time",
+) + METRIC_FIELDS
+
+
+@lru_cache(maxsize=8)
+def load_resized(path, size=CANVAS_SIZE):
+    """Decodes an image at canvas size once per worker process."""
+    from ingest import load_for_grid # Pillow is loaded on first decode, not on import
+    return load_for_grid(path, size)
+
+
+def run_config(config):
+    """Generates the workload for one configuration, schedules it and returns a result row."""
+    started = time.perf_counter()
+    img = load_resized(config['image'])
+    processes = build_processes(img, config['grid_size'], config['arrival'] == "random",
+                                random.Random(config['seed']))
+
+    engine = SchedulingEngine(processes, config['algorithm'], config['time_quantum'] or 1)
+    metrics = SchedulingMetrics(processes)
+    for event in engine.events():
+        metrics.record((event,))
+    avg_wait, avg_tat = average_times(engine.completed_processes)
+    summary = metrics.summary()
+
+    row = dict(config)
+    row.update({
+        "processes": len(processes),
+        "avg_waiting_time": round(avg_wait, 4),
+        "avg_turnaround_time": round(avg_tat, 4),
+        "idle_time": engine.total_idle_time,
+        "makespan": engine.time,
+        "wall_time": round(time.perf_counter() - started, 6),
+    })
+    row.update({name: round(summary[name], 4) for name in METRIC_FIELDS})
+    return row
+
+
+def iter_configs(images, grid_sizes, arrivals, algorithms, quanta, seed):
+    """Yields the Cartesian product of the sweep; the quantum only varies for QUANTUM_ALGORITHMS."""
+    for image, N, arrival, algorithm in itertools.product(images, grid_sizes, arrivals, algorithms):
+        for quantum in (quanta if algorithm in QUANTUM_ALGORITHMS else (None,)):
+            yield {
+                "image": image,
+                "grid_size": N,
+                "arrival": arrival,
+                "seed": seed,
+                "algorithm": algorithm,
+                "time_quantum": quantum,
+            }
+
+
+class RowWriter:
+    """Writes result rows as CSV or JSON Lines, flushing after each row."""
+
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=FIELDS)
+            self._csv.writeheader()
+
+    def write(self, row):
+        if self.fmt == "csv":
+            self._csv.writerow(row)
+        else:
+            self.stream.write(json.dumps(row) + "\n")
+        self.stream.flush()
+
+
+def positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be a non-negative integer: {value}")
+    return number
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run scheduling simulations headless over a parameter sweep.")
+    parser.add_argument("images", nargs="+", help="Source image files.")
+    parser.add_argument("--grid-sizes", nargs="+", type=positive_int, default=[10], metavar="N",
+                        help="Grid sizes N (N x N blocks). Default: 10.")
+    parser.add_argument("--arrivals", nargs="+", choices=ARRIVAL_MODES, default=list(ARRIVAL_MODES),
+                        help="Arrival modes. Default: both.")
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS),
+                        help="Scheduling algorithms. Default: all.")
+    parser.add_argument("--quanta", nargs="+", type=positive_int, default=[4], metavar="Q",
+                        help="Time quanta for Round Robin, MLFQ and CFS. Default: 4.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for random arrivals. Default: 0.")
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count(),
+                        help="Worker processes. Default: one per CPU.")
+    parser.add_argument("-o", "--output", default="-", help="Output file, or - for stdout (default).")
+    parser.add_argument("--format", choices=("csv", "jsonl"),
+                        help="Output format. Default: from the output extension, else csv.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fmt = args.format or ("jsonl" if args.output.endswith((".jsonl", ".json")) else "csv")
+    configs = list(iter_configs(args.images, args.grid_sizes, args.arrivals,
+                                args.algorithms, args.quanta, args.seed))
+
+    stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        writer = RowWriter(stream, fmt)
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(run_config, config) for config in configs]
+            for done, future in enumerate(as_completed(futures), 1):
+                writer.write(future.result())
+                print(f"[{done}/{len(futures)}] runs complete", file=sys.stderr)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+Benchmark suite for the simulator's hot paths.
+
+Times process generation, the scheduling loop for every algorithm and the
+drawing paths (draw_image_block, draw_gantt_block, update_ready_queue_listbox)
+on synthetic images, and reports ticks per second, peak memory and Tk canvas
+item counts. Drawing needs a display; on a headless machine run it under a
+virtual one (e.g. `xvfb-run python benchmark.py`), otherwise it is skipped.
+
+Start-up is timed too: each headless module is imported in a fresh
+interpreter, and the run fails if one of them pulls in Tk or Pillow, so the
+scheduling core stays usable on machines without a display. With a display,
+building the main window is timed as well.
+
+Every case runs --repeat times and reports the median. Results can be saved
+as a JSON baseline; later runs compared against it exit with status 1 when
+a metric regresses past the threshold. Timings must also grow by more than
+the noise floor, and import times are reported but never gated on.
+
+Example:
+    python benchmark.py --save baseline.json
+    python benchmark.py --baseline baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from scheduler import ALGORITHMS, SchedulingEngine
+from workload import build_processes, resize_for_grid
+
+CANVAS_SIZE = 350
+HIGHER_IS_BETTER = ("ticks_per_second",)
+NOISE_FLOOR = 0.005             # Seconds a timing may grow by before it counts as a regression
+# Reported only: a fresh interpreter's import time swings more than any threshold
+UNGATED = ("startup/import ",)
+DRAW_PATHS = ("draw_image_block", "draw_gantt_block", "update_ready_queue_listbox")
+# Modules scripts and batch nodes import; none of them may load GUI_MODULES
+HEADLESS_MODULES = (
+    "scheduler", "smp", "ready_queue", "process_table", "workload", "metrics", "replay",
+    "background", "synthetic", "batch", "compare", "tuning",
+)
+GUI_MODULES = ("tkinter", "PIL")
+IMPORT_PROBE = (
+    "import sys, time\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "print(time.perf_counter() - started)\n"
+    "print(' '.join(name for name in {gui!r} if name in sys.modules))\n"
+)
+
+
+def synthetic_image(size=1024, seed=0):
+    """Deterministic test image: smooth gradients with noisy patches, so burst times vary."""
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size]
+    base = (x + y) * 255.0 / (2 * size)
+    noise = rng.normal(0, 60, (size, size)) * (np.sin(x / 37.0) * np.cos(y / 53.0) > 0)
+    gray = np.clip(base + noise, 0, 255).astype(np.uint8)
+    return Image.fromarray(np.stack([gray, np.roll(gray, 7, axis=1), gray[::-1]], axis=2))
+
+
+def measure(func, repeat=1):
+    """
+    Returns (median seconds over repeat runs, peak traced KiB, last result).
+    Memory is traced in one extra run, so tracing does not skew the timings.
+    """
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1024, result
+
+
+def median_results(runs):
+    """Per-metric median of several runs' {metric: value} results."""
+    return {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+
+
+def bench_import(module, repeat):
+    """
+    Imports module in repeat fresh interpreters. Returns its median import
+    time and the GUI modules it loaded along the way.
+    """
+    times = []
+    for _ in range(repeat):
+        probe = subprocess.run([sys.executable, "-c", IMPORT_PROBE.format(module=module, gui=GUI_MODULES)],
+                               cwd=os.path.dirname(os.path.abspath(__file__)),
+                               capture_output=True, text=True, check=True)
+        seconds, loaded = (probe.stdout.splitlines() + [""])[:2]
+        times.append(float(seconds))
+    return {"seconds": statistics.median(times)}, loaded.split()
+
+
+def bench_window(repeat):
+    """Time to import the GUI and build the main window, up to its first paint."""
+    def build():
+        import tkinter as tk
+        from simulator import VisualSchedulingSimulator
+
+        root = tk.Tk()
+        root.withdraw()
+        try:
+            VisualSchedulingSimulator(root)
+            root.update_idletasks()
+        finally:
+            root.destroy()
+
+    seconds, peak_kib, _ = measure(build, repeat)
+    return {"seconds": seconds, "peak_kib": peak_kib}
+
+
+def bench_generation(img, N, repeat):
+    seconds, peak_kib, processes = measure(
+        lambda: build_processes(resize_for_grid(img, CANVAS_SIZE), N, True, random.Random(0)), repeat)
+    return {"seconds": seconds, "peak_kib": peak_kib}, processes
+
+
+def bench_scheduling(processes, algorithm, repeat):
+    def run():
+        fresh = processes.copy()
+        engine = SchedulingEngine(fresh, algorithm, 4)
+        engine.run()
+        return engine.time
+
+    seconds, peak_kib, ticks = measure(run, repeat)
+    return {
+        "ticks": ticks,
+        "seconds": seconds,
+        "ticks_per_second": ticks / seconds if seconds > 0 else 0.0,
+        "peak_kib": peak_kib,
+    }
+
+
+def bench_drawing(img, N, algorithm, max_ticks):
+    """Drives the real GUI tick loop on an offscreen Tk root and times each drawing path."""
+    import tkinter as tk
+    from simulator import VisualSchedulingSimulator
+
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        app = VisualSchedulingSimulator(root)
+        app.workload_cache = None # Time real generation, not cache hits
+        app.base_image = img
+        app.grid_size_entry.delete(0, tk.END)
+        app.grid_size_entry.insert(0, str(N))
+        app.delay_entry.delete(0, tk.END)
+        app.delay_entry.insert(0, "0")
+        app.algorithm_var.set(algorithm)
+
+        # The loop is driven by hand: no after() rescheduling, no completion dialog
+        app.root.after = lambda *args: None
+        app.finish_simulation = lambda: setattr(app, "simulation_running", False)
+        totals = {name: 0.0 for name in DRAW_PATHS}
+        for name in DRAW_PATHS:
+            setattr(app, name, _timed(getattr(app, name), totals, name))
+
+        started = time.perf_counter()
+        app.generate_processes()
+        while app.job is not None: # Generation runs on a worker thread
+            time.sleep(0.001)
+            app.poll_generation(app.job)
+        root.update()
+        generate_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        app.run_simulation()
+        while app.simulation_running and app.current_time < max_ticks:
+            app.simulation_tick()
+            root.update_idletasks()
+        ticks = app.current_time
+        elapsed = time.perf_counter() - started
+        if app.job is not None:
+            app.job.cancel() # Stop the scheduler worker if max_ticks cut the run short
+
+        result = {
+            "generate_seconds": generate_seconds,
+            "ticks": ticks,
+            "ticks_per_second": ticks / elapsed if elapsed > 0 else 0.0,
+            "image_canvas_items": len(app.image_canvas.find_all()),
+            "gantt_canvas_items": len(app.gantt_canvas.find_all()),
+            "queue_listbox_rows": app.queue_listbox.size(),
+        }
+        for name, seconds in totals.items():
+            result[f"{name}_seconds"] = seconds
+        return result
+    finally:
+        root.destroy()
+
+
+def _timed(func, totals, name):
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            totals[name] += time.perf_counter() - started
+    return wrapper
+
+
+def display_available():
+    try:
+        import tkinter as tk
+        tk.Tk().destroy()
+        return True
+    except Exception:
+        return False
+
+
+def flatten(results, prefix=""):
+    """Turns nested results into {"section/case/metric": value}."""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "/"))
+        else:
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline, threshold, noise_floor=NOISE_FLOOR):
+    """
+    Returns a list of (metric, baseline, current) that regressed past threshold.
+
+    A timing only counts when it also grew by more than noise_floor seconds,
+    and a rate only when the time it implies for the case's ticks did, so
+    millisecond-scale cases cannot fail the run on scheduler jitter.
+    """
+    regressions = []
+    current = flatten(current)
+    for name, old in flatten(baseline).items():
+        new = current.get(name)
+        if new is None or not old or name.startswith(UNGATED):
+            continue
+        if name.endswith(HIGHER_IS_BETTER):
+            ticks = current.get(name.rsplit("/", 1)[0] + "/ticks")
+            worse = new < old * (1 - threshold)
+            if worse and ticks and new > 0:
+                worse = ticks / new - ticks / old > noise_floor
+        else:
+            worse = new > old * (1 + threshold)
+            if worse and name.endswith("seconds"):
+                worse = new - old > noise_floor
+        if worse:
+            regressions.append((name, old, new))
+    return regressions
+
+
+def run_suite(args):
+    """Returns (results, [(headless module, GUI modules it imported)])."""
+    img = synthetic_image()
+    results = {"startup": {}, "generate": {}, "schedule": {}, "draw": {}}
+    gui = args.gui and display_available()
+    if args.gui and not gui:
+        print("No display available: skipping drawing benchmarks (try xvfb-run).", file=sys.stderr)
+
+    gui_imports = []
+    for module in HEADLESS_MODULES:
+        results["startup"][f"import {module}"], loaded = bench_import(module, args.repeat)
+        if loaded:
+            gui_imports.append((module, loaded))
+        print(f"startup    import {module:<14} {results['startup'][f'import {module}']['seconds'] * 1000:.1f}ms",
+              file=sys.stderr)
+    if gui:
+        results["startup"]["window"] = bench_window(args.repeat)
+        print(f"startup    window {results['startup']['window']['seconds']:.3f}s", file=sys.stderr)
+
+    for N in args.grid_sizes:
+        results["generate"][f"N={N}"], processes = bench_generation(img, N, args.repeat)
+        print(f"generate   N={N:<4} {results['generate'][f'N={N}']['seconds']:.4f}s", file=sys.stderr)
+        for algorithm in args.algorithms:
+            case = f"{algorithm}/N={N}"
+            results["schedule"][case] = bench_scheduling(processes, algorithm, args.repeat)
+            print(f"schedule   {case:<22} {results['schedule'][case]['ticks_per_second']:,.0f} ticks/s",
+                  file=sys.stderr)
+            if gui:
+                results["draw"][case] = median_results(
+                    [bench_drawing(img, N, algorithm, args.gui_ticks) for _ in range(args.repeat)])
+                print(f"draw       {case:<22} {results['draw'][case]['ticks_per_second']:,.0f} ticks/s",
+                      file=sys.stderr)
+    return results, gui_imports
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark generation, scheduling and drawing.")
+    parser.add_argument("--grid-sizes", nargs="+", type=int, default=[10, 50, 100, 200], metavar="N")
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the median is kept.")
+    parser.add_argument("--no-gui", dest="gui", action="store_false", help="Skip the drawing benchmarks.")
+    parser.add_argument("--gui-ticks", type=int, default=2000, help="Ticks to draw per GUI case.")
+    parser.add_argument("-o", "--output", help="Write this run's results as JSON.")
+    parser.add_argument("--save", metavar="PATH", help="Save this run as the baseline.")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a saved baseline.")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative regression before failing. Default: 0.25.")
+    parser.add_argument("--noise-floor", type=float, default=NOISE_FLOOR, metavar="SECONDS",
+                        help=f"Smallest slowdown that can fail the run. Default: {NOISE_FLOOR}.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results, gui_imports = run_suite(args)
+
+    for path in (args.output, args.save):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+
+    for module, loaded in gui_imports:
+        print(f"GUI IMPORT {module}: imports {', '.join(loaded)}", file=sys.stderr)
+    if gui_imports:
+        return 1
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.noise_floor)
+        for name, old, new in regressions:
+            print(f"REGRESSION {name}: {old:.4g} -> {new:.4g}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+from PIL import ImageTk
+
+
+class BlockImageCache:
+    """
+    Creates the Tk image for a block the first time it is drawn.
+
+    Block pixels are cut from one shared, already-resized source image, and
+    at most `capacity` PhotoImages are alive at once. The least recently
+    drawn one is dropped first; release() drops a block's image as soon as
+    it is no longer needed.
+    """
+
+    def __init__(self, source, capacity=256):
+        self.source = source
+        self.capacity = capacity
+        self._images = OrderedDict()    # Stores {pid: PhotoImage}, least recently used first
+
+    def __len__(self):
+        return len(self._images)
+
+    def __contains__(self, pid):
+        return pid in self._images
+
+    def get(self, process):
+        """Returns the PhotoImage for a process's block, creating it if needed."""
+        pid = process['pid']
+        photo = self._images.get(pid)
+        if photo is not None:
+            self._images.move_to_end(pid)
+            return photo
+
+        x, y = process['coords']
+        w, h = process['block_size']
+        photo = ImageTk.PhotoImage(self.source.crop((x, y, x + w, y + h)))
+        self._images[pid] = photo
+
+        while len(self._images) > self.capacity:
+            self._images.popitem(last=False)
+        return photo
+
+    def release(self, pid):
+        """Evicts a block's image now, e.g. once its block has finished rendering."""
+        self._images.pop(pid, None)
+
+    def clear(self):
+        self._images.clear()
@@ -0,0 +1,234 @@
+"""
+Side-by-side policy comparison on one workload.
+
+Runs every policy from comparison_runs() (Round Robin at several quanta) on
+the same processes concurrently, one worker process per run. The workload's
+fixed columns are placed once in shared memory and each worker builds its
+own table from them, so nothing is pickled per run and every policy sees
+exactly the same arrivals.
+
+Example:
+    python compare.py photo.jpg --grid-size 50 --quanta 2 4 8 --seed 0
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import os
+import random
+
+import numpy as np
+
+from batch import ARRIVAL_MODES, load_resized, positive_int
+from metrics import SchedulingMetrics
+from process_table import ProcessTable
+from scheduler import ALGORITHMS, QUANTUM_ALGORITHMS, SchedulingEngine, average_times
+from smp import QUEUE_MODES, MultiCoreEngine
+from workload import build_processes
+
+COMPARISON_QUANTA = (2, 4, 8)
+# Columns a worker needs to rebuild the workload; the rest is per-run state
+SHARED_COLUMNS = ("pid", "arrival", "burst", "priority", "x", "y", "w", "h")
+# Summary fields shown in the comparison table, with their headings
+TABLE_FIELDS = (
+    ("avg_waiting_time", "Avg Wait"), ("waiting_time_p95", "p95 Wait"),
+    ("avg_turnaround_time", "Avg TAT"), ("turnaround_time_p95", "p95 TAT"),
+    ("response_time_mean", "Avg Resp"), ("throughput", "Throughput"),
+    ("utilization", "Util"), ("context_switches", "Switches"),
+    ("fairness_slowdown", "Fairness"),
+)
+
+
+def comparison_runs(algorithms=ALGORITHMS, quanta=COMPARISON_QUANTA, quantum=4):
+    """
+    (algorithm, time quantum) pairs: Round Robin once per quantum in quanta,
+    MLFQ and CFS at quantum, and the other algorithms once without one.
+    """
+    runs = []
+    for algorithm in algorithms:
+        if algorithm == "Round Robin":
+            runs.extend((algorithm, q) for q in quanta)
+        else:
+            runs.append((algorithm, quantum if algorithm in QUANTUM_ALGORITHMS else None))
+    return runs
+
+
+def run_label(algorithm, quantum):
+    return algorithm if quantum is None else f"{algorithm} (q={quantum})"
+
+
+class SharedWorkload:
+    """The fixed columns of a ProcessTable, copied once into a shared-memory block."""
+
+    def __init__(self, processes):
+        self.count = len(processes)
+        self._shm = SharedMemory(create=True, size=max(1, len(SHARED_COLUMNS) * self.count * 4))
+        columns = np.ndarray((len(SHARED_COLUMNS), self.count), dtype=np.int32, buffer=self._shm.buf)
+        for row, name in zip(columns, SHARED_COLUMNS):
+            row[:] = processes.column(name)
+        del columns                 # Drop the view so the block can be closed
+        self.handle = (self._shm.name, self.count)
+
+    def close(self):
+        """Frees the block; workers that already attached keep their mapping."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def attach_workload(handle):
+    """Rebuilds a fresh ProcessTable in this process from a SharedWorkload handle."""
+    name, count = handle
+    shm = SharedMemory(name=name)
+    try:
+        columns = np.ndarray((len(SHARED_COLUMNS), count), dtype=np.int32, buffer=shm.buf)
+        table = ProcessTable.from_columns(*columns)
+        del columns
+    finally:
+        shm.close()
+    return table
+
+
+def run_policy(handle, algorithm, quantum=None, cores=1, queue_mode="Global", switch_cost=0, segments=True):
+    """
+    Worker entry: schedules the shared workload under one policy. Returns
+    {"algorithm", "time_quantum", "label", "summary", "segments"}, where
+    segments is (cores, starts, pids, lengths) as int32 arrays of every run
+    on a CPU (None when segments=False), and summary is metrics.summary()
+    plus the average times.
+    """
+    processes = attach_workload(handle)
+    if cores > 1:
+        engine = MultiCoreEngine(processes, algorithm, quantum or 1, cores, queue_mode, switch_cost=switch_cost)
+    else:
+        engine = SchedulingEngine(processes, algorithm, quantum or 1, switch_cost=switch_cost)
+    metrics = SchedulingMetrics(processes, cores)
+
+    runs = ([], [], [], [])
+    dispatched = {}             # Stores {core: (start, pid)} for the runs in progress
+    for event in engine.events():
+        metrics.record((event,))
+        if not segments:
+            continue
+        if event.kind == "dispatch":
+            dispatched[event.core] = (event.time, event.pid)
+        elif event.kind in ("preempt", "complete"):
+            start, pid = dispatched.pop(event.core)
+            for column, value in zip(runs, (event.core, start, pid, event.time - start)):
+                column.append(value)
+
+    summary = metrics.summary()
+    summary["avg_waiting_time"], summary["avg_turnaround_time"] = average_times(processes)
+    return {
+        "algorithm": algorithm,
+        "time_quantum": quantum,
+        "label": run_label(algorithm, quantum),
+        "summary": summary,
+        "segments": tuple(np.array(column, dtype=np.int32) for column in runs) if segments else None,
+    }
+
+
+class ComparisonRunner:
+    """
+    Runs several policies on one workload in a process pool.
+
+    start() shares the workload and submits one job per run; poll() returns
+    the (run index, result) pairs that finished since the last call, so the
+    UI can show each run as soon as it is done. shutdown() drops the pool
+    and frees the shared block.
+    """
+
+    def __init__(self, processes, runs, cores=1, queue_mode="Global", workers=None):
+        self.processes = processes
+        self.runs = list(runs)
+        self.cores = cores
+        self.queue_mode = queue_mode
+        self.workers = min(workers or os.cpu_count() or 1, len(self.runs))
+        self.results = [None] * len(self.runs)
+        self._futures = {}          # Stores {future: run index}
+        self._pool = None
+        self._workload = None
+
+    @property
+    def finished(self):
+        return all(result is not None for result in self.results)
+
+    def start(self):
+        self._workload = SharedWorkload(self.processes)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        for i, (algorithm, quantum) in enumerate(self.runs):
+            future = self._pool.submit(run_policy, self._workload.handle, algorithm, quantum,
+                                       self.cores, self.queue_mode)
+            self._futures[future] = i
+        return self
+
+    def poll(self):
+        """Collects finished runs; re-raises a worker's exception."""
+        done = []
+        for future in [f for f in self._futures if f.done()]:
+            i = self._futures.pop(future)
+            self.results[i] = future.result()
+            done.append((i, self.results[i]))
+        if self.finished:
+            self.shutdown()
+        return done
+
+    def shutdown(self):
+        """Stops the pool, dropping queued runs, and frees the shared workload."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._workload is not None:
+            self._workload.close()
+            self._workload = None
+
+    def run(self):
+        """Blocks until every run is done; returns the results in run order."""
+        self.start()
+        try:
+            for future in list(self._futures):
+                future.result()
+            self.poll()
+        finally:
+            self.shutdown()
+        return self.results
+
+
+def format_results(results):
+    """Plain-text comparison table, one row per run."""
+    width = max(len(result["label"]) for result in results) + 2
+    lines = [f"{'Policy':<{width}}" + "".join(f"{heading:>11}" for _, heading in TABLE_FIELDS)]
+    for result in results:
+        summary = result["summary"]
+        lines.append(f"{result['label']:<{width}}" + "".join(f"{summary[name]:>11.3f}" for name, _ in TABLE_FIELDS))
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare every scheduling policy on one image workload.")
+    parser.add_argument("image", help="Source image file.")
+    parser.add_argument("--grid-size", type=positive_int, default=10, metavar="N", help="Grid size N. Default: 10.")
+    parser.add_argument("--arrival", choices=ARRIVAL_MODES, default="random", help="Arrival mode. Default: random.")
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS),
+                        help="Scheduling algorithms. Default: all.")
+    parser.add_argument("--quanta", nargs="+", type=positive_int, default=list(COMPARISON_QUANTA), metavar="Q",
+                        help="Round Robin time quanta. Default: 2 4 8.")
+    parser.add_argument("--quantum", type=positive_int, default=4, help="MLFQ and CFS time quantum. Default: 4.")
+    parser.add_argument("--cores", type=positive_int, default=1, help="Simulated CPUs. Default: 1.")
+    parser.add_argument("--queue-mode", choices=QUEUE_MODES, default="Global", help="Ready-queue layout with several CPUs.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for random arrivals. Default: 0.")
+    parser.add_argument("--workers", type=positive_int, help="Worker processes. Default: one per CPU.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    processes = build_processes(load_resized(args.image), args.grid_size, args.arrival == "random",
+                                random.Random(args.seed))
+    runner = ComparisonRunner(processes, comparison_runs(args.algorithms, args.quanta, args.quantum),
+                              args.cores, args.queue_mode, args.workers)
+    print(format_results(runner.run()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+from bisect import bisect_left, bisect_right
+
+
+class _Lane:
+    """Run-length segments of one Gantt lane, plus the canvas items materialized for them."""
+
+    def __init__(self):
+        self.starts = []            # Segment start times (sorted)
+        self.ends = []              # Segment end times (exclusive)
+        self.pids = []
+        self.colors = []
+        self.items = {}             # Stores {segment index: canvas item}
+
+
+class GanttChart:
+    """
+    Live Gantt chart drawn as run-length segments on a Tk canvas.
+
+    A bar is extended while the same PID (or "Idle") keeps running and a new
+    one only starts on a context switch. Every segment is kept in plain lists,
+    but canvas items only exist for the segments (and time labels) inside the
+    visible window plus a margin; the rest are re-created on scroll. The
+    chart has one lane by default; reset(lanes=...) stacks more (e.g. one
+    per worker), optionally named by lane_names, which stay pinned to the
+    left edge of the view.
+    """
+
+    SCALE = 4           # Pixels per time unit
+    BAR_HEIGHT = 30
+    Y_OFFSET = 10
+    LANE_GAP = 4
+    LABEL_EVERY = 10    # Timestamp label every N time units
+
+    def __init__(self, canvas, scrollbar=None, margin=200):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.margin = margin        # Extra pixels kept materialized on both sides of the view
+        self.base_height = int(canvas.cget("height"))
+        self.canvas.configure(xscrollcommand=self._on_xview)
+        if scrollbar is not None:
+            scrollbar.config(command=self._on_scroll)
+        self.reset()
+
+    def reset(self, lanes=1, scale=None, label_every=None, lane_names=None):
+        """Clears the chart; optionally changes the lane count, time scale and lane names."""
+        self.canvas.delete("all")
+        self.scale = scale or self.SCALE
+        self.label_every = label_every or self.LABEL_EVERY
+        self._lanes = [_Lane() for _ in range(lanes)]
+        self._lane_names = [
+            self.canvas.create_text(0, 0, text=name, anchor="w", font=("Helvetica", 9, "bold"))
+            for name in (lane_names or ())
+        ]
+        self._labels = {}           # Stores {time: canvas text item}
+        self.end_time = 0
+        self.follow = True          # Keep the live edge in view until the user scrolls back
+
+        # Grow the canvas so every lane plus the label row fits
+        height = self.Y_OFFSET + lanes * (self.BAR_HEIGHT + self.LANE_GAP) + 16
+        self.canvas.configure(height=max(self.base_height, height))
+        self._set_scrollregion(0)
+        self.canvas.xview_moveto(0.0)
+
+    @property
+    def lanes(self):
+        return len(self._lanes)
+
+    @property
+    def item_count(self):
+        """Number of canvas items currently materialized."""
+        return sum(len(lane.items) for lane in self._lanes) + len(self._labels) + len(self._lane_names)
+
+    def add(self, time, pid, color, length=1, lane=0):
+        """Records that pid (or "Idle") ran from time for length units."""
+        self._append(time, pid, color, length, lane)
+        self._update_view()
+
+    def add_segments(self, segments):
+        """Adds many (time, pid, color, length[, lane]) runs, updating the view once."""
+        for segment in segments:
+            self._append(*segment)
+        if segments:
+            self._update_view()
+
+    def truncate(self, time):
+        """Drops everything after time, e.g. when a replay seeks backwards."""
+        for lane, segs in enumerate(self._lanes):
+            keep = bisect_left(segs.starts, time)
+            for i in [i for i in segs.items if i >= keep]:
+                self.canvas.delete(segs.items.pop(i))
+            del segs.starts[keep:], segs.ends[keep:], segs.pids[keep:], segs.colors[keep:]
+            if keep and segs.ends[-1] > time:
+                segs.ends[-1] = time
+                item = segs.items.get(keep - 1)
+                if item is not None:
+                    self.canvas.coords(item, *self._bar_coords(lane, segs.starts[-1], time))
+        self.end_time = min(self.end_time, time)
+        self._update_view()
+
+    # --- Virtualization ---
+
+    def _append(self, time, pid, color, length, lane=0):
+        end = time + length
+        segs = self._lanes[lane]
+        if segs.pids and segs.pids[-1] == pid and segs.ends[-1] == time:
+            # Same process keeps running: extend the current bar
+            segs.ends[-1] = end
+            item = segs.items.get(len(segs.pids) - 1)
+            if item is not None:
+                self.canvas.coords(item, *self._bar_coords(lane, segs.starts[-1], end))
+        else:
+            # Context switch: start a new segment
+            segs.starts.append(time)
+            segs.ends.append(end)
+            segs.pids.append(pid)
+            segs.colors.append(color)
+        self.end_time = max(self.end_time, end)
+
+    def _update_view(self):
+        width = self.canvas.winfo_width()
+        self._set_scrollregion(max(self.end_time * self.scale, width))
+        if self.follow:
+            self._scroll_to_end(width)
+        self._refresh()
+
+    def _set_scrollregion(self, width):
+        self.canvas.configure(scrollregion=(0, 0, width, int(self.canvas.cget("height"))))
+
+    def _scroll_to_end(self, width):
+        """Moves the view so the live edge sits 50px from the right border."""
+        total = self.end_time * self.scale
+        x = total - self.scale
+        if total > 0 and x > width - 50:
+            fraction = (x - width + 50) / total
+            self.canvas.xview_moveto(min(max(fraction, 0.0), 1.0))
+
+    def _on_scroll(self, *args):
+        """Scrollbar command: scrolls, then follows the live edge only if it is in view."""
+        self.canvas.xview(*args)
+        self.follow = self.canvas.xview()[1] >= 1.0
+
+    def _on_xview(self, first, last):
+        if self.scrollbar is not None:
+            self.scrollbar.set(first, last)
+        self._refresh()
+
+    def _refresh(self):
+        """Materializes what is in the window and deletes everything outside it."""
+        left = self.canvas.canvasx(0) - self.margin
+        right = self.canvas.canvasx(self.canvas.winfo_width()) + self.margin
+        t_left = max(0, left / self.scale)
+        t_right = right / self.scale
+
+        # --- Bars ---
+        for lane, segs in enumerate(self._lanes):
+            first = bisect_right(segs.ends, t_left)
+            last = bisect_left(segs.starts, t_right)
+            for i in [i for i in segs.items if i < first or i >= last]:
+                self.canvas.delete(segs.items.pop(i))
+            for i in range(first, last):
+                if i not in segs.items:
+                    segs.items[i] = self.canvas.create_rectangle(
+                        *self._bar_coords(lane, segs.starts[i], segs.ends[i]),
+                        fill=segs.colors[i], outline="#fff"
+                    )
+
+        # --- Timestamp labels ---
+        every = self.label_every
+        first_label = int(-(-t_left // every) * every)
+        last_label = int(min(t_right, self.end_time - 1))
+        label_y = self.Y_OFFSET + len(self._lanes) * (self.BAR_HEIGHT + self.LANE_GAP) - self.LANE_GAP + 3
+        for t in [t for t in self._labels if t < first_label or t > last_label]:
+            self.canvas.delete(self._labels.pop(t))
+        for t in range(first_label, last_label + 1, every):
+            if t not in self._labels:
+                self._labels[t] = self.canvas.create_text(
+                    t * self.scale, label_y,
+                    text=str(t), anchor="n", font=("Helvetica", 9)
+                )
+
+        # --- Lane names (kept above the bars at the left edge) ---
+        view_left = self.canvas.canvasx(0) + 4
+        for lane, item in enumerate(self._lane_names):
+            top = self.Y_OFFSET + lane * (self.BAR_HEIGHT + self.LANE_GAP)
+            self.canvas.coords(item, view_left, top + self.BAR_HEIGHT / 2)
+            self.canvas.tag_raise(item)
+
+    def _bar_coords(self, lane, start, end):
+        top = self.Y_OFFSET + lane * (self.BAR_HEIGHT + self.LANE_GAP)
+        return (start * self.scale, top, end * self.scale, top + self.BAR_HEIGHT)
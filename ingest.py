@@ -0,0 +1,200 @@
+from contextlib import contextmanager
+
+import numpy as np
+from PIL import Image
+
+from workload import burst_from_sums, grid_priorities
+
+# Local scans are trusted input: allow sources far beyond Pillow's bomb limit
+MAX_SOURCE_PIXELS = 4 * 10**9
+# Downscale with cheap integer reductions (JPEG draft, Image.reduce) until within
+# this factor of the target, then finish with LANCZOS
+REDUCING_GAP = 2.0
+# Pixels decoded per strip when measuring blocks at source resolution
+STRIP_PIXELS = 1 << 22
+# Modes whose raw rows can be read straight from the file (one byte per band)
+_STREAMABLE_MODES = ("L", "RGB", "RGBA", "RGBX", "CMYK")
+
+
+@contextmanager
+def _pixel_limit(limit):
+    saved = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = limit
+    try:
+        yield
+    finally:
+        Image.MAX_IMAGE_PIXELS = saved
+
+
+def open_source(path):
+    """Opens a source image lazily: only the header is read until pixels are needed."""
+    with _pixel_limit(MAX_SOURCE_PIXELS):
+        return Image.open(path)
+
+
+def make_thumbnail(path, box):
+    """Small preview of a source; JPEGs are decoded at reduced scale."""
+    with open_source(path) as image:
+        image.thumbnail(box)
+        return image.copy()
+
+
+def _pick_level(image, size):
+    """
+    Seeks a multi-page source (e.g. a pyramid TIFF) to its smallest page that
+    still covers size * REDUCING_GAP with the same aspect ratio as page 0.
+    """
+    frames = getattr(image, "n_frames", 1)
+    if frames == 1:
+        return image
+    width, height = image.size
+    best, best_pixels = 0, width * height
+    for i in range(1, frames):
+        image.seek(i)
+        w, h = image.size
+        same_shape = abs(w * height - h * width) <= 0.01 * width * height
+        if same_shape and min(w, h) >= size * REDUCING_GAP and w * h < best_pixels:
+            best, best_pixels = i, w * h
+    image.seek(best)
+    return image
+
+
+def load_for_grid(source, size):
+    """
+    Decodes a source (path or Image) straight to the size x size canvas image.
+
+    Pyramid pages and JPEG draft mode avoid decoding pixels that would be
+    thrown away, and Image.reduce does most of the remaining shrink before
+    the final LANCZOS pass, so a 20k x 20k JPEG never exists in memory at
+    full resolution. Uncompressed sources (BMP, PPM, raw TIFF) are reduced
+    strip by strip. Other compressed formats (PNG, LZW/Deflate TIFF without
+    a pyramid) are still decoded whole, since Pillow has no partial decode
+    for them.
+    """
+    image = open_source(source) if isinstance(source, str) else source
+    image = _pick_level(image, size)
+    if _raw_layout(image) is not None:
+        return _reduce_raw(image, size)
+    target = int(size * REDUCING_GAP)
+    box = None
+    drafted = image.draft(image.mode if image.mode in ("RGB", "L") else None, (target, target))
+    if drafted is not None:
+        box = drafted[1]
+    with _pixel_limit(MAX_SOURCE_PIXELS):
+        return image.resize((size, size), Image.Resampling.LANCZOS, box=box, reducing_gap=REDUCING_GAP)
+
+
+def _reduce_raw(image, size):
+    """
+    load_for_grid for an uncompressed source: the same integer reduction
+    resize(reducing_gap=REDUCING_GAP) would apply, done one strip at a time,
+    then the final LANCZOS pass on the small result.
+    """
+    width, height = image.size
+    factor_x = max(1, int(width / size / REDUCING_GAP))
+    factor_y = max(1, int(height / size / REDUCING_GAP))
+    # Whole reduction blocks per strip, so strips reduce exactly like the full image
+    strip_rows = max(1, STRIP_PIXELS // width // factor_y) * factor_y
+    reduced = Image.new(image.mode, (-(-width // factor_x), -(-height // factor_y)))
+    for y0, strip in _raw_strips(image, strip_rows):
+        reduced.paste(strip.reduce((factor_x, factor_y)), (0, y0 // factor_y))
+    return reduced.resize((size, size), Image.Resampling.LANCZOS,
+                          box=(0, 0, width / factor_x, height / factor_y))
+
+
+def _raw_layout(image):
+    """
+    Returns [(x0, y0, x1, y1, offset, rawmode, stride, orientation)] when every
+    tile of the file is stored uncompressed, or None when it must be decoded.
+    """
+    if image.mode not in _STREAMABLE_MODES or not getattr(image, "tile", None): # In-memory images have none
+        return None
+    bands = len(image.getbands())
+    layout = []
+    for tile in image.tile:
+        codec, extents, offset, args = tile
+        if codec != "raw":
+            return None
+        if isinstance(args, str):
+            args = (args, 0, 1)
+        rawmode, stride, orientation = (tuple(args) + (0, 1))[:3]
+        x0, y0, x1, y1 = extents
+        layout.append((x0, y0, x1, y1, offset, rawmode, stride or (x1 - x0) * bands, orientation or 1))
+    return layout
+
+
+def _raw_strips(image, strip_rows):
+    """Yields (y0, strip image) strips read straight from an uncompressed file."""
+    layout = _raw_layout(image)
+    width, height = image.size
+    for y0 in range(0, height, strip_rows):
+        y1 = min(y0 + strip_rows, height)
+        strip = Image.new(image.mode, (width, y1 - y0))
+        for x0, ty0, x1, ty1, offset, rawmode, stride, orientation in layout:
+            top, bottom = max(y0, ty0), min(y1, ty1)
+            if top >= bottom:
+                continue
+            rows = ty1 - ty0
+            if orientation > 0:
+                first = top - ty0
+            else:
+                first = rows - (bottom - ty0) # Bottom-up rows (e.g. BMP)
+            image.fp.seek(offset + first * stride)
+            chunk = image.fp.read((bottom - top) * stride)
+            piece = Image.frombuffer(image.mode, (x1 - x0, bottom - top), chunk,
+                                     "raw", rawmode, stride, orientation)
+            strip.paste(piece, (x0, top - y0))
+        yield y0, strip
+
+
+def _decoded_strips(image, strip_rows):
+    """
+    Yields (y0, strip image) strips of a compressed source. The source is
+    decoded whole first: Pillow hands compressed TIFFs to libtiff as one
+    tile for the entire file, and PNG rows come from a single zlib stream,
+    so neither can be narrowed to one strip.
+    """
+    image.draft("L", None) # JPEG decodes straight to one byte per pixel
+    with _pixel_limit(MAX_SOURCE_PIXELS):
+        image.load()
+    width, height = image.size
+    for y0 in range(0, height, strip_rows):
+        yield y0, image.crop((0, y0, width, min(y0 + strip_rows, height)))
+
+
+def source_block_attributes(path, N, strip_pixels=STRIP_PIXELS, progress=None):
+    """
+    Computes block_attributes(image, N) on the full-resolution source.
+
+    Only uncompressed sources (BMP, PPM, raw TIFF) are read one strip at a
+    time, so that only the strip is ever in memory. Compressed ones (JPEG,
+    PNG, LZW/Deflate TIFF) are decoded whole first, JPEGs straight to
+    grayscale, so their luma comes from the decoder and may differ by one
+    level. For those only the widening to integers is done per strip.
+    Otherwise the (burst, priority) arrays are exactly what block_attributes
+    would return for the full source. progress, if given, is called with
+    the fraction of rows done after each strip.
+    """
+    with open_source(path) as image:
+        width, height = image.size
+        block_w, block_h = width // N, height // N
+        if block_w * block_h == 0:
+            return np.ones((N, N), dtype=np.int64), grid_priorities(N)
+
+        strip_rows = max(1, strip_pixels // width)
+        strips = _raw_strips if _raw_layout(image) is not None else _decoded_strips
+        total = np.zeros((N, N), dtype=np.int64)
+        total2 = np.zeros((N, N), dtype=np.int64)
+        for y0, strip in strips(image, strip_rows):
+            gray = np.asarray(strip.convert("L"))
+            rows = min(gray.shape[0], N * block_h - y0)
+            if rows <= 0:
+                break
+            strip = gray[:rows, :N * block_w].astype(np.int64).reshape(rows, N, block_w)
+            block_rows = (y0 + np.arange(rows)) // block_h
+            np.add.at(total, block_rows, strip.sum(axis=2))
+            np.add.at(total2, block_rows, (strip * strip).sum(axis=2))
+            if progress is not None:
+                progress((y0 + rows) / (N * block_h))
+
+    return burst_from_sums(total, total2, block_w * block_h), grid_priorities(N)
@@ -0,0 +1,217 @@
+import json
+import math
+
+QUANTILES = (0.5, 0.95, 0.99)
+# Per-process times tracked with mean, max and QUANTILES
+TIME_METRICS = ("waiting_time", "turnaround_time", "response_time")
+
+
+class LogHistogram:
+    """
+    Sample counts in log-spaced buckets, SUB_BUCKETS per power of two.
+
+    Adding a sample is O(1) and the bucket count is bounded by the value
+    range, not the sample count. Values below 2 * SUB_BUCKETS are counted
+    exactly; larger ones land in buckets 1/SUB_BUCKETS of their value wide,
+    which bounds the relative error of quantile().
+    """
+
+    SUB_BUCKETS = 64
+    _EXACT_BITS = 7             # 2 * SUB_BUCKETS == 1 << _EXACT_BITS
+
+    def __init__(self):
+        self.counts = {}            # Stores {bucket: samples}
+        self.count = 0
+
+    def add(self, x):
+        x = int(x) if x > 0 else 0
+        shift = x.bit_length() - self._EXACT_BITS
+        bucket = x if shift <= 0 else shift * self.SUB_BUCKETS + (x >> shift)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+
+    def _value(self, bucket):
+        """Midpoint of the values a bucket holds."""
+        if bucket < 2 * self.SUB_BUCKETS:
+            return float(bucket)
+        shift = bucket // self.SUB_BUCKETS - 1
+        mantissa = bucket - shift * self.SUB_BUCKETS
+        return ((mantissa << shift) + ((mantissa + 1) << shift) - 1) / 2
+
+    def quantile(self, q):
+        """Nearest-rank q-quantile (0-1) of everything added so far."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return self._value(bucket)
+        return self._value(max(self.counts))
+
+
+class StreamingSummary:
+    """Count, mean, max and QUANTILES of one per-process time, in O(1) memory."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+        self.histogram = LogHistogram()
+
+    def add(self, x):
+        self.count += 1
+        self.total += x
+        if x > self.maximum:
+            self.maximum = x
+        self.histogram.add(x)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        stats = {"mean": self.mean, "max": self.maximum}
+        for q in QUANTILES:
+            stats[f"p{q * 100:g}"] = self.histogram.quantile(q)
+        return stats
+
+
+class SlidingWindowCounter:
+    """Events per time unit over the last `window` time units, kept in a fixed ring of buckets."""
+
+    def __init__(self, window, buckets=20):
+        self.window = window
+        self.width = max(1, window // buckets)
+        self.counts = [0] * (-(-window // self.width) + 1)
+        self.slots = [-1] * len(self.counts) # Bucket number each ring entry currently holds
+
+    def add(self, t, n=1):
+        bucket = t // self.width
+        i = bucket % len(self.counts)
+        if self.slots[i] != bucket:
+            self.slots[i] = bucket
+            self.counts[i] = 0
+        self.counts[i] += n
+
+    def rate(self, now):
+        if now <= 0:
+            return 0.0
+        oldest = (now - self.window) // self.width
+        total = sum(count for count, bucket in zip(self.counts, self.slots) if bucket > oldest)
+        return total / min(self.window, now)
+
+
+def jain_index(total, total_squares, n):
+    """Jain's fairness index (sum x)^2 / (n * sum x^2): 1 when all equal, 1/n at worst."""
+    if n == 0 or total_squares == 0:
+        return 1.0
+    return total * total / (n * total_squares)
+
+
+class SchedulingMetrics:
+    """
+    Incremental run metrics, fed the engine's events as they happen.
+
+    Each completion updates log-bucketed histograms of waiting, turnaround
+    and response time (first dispatch minus arrival), so memory stays
+    bounded however many processes run. Alongside those it keeps completions in a
+    sliding window for throughput, busy time per CPU for utilization,
+    context switches (a CPU dispatching a different process than it last
+    ran) and Jain's fairness index over slowdown (turnaround / burst).
+    Pass lookup instead of processes to follow a lazy process stream.
+    """
+
+    def __init__(self, processes, cores=1, window=100, lookup=None):
+        if lookup is None:
+            lookup = processes.pid_map() if hasattr(processes, "pid_map") else {p['pid']: p for p in processes}
+        self.lookup = lookup        # {pid: process}; for a stream, only the processes still in the system
+        self.cores = cores
+        self.times = {name: StreamingSummary() for name in TIME_METRICS}
+        self.throughput = SlidingWindowCounter(window)
+        self.completed = 0
+        self.context_switches = 0
+        self.now = 0
+        self._busy = [0] * cores
+        self._dispatched_at = [None] * cores # Start of each CPU's current run (None when idle)
+        self._last_pid = [None] * cores
+        self._started = set()       # pids dispatched at least once and not yet completed
+        self._slowdown = [0.0, 0.0]          # Sum and sum of squares, for Jain's index
+        self._max_slowdown = 0.0
+
+    def record(self, events):
+        for event in events:
+            kind = event.kind
+            if kind == "dispatch":
+                core = event.core
+                if self._last_pid[core] is not None and self._last_pid[core] != event.pid:
+                    self.context_switches += 1
+                self._last_pid[core] = event.pid
+                self._dispatched_at[core] = event.time
+                # First dispatch, tracked here rather than read from start_time,
+                # which a scheduler running on another thread may be writing
+                if event.pid not in self._started:
+                    self._started.add(event.pid)
+                    self.times["response_time"].add(event.time - self.lookup[event.pid]['arrival'])
+            elif kind == "preempt" or kind == "complete":
+                core = event.core
+                self._busy[core] += event.time - self._dispatched_at[core]
+                self._dispatched_at[core] = None
+                if kind == "complete":
+                    self._started.discard(event.pid)
+                    self._complete(self.lookup[event.pid], event.time)
+            self.now = event.time
+
+    def _complete(self, p, t):
+        turnaround = t - p['arrival']
+        self.times["turnaround_time"].add(turnaround)
+        self.times["waiting_time"].add(turnaround - p['burst'])
+        self.throughput.add(t)
+        self.completed += 1
+        slowdown = turnaround / p['burst']
+        self._slowdown[0] += slowdown
+        self._slowdown[1] += slowdown * slowdown
+        self._max_slowdown = max(self._max_slowdown, slowdown)
+
+    def busy_time(self, now=None):
+        """Per-CPU busy time up to now, counting the runs still in progress."""
+        now = self.now if now is None else now
+        return [busy + (now - start if start is not None else 0)
+                for busy, start in zip(self._busy, self._dispatched_at)]
+
+    def summary(self, now=None):
+        """Flat {metric: value} snapshot at time now (default: the last event)."""
+        now = self.now if now is None else now
+        busy = self.busy_time(now)
+        capacity = now * self.cores
+        stats = {"time": now, "completed": self.completed}
+        for name, summary in self.times.items():
+            for key, value in summary.summary().items():
+                stats[f"{name}_{key}"] = value
+        stats.update({
+            "throughput_window": self.throughput.rate(now),
+            "throughput": self.completed / now if now else 0.0,
+            "utilization": sum(busy) / capacity if capacity else 0.0,
+            "idle_time": capacity - sum(busy),
+            "context_switches": self.context_switches,
+            "fairness_slowdown": jain_index(self._slowdown[0], self._slowdown[1], self.completed),
+            "max_slowdown": self._max_slowdown,
+            "fairness_cores": jain_index(sum(busy), sum(b * b for b in busy), self.cores),
+        })
+        return stats
+
+    def format_table(self, now=None):
+        """Short text table for the live metrics panel."""
+        stats = self.summary(now)
+        lines = [f"{'time':<11}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name in TIME_METRICS:
+            label = name.split("_")[0]
+            lines.append(f"{label:<11}" + "".join(f"{stats[f'{name}_{q}']:>7.1f}" for q in ("p50", "p95", "p99")))
+        lines.append(f"throughput {stats['throughput_window']:.3f}/t  util {stats['utilization']:.0%}")
+        lines.append(f"switches {stats['context_switches']}  fairness {stats['fairness_slowdown']:.3f}")
+        return "\n".join(lines)
+
+    def export_json(self, path, now=None):
+        with open(path, "w") as f:
+            json.dump(self.summary(now), f, indent=2)
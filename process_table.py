@@ -0,0 +1,173 @@
+from array import array
+
+import numpy as np
+
+# 32-bit integer columns, one slot per process (index = pid - 1)
+COLUMNS = ("pid", "arrival", "burst", "priority", "remaining_burst",
+           "wait_time", "start_time", "completion_time", "x", "y", "w", "h")
+
+
+class _PairColumn:
+    """Read-only column pairing two others, e.g. coords = (x, y)."""
+
+    __slots__ = ("first", "second")
+
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+
+    def __getitem__(self, i):
+        return (self.first[i], self.second[i])
+
+
+class ProcessView:
+    """
+    Dict-style access to one row of a ProcessTable.
+
+    Supports p['burst'], p['remaining_burst'] -= 1, p['coords'] and the other
+    keys build_processes used to put in a dict. Reads and writes go straight
+    to the table's columns; a view holds no data of its own.
+    """
+
+    __slots__ = ("_columns", "_i")
+
+    def __init__(self, columns, i):
+        self._columns = columns
+        self._i = i
+
+    def __getitem__(self, key):
+        return self._columns[key][self._i]
+
+    def __setitem__(self, key, value):
+        self._columns[key][self._i] = value
+
+    def __contains__(self, key):
+        return key in self._columns
+
+    def __eq__(self, other):
+        if isinstance(other, ProcessView):
+            return self._columns is other._columns and self._i == other._i
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._columns), self._i))
+
+    def __repr__(self):
+        return f"ProcessView({self.to_dict()})"
+
+    def get(self, key, default=None):
+        column = self._columns.get(key)
+        return default if column is None else column[self._i]
+
+    def keys(self):
+        return [key for key in self._columns if key not in ("x", "y", "w", "h")]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+
+class ProcessTable:
+    """
+    Struct-of-arrays store for a workload, indexed by PID - 1.
+
+    Each field is one array('i') column, so a process costs 48 bytes
+    instead of a dict with boxed values. It behaves as a sequence of
+    ProcessView rows (created on access), by_pid() looks a row up by PID,
+    and column() exposes a field as a NumPy view for vectorized statistics.
+    """
+
+    def __init__(self, count):
+        self._columns = {name: array("i", [0]) * count for name in COLUMNS}
+        self._columns["coords"] = _PairColumn(self._columns["x"], self._columns["y"])
+        self._columns["block_size"] = _PairColumn(self._columns["w"], self._columns["h"])
+        self._count = count
+
+    @classmethod
+    def from_columns(cls, pid, arrival, burst, priority, x, y, w, h):
+        """Builds a fresh (not yet scheduled) table from per-process sequences."""
+        table = cls(len(pid))
+        for name, values in (("pid", pid), ("arrival", arrival), ("burst", burst), ("priority", priority),
+                             ("remaining_burst", burst), ("x", x), ("y", y), ("w", w), ("h", h)):
+            table.column(name)[:] = values
+        table.reset_progress()
+        return table
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("process index out of range")
+        return ProcessView(self._columns, i)
+
+    def __iter__(self):
+        columns = self._columns
+        return (ProcessView(columns, i) for i in range(self._count))
+
+    def by_pid(self, pid):
+        return self[pid - 1]
+
+    def pid_map(self):
+        """Mapping-style {pid: process} access without building a dict."""
+        return _PidMap(self)
+
+    def column(self, name):
+        """One field as a writable int32 NumPy array sharing the table's memory."""
+        return np.frombuffer(self._columns[name], dtype=np.int32)
+
+    def copy(self):
+        """An independent table with the same rows."""
+        table = ProcessTable(self._count)
+        for name in COLUMNS:
+            table._columns[name][:] = self._columns[name]
+        return table
+
+    def reset_progress(self):
+        """Puts every process back in its unscheduled state."""
+        self.column("remaining_burst")[:] = self.column("burst")
+        self.column("wait_time")[:] = 0
+        self.column("start_time")[:] = -1
+        self.column("completion_time")[:] = -1
+
+    def average_times(self):
+        """(avg waiting time, avg turnaround time) over the completed processes."""
+        completion = self.column("completion_time")
+        done = completion >= 0
+        if not done.any():
+            return 0.0, 0.0
+        turnaround = completion[done].astype(np.int64) - self.column("arrival")[done]
+        wait = turnaround - self.column("burst")[done]
+        return float(wait.mean()), float(turnaround.mean())
+
+    @property
+    def nbytes(self):
+        return sum(self._columns[name].itemsize * len(self._columns[name]) for name in COLUMNS)
+
+
+class _PidMap:
+    __slots__ = ("_table",)
+
+    def __init__(self, table):
+        self._table = table
+
+    def __getitem__(self, pid):
+        if not 1 <= pid <= len(self._table):
+            raise KeyError(pid)
+        return self._table[pid - 1]
+
+    def __contains__(self, pid):
+        return isinstance(pid, int) and 1 <= pid <= len(self._table)
+
+    def __len__(self):
+        return len(self._table)
+
+    def __iter__(self):
+        return iter(range(1, len(self._table) + 1))
+
+    def get(self, pid, default=None):
+        return self[pid] if pid in self else default
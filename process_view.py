@@ -0,0 +1,183 @@
+from tkinter import ttk
+
+import numpy as np
+
+# (ProcessTable column, heading, width); all of them can be sorted on
+COLUMNS = (("pid", "PID", 40), ("arrival", "Arrival", 60), ("burst", "Burst", 60), ("priority", "Priority", 60))
+FILTER_COLUMNS = ("arrival", "burst", "priority")
+PALETTE_SIZE = 32               # Row/Gantt colours shared out among the processes
+
+
+class ProcessTableView:
+    """
+    Virtual process table on a ttk.Treeview.
+
+    The Treeview only holds the rows scrolled into view. The table's columns
+    stay numpy arrays, and sorting or filtering just rebuilds one array of
+    row indices, so nothing is re-inserted for rows that are not shown. Row
+    colours come from a small palette with one tag per palette entry, not
+    one tag per PID. The selected PID is kept here rather than in the
+    Treeview, so it survives its row being scrolled out of view.
+    """
+
+    def __init__(self, tree, scrollbar, on_select=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.on_select = on_select  # Called with the selected pid, or None when cleared
+        tree.config(columns=[name for name, _, _ in COLUMNS], show="headings", yscrollcommand=self._set_scrollbar)
+        scrollbar.config(command=self._on_scroll)
+        for name, heading, width in COLUMNS:
+            tree.heading(name, text=heading, command=lambda name=name: self.sort_by(name))
+            tree.column(name, width=width, anchor="center")
+        tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(sequence, self._on_wheel)
+        tree.bind("<Configure>", lambda event: self.flush())
+        self._rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        self.clear()
+
+    def clear(self):
+        self._columns = {}          # Stores {column name: int array, one slot per process}
+        self._colors = None         # Palette index per process
+        self._order = np.zeros(0, dtype=np.int64) # Rows shown, in display order
+        self._offset = 0            # First row shown
+        self._window = []           # pids of the materialized rows
+        self.sort_key = None        # (column, descending) or None for pid order
+        self.filter = None          # (column, lo, hi) or None
+        self.selected_pid = None
+        self.tree.delete(*self.tree.get_children())
+        self._update_headings()
+        self._set_scrollbar()
+
+    def __len__(self):
+        return len(self._order)
+
+    def show(self, processes, palette, colors):
+        """
+        Shows every process of a ProcessTable. palette is a list of
+        (background, foreground) pairs; colors holds each process's index into it.
+        """
+        self.clear()
+        self._columns = {name: processes.column(name).copy() for name, _, _ in COLUMNS}
+        self._colors = np.asarray(colors)
+        for i, (background, foreground) in enumerate(palette):
+            self.tree.tag_configure(f"color_{i}", background=background, foreground=foreground)
+        self._refilter()
+
+    # --- Sorting and filtering ---
+
+    def sort_by(self, column):
+        """Sorts on column; sorting on it again flips the direction."""
+        if not self._columns:
+            return
+        descending = self.sort_key is not None and self.sort_key == (column, False)
+        self.sort_key = (column, descending)
+        self._refilter()
+
+    def set_filter(self, column, lo=None, hi=None):
+        """Shows only the rows with lo <= column <= hi (either bound may be None); column None clears it."""
+        self.filter = None if column is None or (lo is None and hi is None) else (column, lo, hi)
+        self._refilter()
+
+    def _refilter(self):
+        if not self._columns:
+            return
+        rows = np.arange(len(self._columns["pid"]))
+        if self.filter is not None:
+            column, lo, hi = self.filter
+            values = self._columns[column]
+            keep = np.ones(len(values), dtype=bool)
+            if lo is not None:
+                keep &= values >= lo
+            if hi is not None:
+                keep &= values <= hi
+            rows = rows[keep]
+        if self.sort_key is not None:
+            column, descending = self.sort_key
+            # Stable, so equal keys stay in pid order either way
+            key = self._columns[column][rows].astype(np.int64)
+            rows = rows[np.argsort(-key if descending else key, kind="stable")]
+        self._order = rows
+        self._offset = 0
+        self._update_headings()
+        self.flush()
+
+    def _update_headings(self):
+        for name, heading, _ in COLUMNS:
+            if self.sort_key is not None and self.sort_key[0] == name:
+                heading += " ▼" if self.sort_key[1] else " ▲"
+            self.tree.heading(name, text=heading)
+
+    # --- Selection ---
+
+    def clear_selection(self):
+        self.selected_pid = None
+        if self.tree.selection():
+            self.tree.selection_set("")
+
+    def _on_tree_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            pid = int(self.tree.item(selection[0], "values")[0])
+        elif self.selected_pid in self._window:
+            pid = None              # Deselected while its row was in view
+        else:
+            return                  # Its row was only scrolled away
+        self.selected_pid = pid
+        if self.on_select is not None:
+            self.on_select(pid)
+
+    # --- Virtual window ---
+
+    def flush(self):
+        """Materializes the rows currently scrolled into view."""
+        visible = self._visible_rows()
+        self._offset = max(0, min(self._offset, len(self._order) - visible))
+        window = self._order[self._offset:self._offset + visible]
+        self.tree.delete(*self.tree.get_children())
+        columns = [self._columns[name][window].tolist() for name, _, _ in COLUMNS] if len(window) else []
+        self._window = columns[0] if columns else []
+        selected = None
+        for values, color in zip(zip(*columns), self._colors[window].tolist() if len(window) else ()):
+            item = self.tree.insert("", "end", values=values, tags=(f"color_{color}",))
+            if values[0] == self.selected_pid:
+                selected = item
+        if selected is not None:
+            self.tree.selection_set(selected)
+        self._set_scrollbar()
+
+    def _visible_rows(self):
+        # One row's height goes to the headings
+        return max(1, self.tree.winfo_height() // self._rowheight - 1)
+
+    def _set_scrollbar(self, *args):
+        total = len(self._order)
+        if total == 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        first = self._offset / total
+        last = min(1.0, (self._offset + self._visible_rows()) / total)
+        self.scrollbar.set(first, last)
+
+    def _on_scroll(self, action, amount, unit=None):
+        visible = self._visible_rows()
+        if action == "moveto":
+            offset = int(float(amount) * len(self._order))
+        elif unit == "pages":
+            offset = self._offset + int(amount) * visible
+        else:
+            offset = self._offset + int(amount)
+        self._scroll_to(offset)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._scroll_to(self._offset - 3)
+        else:
+            self._scroll_to(self._offset + 3)
+        return "break"
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(offset, len(self._order) - self._visible_rows()))
+        if offset != self._offset:
+            self._offset = offset
+            self.flush()
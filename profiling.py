@@ -0,0 +1,128 @@
+from collections import deque
+from contextlib import contextmanager, nullcontext
+import json
+import os
+import time
+
+
+class RollingHistogram:
+    """Keeps the last `size` samples of one phase plus all-time totals."""
+
+    # Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+    BUCKETS_MS = (0.01, 0.1, 0.5, 1, 2, 5, 10, 20, 50, 100)
+
+    def __init__(self, size=1000):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, q):
+        """q-th percentile (0-100) of the window, in seconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def buckets(self):
+        """Sample counts per BUCKETS_MS bucket over the window."""
+        counts = [0] * (len(self.BUCKETS_MS) + 1)
+        for seconds in self.samples:
+            ms = seconds * 1000
+            i = 0
+            while i < len(self.BUCKETS_MS) and ms > self.BUCKETS_MS[i]:
+                i += 1
+            counts[i] += 1
+        return counts
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "max_ms": max(self.samples, default=0.0) * 1000,
+            "buckets_ms": dict(zip([f"<={b}" for b in self.BUCKETS_MS] + ["more"], self.buckets())),
+        }
+
+
+class PhaseProfiler:
+    """
+    Switchable wall-clock timers around named phases.
+
+    `with profiler.phase("gantt"):` costs almost nothing while disabled. When
+    enabled, every timing feeds that phase's RollingHistogram and a bounded
+    list of trace events that can be exported in Chrome's trace format.
+    """
+
+    def __init__(self, window=1000, max_trace_events=200000):
+        self.enabled = False
+        self.window = window
+        self.histograms = {}        # Stores {phase name: RollingHistogram}
+        self.trace = deque(maxlen=max_trace_events)
+        self._origin = time.perf_counter()
+        self._null = nullcontext()
+
+    def reset(self):
+        self.histograms = {}
+        self.trace.clear()
+        self._origin = time.perf_counter()
+
+    def phase(self, name):
+        """Context manager timing one occurrence of a phase (no-op while disabled)."""
+        if not self.enabled:
+            return self._null
+        return self._timed(name)
+
+    def record(self, name, started, elapsed):
+        """Adds one occurrence of a phase timed elsewhere; started is a perf_counter() value."""
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = RollingHistogram(self.window)
+        histogram.add(elapsed)
+        self.trace.append((name, started - self._origin, elapsed))
+
+    def merge(self, other):
+        """Records every phase another profiler (e.g. a worker thread's) has traced."""
+        for name, start, elapsed in other.trace:
+            self.record(name, other._origin + start, elapsed)
+
+    @contextmanager
+    def _timed(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started, time.perf_counter() - started)
+
+    def summary(self):
+        """Returns {phase: stats} for every phase seen so far."""
+        return {name: h.summary() for name, h in self.histograms.items()}
+
+    def format_table(self):
+        """Short text table for the live stats panel."""
+        lines = [f"{'phase':<10}{'mean':>8}{'p95':>8}  ms"]
+        for name, h in sorted(self.histograms.items(), key=lambda item: -item[1].total):
+            lines.append(f"{name:<10}{h.total / h.count * 1000:>8.3f}{h.percentile(95) * 1000:>8.3f}")
+        return "\n".join(lines)
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def export_chrome_trace(self, path):
+        """Writes the recorded phases as complete ("X") events for chrome://tracing / Perfetto."""
+        pid = os.getpid()
+        events = [
+            {"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": pid, "tid": 1}
+            for name, start, duration in self.trace
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,142 @@
+from bisect import bisect_left
+import tkinter as tk
+import tkinter.font as tkfont
+
+
+class ReadyQueueView:
+    """
+    Ready-queue Listbox driven by queue change events.
+
+    Set it as the ready queue's listener: every push inserts one row at the
+    process's position and every pop deletes one row. In virtual mode the Listbox only holds the rows that are
+    scrolled into view; the full ordering is kept in Python lists and the
+    visible window is redrawn by flush() when something in it changed.
+    Several queues (e.g. one per CPU) can share one view; their rows are
+    merged by order key. Each row keeps the remaining burst it was pushed
+    with, so the view never reads the process table again; a scheduler
+    running ahead on another thread can change it freely.
+    """
+
+    def __init__(self, listbox, scrollbar, virtual=False):
+        self.listbox = listbox
+        self.scrollbar = scrollbar
+        self._linespace = tkfont.Font(font=listbox.cget("font")).metrics("linespace")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.listbox.bind(sequence, self._on_wheel)
+        self.reset(virtual)
+
+    def reset(self, virtual=False):
+        """Clears the view and selects plain or virtual mode."""
+        self.virtual = virtual
+        self._keys = []             # Sorted (order key, pid), parallel to self._rows
+        self._rows = []             # Queued (pid, remaining burst) in dispatch order
+        self._key_of = {}           # Stores {pid: (order key, pid)}
+        self._offset = 0            # First row shown (virtual mode)
+        self._dirty = False
+        self.listbox.delete(0, tk.END)
+        if virtual:
+            self.listbox.config(yscrollcommand=self._set_scrollbar)
+            self.scrollbar.config(command=self._on_scroll)
+        else:
+            self.listbox.config(yscrollcommand=self.scrollbar.set)
+            self.scrollbar.config(command=self.listbox.yview)
+
+    def __len__(self):
+        return len(self._rows)
+
+    # --- Queue listener interface ---
+
+    def on_push(self, p, key, remaining=None):
+        """remaining defaults to p's remaining burst now, when called on the table's own thread."""
+        row = (p['pid'], p['remaining_burst'] if remaining is None else remaining)
+        key = (key, p['pid'])       # Unique even when several queues feed the view
+        i = bisect_left(self._keys, key)
+        self._keys.insert(i, key)
+        self._rows.insert(i, row)
+        self._key_of[p['pid']] = key
+        if self.virtual:
+            self._touch(i)
+        else:
+            self.listbox.insert(i, self.format_row(row))
+
+    def on_pop(self, p):
+        i = bisect_left(self._keys, self._key_of.pop(p['pid']))
+        del self._keys[i]
+        del self._rows[i]
+        if self.virtual:
+            self._touch(i)
+        else:
+            self.listbox.delete(i)
+
+    def show(self, rows):
+        """
+        Replaces every row with (process, remaining burst) pairs, already in
+        dispatch order (e.g. a replayed queue).
+        """
+        self.reset(self.virtual)
+        for i, (p, remaining) in enumerate(rows):
+            self.on_push(p, i, remaining)
+        self.flush()
+
+    def format_row(self, row):
+        pid, remaining = row
+        return f" PID: {pid} (Burst: {remaining})"
+
+    # --- Virtual mode ---
+
+    def flush(self):
+        """Redraws the visible window if it changed (virtual mode only)."""
+        if not self.virtual or not self._dirty:
+            return
+        self._dirty = False
+        visible = self._visible_rows()
+        self._offset = max(0, min(self._offset, len(self._rows) - visible))
+        window = self._rows[self._offset:self._offset + visible]
+        self.listbox.delete(0, tk.END)
+        if window:
+            self.listbox.insert(0, *[self.format_row(p) for p in window])
+        self._set_scrollbar()
+
+    def _touch(self, i):
+        # Rows before the window shift it; rows after it only move the scrollbar
+        if i < self._offset + self._visible_rows():
+            self._dirty = True
+        else:
+            self._set_scrollbar()
+
+    def _visible_rows(self):
+        return max(1, self.listbox.winfo_height() // self._linespace + 1)
+
+    def _set_scrollbar(self, *args):
+        total = len(self._rows)
+        if total == 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        first = self._offset / total
+        last = min(1.0, (self._offset + self._visible_rows()) / total)
+        self.scrollbar.set(first, last)
+
+    def _on_scroll(self, action, amount, unit=None):
+        total = len(self._rows)
+        visible = self._visible_rows()
+        if action == "moveto":
+            offset = int(float(amount) * total)
+        elif unit == "pages":
+            offset = self._offset + int(amount) * visible
+        else:
+            offset = self._offset + int(amount)
+        self._scroll_to(offset)
+
+    def _on_wheel(self, event):
+        if not self.virtual:
+            return None
+        if event.num == 4 or event.delta > 0:
+            self._scroll_to(self._offset - 3)
+        else:
+            self._scroll_to(self._offset + 3)
+        return "break"
+
+    def _scroll_to(self, offset):
+        self._offset = max(0, min(offset, len(self._rows) - self._visible_rows()))
+        self._dirty = True
+        self.flush()
@@ -0,0 +1,510 @@
+from collections import deque
+import heapq
+
+MLFQ_LEVELS = 3                 # Feedback levels; level i runs quantum * 2**i
+MLFQ_AGING = 20                 # Quanta a process may wait in a lower level before promotion
+MLFQ_BOOST = 100                # Quanta between boosts of every process to the top level
+CFS_LATENCY = 8                 # Quanta in which every runnable process should run once
+CFS_WEIGHT_RATIO = 1.25         # CPU share lost per priority step, as with nice values
+CFS_MAX_NICE = 39
+
+
+class IndexedHeap:
+    """
+    Binary min-heap of (key, pid, process) entries with a pid -> position
+    index, so a queued process can be re-keyed or removed in O(log n).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._pos = {}              # Stores {pid: index into self._heap}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, pid):
+        return pid in self._pos
+
+    def __iter__(self):
+        """Iterates the entries in heap (not sorted) order."""
+        return iter(self._heap)
+
+    def push(self, key, pid, item):
+        self._heap.append((key, pid, item))
+        self._pos[pid] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def peek(self):
+        return self._heap[0][2]
+
+    def key_of(self, pid):
+        return self._heap[self._pos[pid]][0]
+
+    def pop(self):
+        return self._remove_at(0)
+
+    def remove(self, pid):
+        return self._remove_at(self._pos[pid])
+
+    def update(self, key, pid):
+        """Changes the key of a queued item (decrease-key or increase-key)."""
+        i = self._pos[pid]
+        old_key, _, item = self._heap[i]
+        self._heap[i] = (key, pid, item)
+        if key < old_key:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def clear(self):
+        self._heap.clear()
+        self._pos.clear()
+
+    # --- Heap internals ---
+
+    def _remove_at(self, i):
+        heap = self._heap
+        entry = heap[i]
+        del self._pos[entry[1]]
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            self._pos[last[1]] = i
+            self._sift_down(i)
+            self._sift_up(i)
+        return entry[2]
+
+    def _sift_up(self, i):
+        heap, pos = self._heap, self._pos
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if entry[0] < heap[parent][0]:
+                heap[i] = heap[parent]
+                pos[heap[i][1]] = i
+                i = parent
+            else:
+                break
+        heap[i] = entry
+        pos[entry[1]] = i
+
+    def _sift_down(self, i):
+        heap, pos = self._heap, self._pos
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if heap[child][0] < entry[0]:
+                heap[i] = heap[child]
+                pos[heap[i][1]] = i
+                i = child
+            else:
+                break
+        heap[i] = entry
+        pos[entry[1]] = i
+
+
+class _PolicyHooks:
+    """
+    Scheduling decisions the engines delegate to the ready queue.
+
+    The defaults describe a non-preemptive policy: a dispatched process runs
+    its whole remaining burst and arrivals never take a CPU over.
+    """
+
+    def time_slice(self, p):
+        """Longest run p may get once dispatched (None: until it completes)."""
+        return None
+
+    def should_preempt(self, p, running, ran):
+        """True if queued p should take over from running, which has run `ran` units so far."""
+        return False
+
+    def running_key(self, running, ran):
+        """How strongly a running process holds its CPU; the largest key is preempted first."""
+        return 0
+
+    def charge(self, p, ran):
+        """Accounts a finished run of `ran` units before p is re-queued (or completes)."""
+
+    def advance_to(self, t):
+        """Moves the queue's clock to time t before the engine dispatches."""
+
+
+class FifoReadyQueue(_PolicyHooks):
+    """
+    First-come, first-served ready queue (FCFS and Round Robin).
+
+    Like PriorityReadyQueue, it reports every change to an optional
+    listener through on_push(process, order_key) and on_pop(process).
+    With a quantum, every run is cut off after that many units.
+    """
+
+    def __init__(self, quantum=None):
+        self.quantum = quantum
+        self._queue = deque()
+        self._seq = 0               # Enqueue counter, the FIFO order key
+        self.listener = None
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __iter__(self):
+        return iter(self._queue)
+
+    def push(self, p):
+        self._queue.append(p)
+        self._seq += 1
+        if self.listener is not None:
+            self.listener.on_push(p, self._seq)
+
+    def pop(self):
+        p = self._queue.popleft()
+        if self.listener is not None:
+            self.listener.on_pop(p)
+        return p
+
+    def peek(self):
+        return self._queue[0]
+
+    def clear(self):
+        self._queue.clear()
+
+    def snapshot(self, limit=None):
+        """Returns the queued processes in dispatch order (at most limit of them)."""
+        if limit is None:
+            return list(self._queue)
+        return [p for _, p in zip(range(limit), self._queue)]
+
+    def time_slice(self, p):
+        return self.quantum
+
+
+class PriorityReadyQueue(_PolicyHooks):
+    """
+    Heap-backed ready queue ordered by key(process), for SJF and Priority.
+
+    Ties are broken by enqueue order, which reproduces the stable re-sort
+    the tick loop used to do: equal keys leave in arrival, then PID, order.
+    When preemptive, a queued process with a strictly smaller key takes
+    the CPU from the running one.
+    """
+
+    def __init__(self, key, preemptive=False):
+        self.key = key
+        self.preemptive = preemptive
+        self._heap = IndexedHeap()
+        self._seq = 0               # Enqueue counter used as the tie-breaker
+        self._snapshot = None       # Cached sorted view, dropped on every change
+        self.listener = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def push(self, p):
+        self._seq += 1
+        key = (self.key(p), self._seq)
+        self._heap.push(key, p['pid'], p)
+        self._snapshot = None
+        if self.listener is not None:
+            self.listener.on_push(p, key)
+
+    def pop(self):
+        self._snapshot = None
+        p = self._heap.pop()
+        if self.listener is not None:
+            self.listener.on_pop(p)
+        return p
+
+    def peek(self):
+        return self._heap.peek()
+
+    def remove(self, p):
+        self._snapshot = None
+        self._heap.remove(p['pid'])
+        if self.listener is not None:
+            self.listener.on_pop(p)
+        return p
+
+    def update(self, p):
+        """Re-keys a queued process after its key attribute changed."""
+        _, seq = self._heap.key_of(p['pid'])
+        key = (self.key(p), seq)
+        self._heap.update(key, p['pid'])
+        self._snapshot = None
+        if self.listener is not None:
+            self.listener.on_pop(p)
+            self.listener.on_push(p, key)
+
+    def clear(self):
+        self._heap.clear()
+        self._snapshot = None
+
+    def snapshot(self, limit=None):
+        """Returns the queued processes in dispatch order (at most limit of them)."""
+        if self._snapshot is None:
+            if limit is not None:
+                return [entry[2] for entry in heapq.nsmallest(limit, self._heap)]
+            self._snapshot = [entry[2] for entry in sorted(self._heap)]
+        if limit is None:
+            return list(self._snapshot)
+        return self._snapshot[:limit]
+
+    def should_preempt(self, p, running, ran):
+        return self.preemptive and self.key(p) < self.running_key(running, ran)
+
+    def running_key(self, running, ran):
+        return self.key(running)
+
+
+class ShortestRemainingQueue(PriorityReadyQueue):
+    """SRTF: ordered by remaining burst; a running process counts the units it has already run."""
+
+    def __init__(self):
+        super().__init__(lambda p: p['remaining_burst'], preemptive=True)
+
+    def running_key(self, running, ran):
+        return running['remaining_burst'] - ran
+
+
+class MultilevelFeedbackQueue(_PolicyHooks):
+    """
+    Multilevel feedback queue: MLFQ_LEVELS FIFO levels, quantum doubling per level.
+
+    Arrivals enter the top level. A process that uses its whole slice drops
+    one level; one cut short by a higher-level arrival keeps its level. A
+    process waiting MLFQ_AGING quanta in a lower level is promoted one
+    level, and every MLFQ_BOOST quanta every process goes back to the top,
+    so long jobs cannot starve. Dispatch only scans the level heads.
+    levels may be shared by the per-core queues of one machine.
+    """
+
+    def __init__(self, quantum, levels=None):
+        self.quantum = quantum
+        self._levels = [deque() for _ in range(MLFQ_LEVELS)] # (process, time it joined the level)
+        self._level = {} if levels is None else levels       # Stores {pid: level} for live processes
+        self._seq = 0
+        self._now = 0               # Set by advance_to() before the engine queues anything at that time
+        self._next_boost = MLFQ_BOOST * quantum
+        self._last_boost = None
+        self.listener = None
+
+    def __len__(self):
+        return sum(len(level) for level in self._levels)
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def push(self, p):
+        level = self._level.setdefault(p['pid'], 0)
+        self._levels[level].append((p, self._now))
+        self._seq += 1
+        if self.listener is not None:
+            self.listener.on_push(p, (level, self._seq))
+
+    def pop(self):
+        for level in self._levels:
+            if level:
+                p, _ = level.popleft()
+                if self.listener is not None:
+                    self.listener.on_pop(p)
+                return p
+        raise IndexError("pop from an empty queue")
+
+    def peek(self):
+        for level in self._levels:
+            if level:
+                return level[0][0]
+        raise IndexError("peek into an empty queue")
+
+    def clear(self):
+        for level in self._levels:
+            level.clear()
+
+    def snapshot(self, limit=None):
+        """Returns the queued processes in dispatch order (at most limit of them)."""
+        queued = (p for level in self._levels for p, _ in level)
+        if limit is None:
+            return list(queued)
+        return [p for _, p in zip(range(limit), queued)]
+
+    def time_slice(self, p):
+        return self.quantum << self._level.get(p['pid'], 0)
+
+    def should_preempt(self, p, running, ran):
+        return self._level[p['pid']] < self._level[running['pid']]
+
+    def running_key(self, running, ran):
+        return self._level[running['pid']]
+
+    def charge(self, p, ran):
+        pid = p['pid']
+        if p['remaining_burst'] == 0:
+            self._level.pop(pid, None)
+        elif ran >= self.time_slice(p) and self._now != self._last_boost:
+            # A run ending right at a boost is not demoted: the boost puts everyone on top
+            # (a boost during the run only resets the level it is demoted from)
+            self._level[pid] = min(self._level[pid] + 1, MLFQ_LEVELS - 1)
+
+    def advance_to(self, t):
+        self._now = t
+        # Boosts and promotions apply in the order they fell due and are stamped
+        # with that time, so the result is the same however rarely the engine
+        # calls in (as if it were called every tick)
+        aging = MLFQ_AGING * self.quantum
+        while True:
+            # Each level is in joining order, so only its head can be overdue
+            due, i = min(((level[0][1] + aging, i) for i, level in enumerate(self._levels) if i and level),
+                         default=(None, None))
+            if self._next_boost <= t and (due is None or self._next_boost <= due):
+                self._boost(self._next_boost)
+            elif due is not None and due <= t:
+                self._move(self._levels[i], i - 1, due)
+            else:
+                break
+
+    def _boost(self, t):
+        """Priority boost: every queued and running process back to the top level."""
+        for level in self._levels[1:]:
+            while level:
+                self._move(level, 0, t)
+        for pid in self._level:
+            self._level[pid] = 0
+        self._last_boost = t
+        self._next_boost = t + MLFQ_BOOST * self.quantum
+
+    def _move(self, level, target, t):
+        p, _ = level.popleft()
+        self._level[p['pid']] = target
+        self._levels[target].append((p, t))
+        self._seq += 1
+        if self.listener is not None:
+            self.listener.on_pop(p)
+            self.listener.on_push(p, (target, self._seq))
+
+
+class FairShareQueue(_PolicyHooks):
+    """
+    CFS-style fair queue: always runs the process with the least virtual runtime.
+
+    Virtual runtime grows by the units run times CFS_WEIGHT_RATIO ** priority
+    (priority acts like a nice value, capped at CFS_MAX_NICE), so
+    higher-priority processes get a larger share. A new process starts at the
+    queue's min_vruntime. Each run gets CFS_LATENCY quanta split by weight
+    across the runnable processes, but at least one quantum, and an arrival
+    takes the CPU over once the running process is more than a quantum of
+    virtual runtime ahead of it. Processes sit in an IndexedHeap keyed
+    (vruntime, enqueue order), so dispatch is O(log n). vruntimes may be
+    shared by the per-core queues of one machine.
+    """
+
+    def __init__(self, quantum, vruntimes=None):
+        self.quantum = quantum
+        self._heap = IndexedHeap()
+        self._vruntime = {} if vruntimes is None else vruntimes # Stores {pid: vruntime} for live processes
+        self.min_vruntime = 0.0
+        self._load = 0.0            # Total weight of the queued processes
+        self._seq = 0
+        self._snapshot = None
+        self.listener = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def push(self, p):
+        pid = p['pid']
+        vruntime = self._vruntime.setdefault(pid, self.min_vruntime)
+        self._seq += 1
+        key = (vruntime, self._seq)
+        self._heap.push(key, pid, p)
+        self._load += self._weight(p)
+        self._snapshot = None
+        if self.listener is not None:
+            self.listener.on_push(p, key)
+
+    def pop(self):
+        self._snapshot = None
+        p = self._heap.pop()
+        self._load -= self._weight(p)
+        self.min_vruntime = max(self.min_vruntime, self._vruntime[p['pid']])
+        if self.listener is not None:
+            self.listener.on_pop(p)
+        return p
+
+    def peek(self):
+        return self._heap.peek()
+
+    def clear(self):
+        self._heap.clear()
+        self._load = 0.0
+        self._snapshot = None
+
+    def snapshot(self, limit=None):
+        """Returns the queued processes in dispatch order (at most limit of them)."""
+        if self._snapshot is None:
+            if limit is not None:
+                return [entry[2] for entry in heapq.nsmallest(limit, self._heap)]
+            self._snapshot = [entry[2] for entry in sorted(self._heap)]
+        if limit is None:
+            return list(self._snapshot)
+        return self._snapshot[:limit]
+
+    def time_slice(self, p):
+        weight = self._weight(p)
+        return max(self.quantum, int(CFS_LATENCY * self.quantum * weight / (self._load + weight)))
+
+    def should_preempt(self, p, running, ran):
+        return self._vruntime[p['pid']] + self.quantum < self.running_key(running, ran)
+
+    def running_key(self, running, ran):
+        return self._vruntime[running['pid']] + ran / self._weight(running)
+
+    def charge(self, p, ran):
+        if p['remaining_burst'] == 0:
+            self._vruntime.pop(p['pid'], None)
+        else:
+            self._vruntime[p['pid']] += ran / self._weight(p)
+
+    def _weight(self, p):
+        return CFS_WEIGHT_RATIO ** -min(p['priority'], CFS_MAX_NICE)
+
+
+# Ready-queue ordering for the key-ordered algorithms in the GUI dropdown
+QUEUE_KEYS = {
+    "SJF": lambda p: p['burst'],
+    "Priority": lambda p: p['priority'],
+    "SRTF": lambda p: p['remaining_burst'],
+    "Preemptive Priority": lambda p: p['priority'],
+}
+
+
+def make_ready_queue(algorithm, time_quantum=4, state=None):
+    """
+    Builds the ready queue that matches the selected algorithm.
+
+    MLFQ and CFS keep per-process state (level, vruntime); pass the same
+    state dict to every per-core queue of one machine so it follows a
+    process that is stolen by another core.
+    """
+    if algorithm == "Round Robin":
+        return FifoReadyQueue(time_quantum)
+    if algorithm == "SRTF":
+        return ShortestRemainingQueue()
+    if algorithm == "MLFQ":
+        return MultilevelFeedbackQueue(time_quantum, state)
+    if algorithm == "CFS":
+        return FairShareQueue(time_quantum, state)
+    key = QUEUE_KEYS.get(algorithm)
+    if key is None:
+        return FifoReadyQueue()
+    return PriorityReadyQueue(key, preemptive=algorithm == "Preemptive Priority")
@@ -0,0 +1,182 @@
+from concurrent.futures import ProcessPoolExecutor
+import time
+
+from PIL import Image, ImageFilter
+
+from ready_queue import make_ready_queue
+
+
+def _upscale(img):
+    # Supersampled sharpen: 4x LANCZOS up, unsharp mask, back down to block size
+    big = img.resize((img.width * 4, img.height * 4), Image.Resampling.LANCZOS)
+    big = big.filter(ImageFilter.UnsharpMask(radius=4, percent=120))
+    return big.resize(img.size, Image.Resampling.LANCZOS)
+
+
+FILTERS = {
+    "blur": lambda img: img.filter(ImageFilter.GaussianBlur(2)),
+    "sharpen": lambda img: img.filter(ImageFilter.SHARPEN),
+    "edges": lambda img: img.filter(ImageFilter.FIND_EDGES),
+    "median": lambda img: img.filter(ImageFilter.MedianFilter(5)),
+    "upscale": _upscale,
+}
+
+# Filter chains offered in the GUI; one pass of the chain is one unit of burst
+FILTER_CHAINS = {
+    "Blur": ("blur",),
+    "Sharpen": ("sharpen",),
+    "Edges": ("edges",),
+    "Median": ("median",),
+    "Upscale x4": ("upscale",),
+    "Blur + Sharpen": ("blur", "sharpen"),
+}
+
+
+def render_slice(job):
+    """
+    Worker entry point: applies the filter chain `units` times to one block.
+
+    job is (pid, mode, size, pixel bytes, filter names, units). Returns
+    (pid, pixel bytes, start, end) with perf_counter timestamps taken in the
+    worker, so the timeline shows when the work really ran.
+    """
+    pid, mode, size, data, chain, units = job
+    started = time.perf_counter()
+    img = Image.frombytes(mode, size, data)
+    for _ in range(units):
+        for name in chain:
+            img = FILTERS[name](img)
+    return pid, img.tobytes(), started, time.perf_counter()
+
+
+class RenderFarm:
+    """
+    Dispatches real image-processing jobs onto a pool of worker processes.
+
+    Each block process is a job whose burst is the number of filter-chain
+    passes it needs. The selected policy orders the ready queue exactly as
+    in the simulation (the same ready queues are used); a policy with time
+    slices (Round Robin, MLFQ, CFS) hands a worker at most one slice of
+    passes, after which the partially rendered block goes back to the
+    queue. Slices already in flight are never interrupted, so preemptive
+    policies only take effect between slices. Arrivals are released in real time,
+    arrival * tick_seconds after start(). Call poll() regularly; it returns
+    the slices that finished since the last call.
+    """
+
+    def __init__(self, source, processes, algorithm, workers=4, time_quantum=4,
+                 chain=("blur",), tick_seconds=0.005):
+        self.source = source.convert("RGB")
+        self.processes = processes
+        self.algorithm = algorithm
+        self.workers = workers
+        self.time_quantum = time_quantum
+        self.chain = tuple(chain)
+        self.tick_seconds = tick_seconds
+
+        self._arrivals = sorted(processes, key=lambda p: (p['arrival'], p['pid']))
+        self._cursor = 0
+        self.ready_queue = make_ready_queue(algorithm, time_quantum)
+        self.completed_processes = []
+        self.segments = []          # (worker slot, pid, start, end) in seconds since start()
+        self.busy_time = [0.0] * workers
+        self._free_slots = list(range(workers - 1, -1, -1))
+        self._in_flight = {}        # Stores {future: (slot, process, units)}
+        self._images = {}           # Stores {pid: partially rendered block image}
+        self._release_time = {}     # Stores {pid: wall time it arrived}
+        self._completion_time = {}  # Stores {pid: wall time its last slice finished}
+        self._pool = None
+        self._t0 = None
+
+    @property
+    def finished(self):
+        return len(self.completed_processes) == len(self.processes)
+
+    def start(self):
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._t0 = time.perf_counter()
+
+    def shutdown(self):
+        """Stops the pool, dropping queued work (running slices are left to finish)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def now(self):
+        """Seconds since start()."""
+        return time.perf_counter() - self._t0
+
+    def poll(self):
+        """
+        Releases due arrivals, collects finished slices and refills idle workers.
+        Returns a list of (process, rendered image, remaining burst) for finished slices.
+        """
+        now = self.now()
+        self.ready_queue.advance_to(int(now / self.tick_seconds)) # Before any push, so it joins at now
+
+        # --- 1. Real-time arrivals ---
+        while self._cursor < len(self._arrivals) and self._arrivals[self._cursor]['arrival'] * self.tick_seconds <= now:
+            p = self._arrivals[self._cursor]
+            self._cursor += 1
+            self._release_time[p['pid']] = p['arrival'] * self.tick_seconds
+            self.ready_queue.push(p)
+
+        # --- 2. Finished slices ---
+        results = []
+        for future in [f for f in self._in_flight if f.done()]:
+            slot, p, units = self._in_flight.pop(future)
+            pid, data, started, ended = future.result()
+            started, ended = started - self._t0, ended - self._t0
+            img = Image.frombytes("RGB", self._images[pid].size, data)
+            self._images[pid] = img
+            self.segments.append((slot, pid, started, ended))
+            self.busy_time[slot] += ended - started
+            self._free_slots.append(slot)
+
+            p['remaining_burst'] -= units
+            self.ready_queue.charge(p, units)
+            if p['remaining_burst'] == 0:
+                self._completion_time[pid] = ended
+                self.completed_processes.append(p)
+                del self._images[pid]
+            else:
+                self.ready_queue.push(p) # Time slice used up
+            results.append((p, img, p['remaining_burst']))
+
+        # --- 3. Dispatch to idle workers ---
+        while self._free_slots and self.ready_queue:
+            self._dispatch(self.ready_queue.pop(), self._free_slots.pop())
+        return results
+
+    def _dispatch(self, p, slot):
+        pid = p['pid']
+        img = self._images.get(pid)
+        if img is None:
+            x, y = p['coords']
+            w, h = p['block_size']
+            img = self._images[pid] = self.source.crop((x, y, x + w, y + h))
+
+        units = p['remaining_burst']
+        time_slice = self.ready_queue.time_slice(p)
+        if time_slice is not None:
+            units = min(units, time_slice)
+        job = (pid, img.mode, img.size, img.tobytes(), self.chain, units)
+        self._in_flight[self._pool.submit(render_slice, job)] = (slot, p, units)
+
+    def running(self):
+        """Returns {worker slot: process} for the slices in flight."""
+        return {slot: p for slot, p, _ in self._in_flight.values()}
+
+    def stats(self):
+        """Real throughput, latency and per-worker utilization of the run so far."""
+        elapsed = max(self.now(), 1e-9)
+        latencies = sorted(self._completion_time[pid] - self._release_time[pid] for pid in self._completion_time)
+        n = len(latencies)
+        return {
+            "completed": n,
+            "elapsed": elapsed,
+            "throughput": n / elapsed,
+            "mean_latency": sum(latencies) / n if n else 0.0,
+            "p95_latency": latencies[min(n - 1, int(0.95 * n))] if n else 0.0,
+            "utilization": [busy / elapsed for busy in self.busy_time],
+        }
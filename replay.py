@@ -0,0 +1,243 @@
+from bisect import bisect_right
+from collections import namedtuple
+import json
+
+import numpy as np
+
+from process_table import ProcessTable
+from ready_queue import QUEUE_KEYS
+
+MAGIC = b"OSTRACE2"             # Version 2 stores the process table as an array, not in the header
+KINDS = ("arrive", "dispatch", "preempt", "complete", "idle")
+SNAPSHOT_EVERY = 4096           # Events between stored state snapshots
+
+# Scheduler state at one point of a recorded run.
+# remaining is indexed by pid - 1; running holds (pid, dispatch time) or None per core;
+# ready lists the queued PIDs in dispatch order.
+ReplayState = namedtuple("ReplayState", ["time", "remaining", "running", "ready", "completed"])
+
+
+class TraceRecorder:
+    """
+    Collects a run's events into flat arrays.
+
+    Feed it the events returned by engine.advance() (or engine.events()),
+    then call finish() for a seekable Trace.
+    """
+
+    def __init__(self, processes, algorithm, time_quantum=4, cores=1, queue_mode=None, source=None, grid_size=None):
+        self.header = {
+            "algorithm": algorithm,
+            "time_quantum": time_quantum,
+            "cores": cores,
+            "queue_mode": queue_mode,
+            "source": source,
+            "grid_size": grid_size,
+        }
+        # One row per process: pid, arrival, burst, priority, x, y, w, h
+        self.processes = np.array([
+            [p['pid'], p['arrival'], p['burst'], p['priority'], *p['coords'], *p['block_size']]
+            for p in processes
+        ], dtype=np.int32).reshape(-1, 8)
+        self.times, self.kinds, self.pids, self.cores = [], [], [], []
+        self._kind_code = {kind: i for i, kind in enumerate(KINDS)}
+
+    def record(self, events):
+        for event in events:
+            self.times.append(event.time)
+            self.kinds.append(self._kind_code[event.kind])
+            self.pids.append(event.pid or 0) # 0 marks "no process" (idle)
+            self.cores.append(event.core)
+
+    def finish(self):
+        return Trace(self.header, {
+            "processes": self.processes,
+            "times": np.array(self.times, dtype=np.int64),
+            "kinds": np.array(self.kinds, dtype=np.uint8),
+            "pids": np.array(self.pids, dtype=np.int32),
+            "cores": np.array(self.cores, dtype=np.uint16),
+        })
+
+
+class Trace:
+    """
+    A recorded run: the process table, the event arrays and periodic snapshots.
+
+    Every SNAPSHOT_EVERY events the full scheduler state is stored, so
+    state_at(t) bisects to the last snapshot before t and replays at most
+    that many events instead of re-simulating from t=0. Saved as one
+    compressed binary file: a JSON header with the run's settings, plus
+    NumPy arrays for the process table, the events and the snapshots.
+    """
+
+    def __init__(self, header, arrays):
+        self.header = header
+        self.table = arrays["processes"] # One row per process, as TraceRecorder stores it
+        self.times = arrays["times"]
+        self.kinds = arrays["kinds"]
+        self.pids = arrays["pids"]
+        self.cores = arrays["cores"]
+        self.bursts = self.table[:, 2]
+        # Ready order: fixed keys are precomputed, SRTF orders by the replayed
+        # remaining bursts, and MLFQ and CFS (whose levels and vruntimes are
+        # not recorded) fall back to enqueue order
+        self._by_remaining = header["algorithm"] == "SRTF"
+        key = None if self._by_remaining else QUEUE_KEYS.get(header["algorithm"])
+        self._order_key = None if key is None else {
+            int(row[0]): key({"burst": int(row[2]), "priority": int(row[3])}) for row in self.table
+        }
+        if "snap_event" in arrays:
+            self._snapshots = arrays
+        else:
+            self._snapshots = self._build_snapshots()
+        self._snap_times = self._snapshots["snap_time"].tolist()
+        self._build_segments()
+
+    @property
+    def end_time(self):
+        return int(self.times[-1]) if len(self.times) else 0
+
+    def processes(self):
+        """A fresh ProcessTable for the recorded workload, as build_processes makes it."""
+        return ProcessTable.from_columns(*self.table.T)
+
+    # --- Seeking ---
+
+    def state_at(self, t):
+        """State after every event with time <= t has been applied."""
+        s = max(0, bisect_right(self._snap_times, t) - 1)
+        snaps = self._snapshots
+        remaining = snaps["snap_remaining"][s].copy()
+        running = [None if pid == 0 else (int(pid), int(since)) for pid, since in snaps["snap_running"][s]]
+        lo, hi = snaps["snap_ready_offsets"][s], snaps["snap_ready_offsets"][s + 1]
+        ready = dict(zip(snaps["snap_ready_pids"][lo:hi].tolist(), snaps["snap_ready_seqs"][lo:hi].tolist()))
+        completed = int(snaps["snap_completed"][s])
+
+        i = int(snaps["snap_event"][s])
+        end = int(np.searchsorted(self.times, t, side="right"))
+        completed += self._apply(i, end, remaining, running, ready)
+
+        if self._by_remaining:
+            order = sorted(ready, key=lambda pid: (remaining[pid - 1], ready[pid]))
+        elif self._order_key is None:
+            order = sorted(ready, key=ready.get)
+        else:
+            order = sorted(ready, key=lambda pid: (self._order_key[pid], ready[pid]))
+        return ReplayState(t, remaining, running, order, completed)
+
+    def remaining_at(self, state, t):
+        """Remaining burst of every process at time t, counting the runs in progress."""
+        remaining = state.remaining.copy()
+        for entry in state.running:
+            if entry is not None:
+                pid, since = entry
+                remaining[pid - 1] -= t - since
+        return remaining
+
+    def segments(self, start, end):
+        """(time, pid or "Idle", length, core) runs overlapping [start, end), clipped to it."""
+        runs = []
+        for core, (starts, ends, pids) in enumerate(self._segments):
+            lo = int(np.searchsorted(ends, start, side="right"))
+            hi = int(np.searchsorted(starts, end, side="left"))
+            for i in range(lo, hi):
+                a, b = max(starts[i], start), min(ends[i], end)
+                if b > a:
+                    runs.append((int(a), int(pids[i]) or "Idle", int(b - a), core))
+        runs.sort(key=lambda run: (run[0], run[3]))
+        return runs
+
+    def _apply(self, i, end, remaining, running, ready):
+        """Applies events i..end-1 to the state in place; returns how many completed."""
+        completed = 0
+        times, kinds, pids, cores = self.times, self.kinds, self.pids, self.cores
+        for j in range(i, end):
+            kind = KINDS[kinds[j]]
+            pid = int(pids[j])
+            if kind == "arrive":
+                ready[pid] = j
+            elif kind == "dispatch":
+                del ready[pid]
+                running[cores[j]] = (pid, int(times[j]))
+            elif kind in ("preempt", "complete"):
+                remaining[pid - 1] -= int(times[j]) - running[cores[j]][1]
+                running[cores[j]] = None
+                if kind == "preempt":
+                    ready[pid] = j
+                else:
+                    completed += 1
+        return completed
+
+    def _build_snapshots(self):
+        cores = self.header["cores"]
+        remaining = self.bursts.astype(np.int32)
+        running = [None] * cores
+        ready = {}
+        completed = 0
+        snaps = {key: [] for key in ("snap_event", "snap_time", "snap_remaining", "snap_running",
+                                     "snap_ready_pids", "snap_ready_seqs", "snap_completed")}
+        offsets = [0]
+        for i in range(0, len(self.times) + 1, SNAPSHOT_EVERY):
+            if i:
+                completed += self._apply(i - SNAPSHOT_EVERY, i, remaining, running, ready)
+            snaps["snap_event"].append(i)
+            snaps["snap_time"].append(int(self.times[i - 1]) if i else 0)
+            snaps["snap_remaining"].append(remaining.copy())
+            snaps["snap_running"].append([entry or (0, 0) for entry in running])
+            snaps["snap_ready_pids"].extend(ready)
+            snaps["snap_ready_seqs"].extend(ready.values())
+            snaps["snap_completed"].append(completed)
+            offsets.append(len(snaps["snap_ready_pids"]))
+        return {
+            "snap_event": np.array(snaps["snap_event"], dtype=np.int64),
+            "snap_time": np.array(snaps["snap_time"], dtype=np.int64),
+            "snap_remaining": np.array(snaps["snap_remaining"], dtype=np.int32).reshape(-1, len(remaining)),
+            "snap_running": np.array(snaps["snap_running"], dtype=np.int64).reshape(-1, cores, 2),
+            "snap_ready_pids": np.array(snaps["snap_ready_pids"], dtype=np.int32),
+            "snap_ready_seqs": np.array(snaps["snap_ready_seqs"], dtype=np.int64),
+            "snap_ready_offsets": np.array(offsets, dtype=np.int64),
+            "snap_completed": np.array(snaps["snap_completed"], dtype=np.int64),
+        }
+
+    def _build_segments(self):
+        """Per-core (starts, ends, pids) arrays of runs, with idle gaps as pid 0."""
+        cores = self.header["cores"]
+        runs = [([], [], []) for _ in range(cores)]
+        since = [0] * cores                # Start of the current run or idle gap
+        current = [0] * cores
+        for t, kind, pid, core in zip(self.times.tolist(), self.kinds.tolist(),
+                                      self.pids.tolist(), self.cores.tolist()):
+            kind = KINDS[kind]
+            if kind not in ("dispatch", "preempt", "complete"):
+                continue
+            if t > since[core]:
+                starts, ends, pids = runs[core]
+                starts.append(since[core])
+                ends.append(t)
+                pids.append(current[core])
+            since[core] = t
+            current[core] = pid if kind == "dispatch" else 0
+        self._segments = [
+            (np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64), np.array(pids, dtype=np.int32))
+            for starts, ends, pids in runs
+        ]
+
+    # --- File format ---
+
+    def save(self, path):
+        arrays = {"processes": self.table, "times": self.times, "kinds": self.kinds, "pids": self.pids, "cores": self.cores}
+        arrays.update(self._snapshots)
+        header = np.frombuffer(json.dumps(self.header).encode(), dtype=np.uint8)
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            np.savez_compressed(f, header=header, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a scheduler trace")
+            with np.load(f) as data:
+                arrays = {name: data[name] for name in data.files}
+        header = json.loads(arrays.pop("header").tobytes())
+        return cls(header, arrays)
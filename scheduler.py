@@ -0,0 +1,254 @@
+from collections import namedtuple
+
+from process_table import ProcessTable
+from ready_queue import make_ready_queue
+
+# A single state change in the schedule.
+# kind is one of "arrive", "dispatch", "preempt", "complete" or "idle";
+# core is the CPU it happened on (always 0 on a single CPU).
+Event = namedtuple("Event", ["time", "kind", "pid", "core"], defaults=(0,))
+
+ALGORITHMS = ("FCFS", "SJF", "Priority", "Round Robin",
+              "SRTF", "Preemptive Priority", "MLFQ", "CFS")
+# Algorithms whose runs are cut into time quanta
+QUANTUM_ALGORITHMS = ("Round Robin", "MLFQ", "CFS")
+
+
+def average_times(completed):
+    """
+    Returns (average waiting time, average turnaround time) of completed processes.
+    A ProcessTable is reduced column-wise over its completed rows.
+    """
+    if isinstance(completed, ProcessTable):
+        return completed.average_times()
+    n = len(completed)
+    if n == 0:
+        return 0.0, 0.0
+    total_wait = 0
+    total_tat = 0
+    for p in completed:
+        tat = p['completion_time'] - p['arrival']
+        total_wait += tat - p['burst']
+        total_tat += tat
+    return total_wait / n, total_tat / n
+
+
+class ArrivalCursor:
+    """
+    Hands out a workload's processes in arrival order.
+
+    A sequence (list, ProcessTable) is sorted up front; ties keep PID order,
+    as in the tick loop. Any other iterable, e.g. a generator from
+    synthetic.py, is consumed lazily one process ahead and must already be in
+    arrival order. next_time is the next arrival (None once exhausted).
+    """
+
+    __slots__ = ("next_time", "_ordered", "_times", "_cursor", "_stream", "_next")
+
+    def __init__(self, processes):
+        if hasattr(processes, "__len__"):
+            self._ordered = sorted(processes, key=lambda p: (p['arrival'], p['pid']))
+            self._times = [p['arrival'] for p in self._ordered] + [None] # None marks the end
+            self._cursor = 0
+            self._stream = None
+            self.next_time = self._times[0]
+        else:
+            self._stream = iter(processes)
+            self._next = None
+            self.next_time = None
+            self._pull()
+
+    def pop(self):
+        """Returns the next arriving process and moves past it."""
+        if self._stream is not None:
+            p = self._next
+            self._pull()
+            return p
+        p = self._ordered[self._cursor]
+        self._cursor += 1
+        self.next_time = self._times[self._cursor]
+        return p
+
+    def _pull(self):
+        p = next(self._stream, None)
+        if p is not None and self.next_time is not None and p['arrival'] < self.next_time:
+            raise ValueError(f"process {p['pid']} arrives at {p['arrival']}, before the one streamed ahead of it")
+        self._next = p
+        self.next_time = None if p is None else p['arrival']
+
+
+class SchedulingEngine:
+    """
+    Headless, event-driven CPU scheduler.
+
+    Instead of ticking one time unit at a time, the engine jumps straight to
+    the next arrival, completion or quantum expiry. Processes are the same
+    dicts the GUI builds; the engine fills in 'start_time', 'completion_time',
+    'remaining_burst' and 'wait_time' as the run progresses. They may also be
+    a lazy stream in arrival order (see ArrivalCursor); with
+    keep_completed=False finished processes are counted but not kept, so
+    memory only grows with the processes in the system. With a switch_cost,
+    a CPU spends that many units (counted as busy) before running a
+    process other than the one it last ran; recordings assume none.
+    """
+
+    cores = 1
+
+    def __init__(self, processes, algorithm, time_quantum=4, keep_completed=True, switch_cost=0):
+        self.processes = processes
+        self.algorithm = algorithm
+        self.time_quantum = time_quantum
+        self.keep_completed = keep_completed
+        self.switch_cost = switch_cost
+
+        self._arrivals = ArrivalCursor(processes)
+        self._arrived = 0
+
+        self.ready_queue = make_ready_queue(algorithm, time_quantum)
+        self.completed_processes = []
+        self.completed_count = 0
+        self.current_process = None
+        self.time = 0
+        self.dispatch_time = 0
+        self.run_start = 0          # When the running process starts executing (after the switch cost)
+        self.run_end = 0
+        self.last_pid = None        # Process the CPU ran last, for switch costs
+        self.total_idle_time = 0
+        self._ready_since = {}      # Stores {pid: time it last entered the ready queue}
+
+    @property
+    def finished(self):
+        """True once every process has arrived and completed."""
+        return self._arrivals.next_time is None and self.completed_count == self._arrived
+
+    def next_event_time(self):
+        """Returns the time of the next event without applying it (None when done)."""
+        pending = self._arrivals.next_time
+        if self.current_process is not None:
+            if pending is not None and pending < self.run_end:
+                return pending
+            return self.run_end
+        if self.ready_queue:
+            return self.time
+        return pending
+
+    def advance(self, until):
+        """Applies every event with time <= until and returns them in order."""
+        events = []
+        while not self.finished:
+            t = self.next_event_time()
+            if t is None or t > until:
+                break
+            events.extend(self._apply_next(t))
+        return events
+
+    def events(self):
+        """Yields the whole schedule as a stream of events."""
+        while not self.finished:
+            yield from self._apply_next(self.next_event_time())
+
+    def run(self):
+        """Runs the schedule to completion and returns the completed processes."""
+        for _ in self.events():
+            pass
+        return self.completed_processes
+
+    def ready_queues(self):
+        """The ready queues to observe (always one on a single CPU)."""
+        return [self.ready_queue]
+
+    def running(self):
+        """Returns the process on each CPU (None when idle), indexed by core."""
+        return [self.current_process]
+
+    def remaining_at(self, t, core=0):
+        """Remaining burst of the running process at time t (during its current run)."""
+        p = self.current_process
+        if p is None:
+            return 0
+        return p['remaining_burst'] - max(0, t - self.run_start)
+
+    def remaining_after(self, t, core=0):
+        """Remaining burst of the running process once tick t has executed."""
+        return self.remaining_at(t + 1, core)
+
+    # --- Event application ---
+
+    def _apply_next(self, t):
+        """Applies all events that happen at time t, in tick-loop order."""
+        self.time = t
+        events = []
+        if self._arrived == 0 and t > 0:
+            # The CPU idled from t=0 until the first arrival
+            self.total_idle_time += t
+            events.append(Event(0, "idle", None))
+        # The queue's clock moves first, so everything queued below joins at t
+        queue = self.ready_queue
+        queue.advance_to(t)
+
+        # 1. The running process ends its run (completion or quantum expiry)
+        if self.current_process is not None and self.run_end == t:
+            events.append(self._end_run(t))
+
+        # 2. New arrivals join the ready queue
+        arrivals = self._arrivals
+        while arrivals.next_time is not None and arrivals.next_time <= t:
+            p = arrivals.pop()
+            self._arrived += 1
+            self._enqueue(p, t)
+            events.append(Event(t, "arrive", p['pid']))
+
+        # 3. Under a preemptive policy a better queued process takes the CPU over
+        if (self.current_process is not None and queue
+                and queue.should_preempt(queue.peek(), self.current_process, max(0, t - self.run_start))):
+            events.append(self._end_run(t))
+
+        # 4. A free CPU picks the next process, or idles until the next arrival
+        if self.current_process is None:
+            if self.ready_queue:
+                events.append(self._dispatch(t))
+            elif arrivals.next_time is not None:
+                self.total_idle_time += arrivals.next_time - t
+                events.append(Event(t, "idle", None))
+        return events
+
+    def _enqueue(self, p, t):
+        self._ready_since[p['pid']] = t
+        self.ready_queue.push(p)
+
+    def _dispatch(self, t):
+        p = self.ready_queue.pop()
+        p['wait_time'] += t - self._ready_since.pop(p['pid'])
+        if p['start_time'] == -1:
+            p['start_time'] = t
+
+        run_length = p['remaining_burst']
+        time_slice = self.ready_queue.time_slice(p)
+        if time_slice is not None:
+            run_length = min(run_length, time_slice)
+
+        switch = self.switch_cost if self.last_pid not in (None, p['pid']) else 0
+        self.current_process = p
+        self.last_pid = p['pid']
+        self.dispatch_time = t
+        self.run_start = t + switch
+        self.run_end = self.run_start + run_length
+        return Event(t, "dispatch", p['pid'])
+
+    def _end_run(self, t):
+        p = self.current_process
+        ran = max(0, t - self.run_start)
+        p['remaining_burst'] -= ran
+        self.ready_queue.charge(p, ran)
+        self.current_process = None
+
+        if p['remaining_burst'] == 0:
+            p['completion_time'] = t
+            self.completed_count += 1
+            if self.keep_completed:
+                self.completed_processes.append(p)
+            return Event(t, "complete", p['pid'])
+
+        # Time slice expired or preempted: back into the queue
+        self._enqueue(p, t)
+        return Event(t, "preempt", p['pid'])
@@ -1,9 +1,28 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from PIL import Image, ImageTk, ImageStat
-import math
-from collections import deque
+from PIL import Image, ImageTk
+import os
 import random
+import time
+from collections import deque
+
+import numpy as np
+
+from scheduler import ALGORITHMS, QUANTUM_ALGORITHMS, SchedulingEngine, average_times
+from smp import QUEUE_MODES, MultiCoreEngine
+from ingest import load_for_grid, make_thumbnail, open_source
+from workload_cache import WorkloadCache, cached_workload
+from block_images import BlockImageCache
+from gantt import GanttChart
+from queue_view import ReadyQueueView
+from process_view import FILTER_COLUMNS, PALETTE_SIZE, ProcessTableView
+from profiling import PhaseProfiler
+from metrics import SchedulingMetrics
+from render_farm import FILTER_CHAINS, RenderFarm
+from replay import Trace, TraceRecorder
+from background import BackgroundJob, stream_engine
+from compare import COMPARISON_QUANTA, TABLE_FIELDS, ComparisonRunner, comparison_runs, run_label
+from tuning import OBJECTIVES, QuantumTuner, plot_results
 
 class VisualSchedulingSimulator:
     
@@ -48,21 +67,52 @@ class VisualSchedulingSimulator:
 
         # --- Process/Data Storage ---
         self.processes = []           # Master list of all generated processes
-        self.ready_queue = deque()
-        self.completed_processes = []
-        self.current_process = None
+        self.engine = None            # Headless scheduling core for the current run
         self.current_time = 0
-        self.time_slice_remaining = 0
-        self.total_idle_time = 0
         self.simulation_running = False
         self.simulation_delay = 5  # Default delay in ms
         self.gantt_colors = {}
         self.process_map = {}         # Stores {pid: process_object}
+        self.virtual_queue_threshold = 500 # Above this many processes, only visible queue rows exist
         self.base_image = None
+        self.source_path = None       # File behind base_image; re-opened lazily for each generation
+        self.block_images = None      # Lazily created, LRU-bounded block PhotoImages
+        self.framebuffer = None       # The whole image view: one canvas-sized PhotoImage every block is painted into
+        self.placeholder = None       # Pending-block picture (gray boxes) the framebuffer starts from
+        self.overlay_items = []       # One persistent progress rectangle per CPU, moved instead of recreated
+        self.overlay_pids = []        # PID whose block each CPU's overlay is currently covering
         
         self.random_arrival_var = tk.BooleanVar(value=True) # Variable for the checkbox
-        self.all_algorithms = ("FCFS", "SJF", "Priority", "Round Robin")
-        self.no_fcfs_algorithms = ("SJF", "Priority", "Round Robin")
+        self.source_stats_var = tk.BooleanVar(value=False) # Block statistics from the full-resolution file
+        self.turbo_var = tk.BooleanVar(value=False) # Many ticks per frame instead of one per tick
+        self.frame_budget = 0.016     # Seconds of scheduling per frame in turbo mode
+        self.profiler = PhaseProfiler() # Per-phase timers, switched on by the checkbox
+        self.profile_var = tk.BooleanVar(value=False)
+        self.profile_refresh_ms = 500 # How often the live stats panel is redrawn
+        self.farm = None              # Worker pool running real block jobs (real rendering mode)
+        self.farm_segments_drawn = 0  # Worker timeline segments already on the Gantt chart
+        self.render_var = tk.BooleanVar(value=False)
+        self.grid_size = None
+        self.workload_cache = WorkloadCache() # Generated workloads on disk, keyed by image content and parameters
+        self.recorder = None          # Collects the running engine's events
+        self.metrics = None           # Streaming percentiles, throughput and utilization of the current run
+        self.metrics_refresh_ms = 250 # How often the live metrics panel is redrawn
+        self.job = None               # Worker thread generating a workload or running the scheduler
+        self.poll_ms = 30             # How often the UI drains the worker's queue while generating
+        self.pending_steps = deque()  # Simulation steps received from the worker but not yet shown
+        self.stream_horizon = 0       # Received steps cover every event before this time (None: all received)
+        self.cpu_view = []            # Per CPU as of the last shown step: (process, remaining, time) or None
+        self.shown_remaining = None   # Remaining burst per PID - 1 as of the last shown step
+        self.comparison = None        # Worker pool running every policy on the current workload
+        self.comparison_window = None # Toplevel holding the comparison metrics table
+        self.comparison_tree = None
+        self.tuner = None             # Worker pool searching for the best time quantum
+        self.tuning_window = None     # Toplevel with the tuner's charts
+        self.trace = None             # Recorded (or opened) run that the replay bar scrubs through
+        self.replay_drawn = None      # Remaining burst per block as currently drawn in replay
+        self.replay_gantt_end = 0     # Time the Gantt chart is drawn up to in replay
+        self.all_algorithms = ALGORITHMS
+        self.no_fcfs_algorithms = tuple(a for a in ALGORITHMS if a != "FCFS")
 
 
         # --- Main Layout Frames ---
@@ -127,6 +177,11 @@ class VisualSchedulingSimulator:
         self.grid_size_entry = ttk.Entry(grid_frame, width=5, font=("Helvetica", 11))
         self.grid_size_entry.pack(side=tk.LEFT, padx=5)
         self.grid_size_entry.insert(0, "10")
+        
+        ttk.Label(grid_frame, text="Seed:").pack(side=tk.LEFT, padx=5)
+        self.seed_entry = ttk.Entry(grid_frame, width=6, font=("Helvetica", 11))
+        self.seed_entry.pack(side=tk.LEFT, padx=5)
+        self.seed_entry.insert(0, "0")
 
         # --- Moved Checkbutton here ---
         self.random_arrival_check = ttk.Checkbutton(img_frame, text="Random Arrival Time?", 
@@ -134,10 +189,21 @@ class VisualSchedulingSimulator:
                                                     onvalue=True, offvalue=False, 
                                                     command=self.on_random_arrival_toggle)
         self.random_arrival_check.pack(fill=tk.X, pady=8, padx=5) # Added a bit of padding
+        
+        self.source_stats_check = ttk.Checkbutton(img_frame, text="Burst from Full-Resolution Source?", 
+                                                  variable=self.source_stats_var, 
+                                                  onvalue=True, offvalue=False)
+        self.source_stats_check.pack(fill=tk.X, pady=(0, 8), padx=5)
 
         self.generate_procs_button = ttk.Button(img_frame, text="Generate Processes from Image", command=self.generate_processes, state="disabled")
         self.generate_procs_button.pack(fill=tk.X, pady=10, ipady=5)
         
+        # Generation runs in the background; Stop & Reset cancels it
+        self.generate_progress = ttk.Progressbar(img_frame, mode="determinate", maximum=1.0)
+        self.generate_progress.pack(fill=tk.X, padx=5)
+        self.generate_status = ttk.Label(img_frame, text="", font=("Helvetica", 9))
+        self.generate_status.pack(fill=tk.X, padx=5)
+        
         # --- Algorithm Frame ---
         algo_frame = ttk.Frame(parent, padding="15", relief="solid", borderwidth=1)
         algo_frame.pack(fill=tk.X, pady=10)
@@ -158,10 +224,47 @@ class VisualSchedulingSimulator:
 
         tq_frame = ttk.Frame(algo_frame)
         tq_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(tq_frame, text="Time Quantum (for RR):").pack(side=tk.LEFT, padx=5)
+        ttk.Label(tq_frame, text="Time Quantum (RR/MLFQ/CFS):").pack(side=tk.LEFT, padx=5)
         self.time_quantum_entry = ttk.Entry(tq_frame, width=5, font=("Helvetica", 11))
         self.time_quantum_entry.pack(side=tk.LEFT, padx=5, expand=True)
         self.time_quantum_entry.insert(0, "4")
+        self.tune_button = ttk.Button(tq_frame, text="Tune", command=self.tune_quantum, state="disabled")
+        self.tune_button.pack(side=tk.LEFT, padx=5)
+        
+        # --- Quantum tuner: what to minimize and what a context switch costs ---
+        tune_frame = ttk.Frame(algo_frame)
+        tune_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(tune_frame, text="Switch Cost:").pack(side=tk.LEFT, padx=5)
+        self.switch_cost_entry = ttk.Entry(tune_frame, width=4, font=("Helvetica", 11))
+        self.switch_cost_entry.pack(side=tk.LEFT, padx=5)
+        self.switch_cost_entry.insert(0, "0")
+        self.objective_var = tk.StringVar(value=next(iter(OBJECTIVES)))
+        self.objective_dropdown = ttk.Combobox(tune_frame, textvariable=self.objective_var, width=16, 
+                                               values=tuple(OBJECTIVES), state="readonly")
+        self.objective_dropdown.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
+        # --- Quanta the tuner searches; an empty maximum means the longest burst ---
+        tune_range_frame = ttk.Frame(algo_frame)
+        tune_range_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(tune_range_frame, text="Tune Quanta:").pack(side=tk.LEFT, padx=5)
+        self.min_quantum_entry = ttk.Entry(tune_range_frame, width=5, font=("Helvetica", 11))
+        self.min_quantum_entry.pack(side=tk.LEFT, padx=5)
+        self.min_quantum_entry.insert(0, "1")
+        ttk.Label(tune_range_frame, text="to").pack(side=tk.LEFT)
+        self.max_quantum_entry = ttk.Entry(tune_range_frame, width=5, font=("Helvetica", 11))
+        self.max_quantum_entry.pack(side=tk.LEFT, padx=5)
+        
+        # --- Simulated CPUs: more than one runs the SMP engine ---
+        cores_frame = ttk.Frame(algo_frame)
+        cores_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(cores_frame, text="CPU Cores:").pack(side=tk.LEFT, padx=5)
+        self.cores_entry = ttk.Entry(cores_frame, width=4, font=("Helvetica", 11))
+        self.cores_entry.pack(side=tk.LEFT, padx=5)
+        self.cores_entry.insert(0, "1")
+        self.queue_mode_var = tk.StringVar(value="Global")
+        self.queue_mode_dropdown = ttk.Combobox(cores_frame, textvariable=self.queue_mode_var, width=18, 
+                                                values=QUEUE_MODES, state="readonly")
+        self.queue_mode_dropdown.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         
         delay_frame = ttk.Frame(algo_frame)
         delay_frame.pack(fill=tk.X, pady=5)
@@ -170,9 +273,53 @@ class VisualSchedulingSimulator:
         self.delay_entry.pack(side=tk.LEFT, padx=5, expand=True)
         self.delay_entry.insert(0, "1000")
         
+        self.turbo_check = ttk.Checkbutton(algo_frame, text="Turbo Mode (ignores delay)?", 
+                                           variable=self.turbo_var, 
+                                           onvalue=True, offvalue=False)
+        self.turbo_check.pack(fill=tk.X, pady=5, padx=5)
+        
+        self.profile_check = ttk.Checkbutton(algo_frame, text="Profile Phases?", 
+                                             variable=self.profile_var, 
+                                             onvalue=True, offvalue=False, 
+                                             command=self.on_profile_toggle)
+        self.profile_check.pack(fill=tk.X, pady=5, padx=5)
+        
+        # --- Real rendering: blocks run actual filter jobs on a worker pool ---
+        self.render_check = ttk.Checkbutton(algo_frame, text="Real Parallel Rendering?", 
+                                            variable=self.render_var, 
+                                            onvalue=True, offvalue=False)
+        self.render_check.pack(fill=tk.X, pady=5, padx=5)
+        
+        render_frame = ttk.Frame(algo_frame)
+        render_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(render_frame, text="Workers:").pack(side=tk.LEFT, padx=5)
+        self.workers_entry = ttk.Entry(render_frame, width=4, font=("Helvetica", 11))
+        self.workers_entry.pack(side=tk.LEFT, padx=5)
+        self.workers_entry.insert(0, str(min(4, os.cpu_count() or 1)))
+        self.filter_var = tk.StringVar(value="Blur")
+        self.filter_dropdown = ttk.Combobox(render_frame, textvariable=self.filter_var, width=12, 
+                                            values=tuple(FILTER_CHAINS), state="readonly")
+        self.filter_dropdown.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
+        export_frame = ttk.Frame(algo_frame)
+        export_frame.pack(fill=tk.X, pady=5)
+        ttk.Button(export_frame, text="Export Profile", command=self.export_profile_json).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 2))
+        ttk.Button(export_frame, text="Export Trace", command=self.export_profile_trace).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+        ttk.Button(export_frame, text="Export Metrics", command=self.export_metrics).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(2, 0))
+        
+        # --- Recorded runs: save the last run, or open one to scrub through ---
+        recording_frame = ttk.Frame(algo_frame)
+        recording_frame.pack(fill=tk.X, pady=5)
+        ttk.Button(recording_frame, text="Save Recording", command=self.save_recording).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 2))
+        ttk.Button(recording_frame, text="Open Recording", command=self.open_recording).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(2, 0))
+        
         self.run_button = ttk.Button(algo_frame, text="Run Simulation", style="Run.TButton", command=self.run_simulation, state="disabled")
         self.run_button.pack(fill=tk.X, pady=8, ipady=4) # Reduced ipady from 8, pady from 10
         
+        # Every policy (Round Robin at several quanta) on the same workload, in parallel
+        self.compare_button = ttk.Button(algo_frame, text="Compare All Policies", command=self.compare_policies, state="disabled")
+        self.compare_button.pack(fill=tk.X, pady=4, ipady=4)
+        
         self.stop_button = ttk.Button(algo_frame, text="Stop & Reset", style="Stop.TButton", command=self.reset_simulation, state="disabled")
         self.stop_button.pack(fill=tk.X, pady=4, ipady=4) # Reduced ipady from 8, pady from 5
         
@@ -182,27 +329,32 @@ class VisualSchedulingSimulator:
 
         ttk.Label(process_frame, text="Generated Processes", style="Header.TLabel").pack(pady=5, anchor="w")
         
+        # --- Filter: show only rows with min <= column <= max (click a heading to sort) ---
+        filter_frame = ttk.Frame(process_frame)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT)
+        self.filter_column_var = tk.StringVar(value=FILTER_COLUMNS[1].capitalize())
+        ttk.Combobox(filter_frame, textvariable=self.filter_column_var, width=8, state="readonly",
+                     values=[name.capitalize() for name in FILTER_COLUMNS]).pack(side=tk.LEFT, padx=5)
+        self.filter_min_entry = ttk.Entry(filter_frame, width=5, font=("Helvetica", 10))
+        self.filter_min_entry.pack(side=tk.LEFT)
+        ttk.Label(filter_frame, text="to").pack(side=tk.LEFT, padx=3)
+        self.filter_max_entry = ttk.Entry(filter_frame, width=5, font=("Helvetica", 10))
+        self.filter_max_entry.pack(side=tk.LEFT)
+        for entry in (self.filter_min_entry, self.filter_max_entry):
+            entry.bind("<Return>", lambda event: self.apply_process_filter())
+        ttk.Button(filter_frame, text="Apply", command=self.apply_process_filter).pack(side=tk.LEFT, padx=5)
+        
         tree_frame = ttk.Frame(process_frame)
         tree_frame.pack(fill=tk.BOTH, expand=True)
         
         tree_scroll = ttk.Scrollbar(tree_frame, orient="vertical")
-        self.process_tree = ttk.Treeview(tree_frame, columns=("ID", "Arrival", "Burst", "Priority"), show="headings", height=8, yscrollcommand=tree_scroll.set) # Reduced height from 10
-        tree_scroll.config(command=self.process_tree.yview)
-        
+        self.process_tree = ttk.Treeview(tree_frame, height=8) # Reduced height from 10
         tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.process_tree.pack(fill=tk.BOTH, expand=True)
         
-        # Add click binding for highlighting
-        self.process_tree.bind("<<TreeviewSelect>>", self.on_process_select)
-        
-        self.process_tree.heading("ID", text="PID")
-        self.process_tree.heading("Arrival", text="Arrival")
-        self.process_tree.heading("Burst", text="Burst")
-        self.process_tree.heading("Priority", text="Priority")
-        self.process_tree.column("ID", width=40, anchor="center")
-        self.process_tree.column("Arrival", width=60, anchor="center")
-        self.process_tree.column("Burst", width=60, anchor="center")
-        self.process_tree.column("Priority", width=60, anchor="center")
+        # Only the visible rows exist; selecting one highlights its block
+        self.process_view = ProcessTableView(self.process_tree, tree_scroll, on_select=self.on_process_select)
         
     def create_visualization_ui(self, parent):
         """Creates the right-hand visualization panel."""
@@ -214,9 +366,21 @@ class VisualSchedulingSimulator:
         self.time_label = ttk.Label(time_stats_frame, text="Current Time: 0", style="Time.TLabel")
         self.time_label.pack(side=tk.LEFT, padx=20)
         
+        # Live per-phase timings (only shown while profiling)
+        self.profile_label = ttk.Label(time_stats_frame, text="", font=("Courier", 9), background="#e8e8e8", justify="left")
+        self.profile_label.pack(side=tk.RIGHT, padx=10)
+        
+        # Live run metrics: percentiles, throughput, utilization, context switches
+        self.metrics_label = ttk.Label(time_stats_frame, text="", font=("Courier", 9), background="#e8e8e8", justify="left")
+        self.metrics_label.pack(side=tk.RIGHT, padx=10)
+        
         self.stats_label = ttk.Label(time_stats_frame, text="", style="Result.TLabel", background="#e8e8e8")
         self.stats_label.pack(side=tk.RIGHT, padx=20)
         
+        # --- Replay Bar (enabled once a run is recorded or opened) ---
+        self.replay_scale = ttk.Scale(parent, from_=0, to=1, orient="horizontal", command=self.on_replay_scrub, state="disabled")
+        self.replay_scale.pack(fill=tk.X, padx=20)
+        
         # --- Main Viz Frame (Image + Ready Queue) ---
         viz_frame = ttk.Frame(parent, style="Background.TFrame")
         viz_frame.pack(fill=tk.BOTH, expand=True, pady=5)
@@ -250,6 +414,9 @@ class VisualSchedulingSimulator:
         queue_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.queue_listbox.pack(fill=tk.BOTH, expand=True)
         
+        # Inserts/deletes single rows as the ready queue changes
+        self.queue_view = ReadyQueueView(self.queue_listbox, queue_scroll)
+        
         # --- Gantt Chart Canvas ---
         gantt_frame = ttk.Frame(parent, padding="15", relief="solid", borderwidth=1)
         gantt_frame.pack(fill=tk.X, pady=10)
@@ -257,34 +424,44 @@ class VisualSchedulingSimulator:
         ttk.Label(gantt_frame, text="Live Gantt Chart", style="Header.TLabel").pack(pady=5, anchor="n")
         
         self.gantt_canvas = tk.Canvas(gantt_frame, width=1000, height=60, bg="#ffffff", highlightthickness=1, relief="sunken") # Reduced height from 80
-        self.gantt_canvas.pack(fill=tk.X, expand=True, pady=10)
+        self.gantt_canvas.pack(fill=tk.X, expand=True, pady=(10, 0))
         self.gantt_canvas.bind("<Button-1>", self.clear_highlight) # Add click to clear highlight
         
+        gantt_scroll = ttk.Scrollbar(gantt_frame, orient="horizontal")
+        gantt_scroll.pack(fill=tk.X, pady=(0, 10))
+        
+        # Coalesces runs into bars and only keeps the visible ones on the canvas
+        self.gantt_chart = GanttChart(self.gantt_canvas, gantt_scroll)
+        
     def load_image(self):
         """Opens a file dialog to load an image."""
         try:
             filepath = filedialog.askopenfilename(
                 title="Select an Image",
-                filetypes=[("Image Files", "*.png *.jpg *.jpeg *.bmp *.gif")]
+                filetypes=[("Image Files", "*.png *.jpg *.jpeg *.bmp *.gif *.tif *.tiff *.ppm")]
             )
             if not filepath:
                 return
 
-            self.base_image = Image.open(filepath)
+            # Only the header is read here; pixels are decoded when processes are generated
+            self.base_image = open_source(filepath)
+            self.source_path = filepath
             
-            # Create a thumbnail for the label
-            thumb = self.base_image.copy()
-            thumb.thumbnail((250, 60)) # (width, height) - Reduced height from 80
+            # Create a thumbnail for the label (decoded at reduced scale where possible)
+            thumb = make_thumbnail(filepath, (250, 60)) # (width, height) - Reduced height from 80
             self.tk_thumb = ImageTk.PhotoImage(thumb)
             
             self.image_label.config(image=self.tk_thumb, text="")
             self.generate_procs_button.config(state="normal")
             self.run_button.config(state="disabled") # Require re-generation
+            self.compare_button.config(state="disabled")
+            self.tune_button.config(state="disabled")
             self.reset_simulation()
             
         except Exception as e:
             messagebox.showerror("Image Load Error", f"Failed to load image: {e}")
             self.base_image = None
+            self.source_path = None
             self.generate_procs_button.config(state="disabled")
 
     def generate_processes(self):
@@ -299,102 +476,124 @@ class VisualSchedulingSimulator:
         except ValueError:
             messagebox.showerror("Invalid Input", "Grid Size must be a positive integer (e.g., 10).")
             return
+        
+        try:
+            seed = int(self.seed_entry.get())
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Seed must be an integer (e.g., 0).")
+            return
             
         self.reset_simulation()
+        self.grid_size = N
+        
+        # Canvas-sized image, burst from block complexity (optionally measured
+        # on the full-resolution source), priority from distance to center and
+        # arrival staggered (seeded) or 0 based on the checkbox. Repeats are
+        # read back from the on-disk workload cache. All of it runs on a worker
+        # thread so the window keeps repainting.
+        cache, source, size = self.workload_cache, self.source_path or self.base_image, self.image_canvas_size
+        random_arrival, source_stats = self.random_arrival_var.get(), self.source_stats_var.get()
+        # The worker times its decode, measure and cache steps on its own profiler,
+        # returned with the result and merged into the panel's
+        worker_profiler = PhaseProfiler()
+        worker_profiler.enabled = self.profiler.enabled
+        
+        def generate(job):
+            with worker_profiler.phase("generate"):
+                img, processes = cached_workload(cache, source, N, size, random_arrival, seed, source_stats,
+                                                 progress=job.progress, profiler=worker_profiler)
+            return img, processes, worker_profiler
+        
+        self.job = BackgroundJob(generate, name="generate-workload").start()
+        self.generate_procs_button.config(state="disabled")
+        self.run_button.config(state="disabled")
+        self.compare_button.config(state="disabled")
+        self.tune_button.config(state="disabled")
+        self.stop_button.config(state="normal")
+        self.poll_generation(self.job)
+
+    def poll_generation(self, job):
+        """Shows the worker's progress until the workload is ready, then draws it."""
+        if job is not self.job:
+            return # Cancelled by Stop & Reset
+        self.generate_progress.config(value=job.fraction)
+        self.generate_status.config(text=job.status)
+        if not job.finished:
+            self.root.after(self.poll_ms, self.poll_generation, job)
+            return
         
-        # Resize image to fit the canvas for visualization
-        img = self.base_image.resize((self.image_canvas_size, self.image_canvas_size), Image.Resampling.LANCZOS)
-        
-        block_w = self.image_canvas_size // N
-        block_h = self.image_canvas_size // N
-        center_x, center_y = N / 2, N / 2
-        pid_counter = 1
-        
-        # --- Set arrival times based on checkbox ---
-        if self.random_arrival_var.get():
-            arrival_times = [i*2 for i in range(N*N)] # Stagger arrivals
-            random.shuffle(arrival_times)
-        else:
-            arrival_times = [0] * (N*N) # All arrive at time 0
+        self.job = None
+        self.generate_progress.config(value=0)
+        self.generate_status.config(text="")
+        self.generate_procs_button.config(state="normal")
+        if job.error is not None:
+            messagebox.showerror("Generation Error", f"Failed to generate processes: {job.error}")
+            return
+        img, self.processes, worker_profiler = job.result
+        self.profiler.merge(worker_profiler)
+        with self.profiler.phase("show"):
+            self.show_processes(img)
+        self.update_profile_panel()
 
-        for y in range(N):
-            for x in range(N):
-                # Define box coordinates
-                left, top = x * block_w, y * block_h
-                right, bottom = (x + 1) * block_w, (y + 1) * block_h
-                
-                # Crop the block from the image
-                block_img = img.crop((left, top, right, bottom))
-                
-                # --- Calculate Burst Time (Complexity) ---
-                # Convert to grayscale and get pixel value std deviation
-                try:
-                    stat = ImageStat.Stat(block_img.convert("L"))
-                    stddev = stat.stddev[0]
-                    burst_time = max(1, int(stddev / 5) + 1) # Ensure burst > 0
-                except ZeroDivisionError:
-                    burst_time = 1 # Solid color block
-                
-                # --- Calculate Priority ---
-                # Lower number = higher priority
-                # Priority based on distance from center
-                dist = math.dist((x, y), (center_x, center_y))
-                priority = int(dist * 2) # Scale it
-                
-                # --- Create Process Object ---
-                process = {
-                    "pid": pid_counter,
-                    "arrival": arrival_times[pid_counter - 1], # Staggered or 0 arrival
-                    "burst": burst_time,
-                    "priority": priority,
-                    "remaining_burst": burst_time,
-                    "tk_image": ImageTk.PhotoImage(block_img), # Full color image
-                    "coords": (left, top),
-                    "block_size": (block_w, block_h),
-                    "wait_time": 0,
-                    "start_time": -1,
-                    "completion_time": -1
-                }
-                
-                self.processes.append(process)
-                self.process_map[pid_counter] = process
-                
-                # Add to the Treeview with a unique tag for coloring
-                self.process_tree.insert("", "end", 
-                                        values=(process["pid"], process["arrival"], process["burst"], process["priority"]), 
-                                        tags=(f"PID_{pid_counter}",))
-                
-                pid_counter += 1
+    def show_processes(self, img):
+        """Fills the process table and draws the pending blocks for self.processes over img."""
+        profiler = self.profiler
+        self.process_map = self.processes.pid_map()
+        
+        # Colors come from a small palette, so the table needs one tag per palette entry
+        with profiler.phase("tree"):
+            palette, colors = self.generate_gantt_colors()
+            self.process_view.show(self.processes, [(c, self.get_text_color(c)) for c in palette], colors)
                 
+        # Block images are cut from the resized image only when first drawn
+        self.block_images = BlockImageCache(img)
+        
         self.run_button.config(state="normal")
+        self.compare_button.config(state="normal")
+        self.tune_button.config(state="normal")
         self.stop_button.config(state="normal")
-        self.draw_initial_image_canvas()
-        self.generate_gantt_colors() # Generate colors AND apply them to tree
+        with profiler.phase("canvas"):
+            self.draw_initial_image_canvas()
 
     def draw_initial_image_canvas(self):
-        """Draws all image blocks as 'pending' (grayed out)."""
+        """Paints all image blocks as 'pending' (grayed out) into a fresh framebuffer."""
         self.image_canvas.delete("all")
-        for p in self.processes:
-            x, y = p['coords']
-            w, h = p['block_size']
-            # Draw a gray box as a placeholder
-            self.image_canvas.create_rectangle(x, y, x + w, y + h, fill="#333", outline="#555", tags=f"block_{p['pid']}")
+        size = self.image_canvas_size
+        w, h = self.processes[0]['block_size']
+        grid_w = int((self.processes.column("x") + w).max())
+        grid_h = int((self.processes.column("y") + h).max())
+        
+        # Gray boxes with a lighter outline, drawn as one picture instead of N*N rectangles
+        pixels = np.zeros((size, size, 3), dtype=np.uint8)
+        pixels[:grid_h, :grid_w] = 0x33
+        pixels[:grid_h:h, :grid_w] = 0x55
+        pixels[h - 1:grid_h:h, :grid_w] = 0x55
+        pixels[:grid_h, :grid_w:w] = 0x55
+        pixels[:grid_h, w - 1:grid_w:w] = 0x55
+        self.placeholder = Image.fromarray(pixels)
+        
+        self.framebuffer = tk.PhotoImage(width=size, height=size)
+        self.copy_to_framebuffer(ImageTk.PhotoImage(self.placeholder), 0, 0)
+        self.image_canvas.create_image(0, 0, image=self.framebuffer, anchor="nw", tags="framebuffer")
+        self.overlay_items = []
+        self.overlay_pids = []
             
     def generate_gantt_colors(self):
-        """Assigns a unique color to each process for the Gantt chart and Treeview."""
-        self.gantt_colors = {}
-        for p in self.processes:
+        """
+        Picks a random palette and gives each process one of its colors, for the
+        Gantt chart and the process table. Returns (palette, palette index per process).
+        """
+        palette = []
+        for _ in range(PALETTE_SIZE):
             r = random.randint(50, 200)
             g = random.randint(50, 200)
             b = random.randint(50, 200)
-            color = f'#{r:02x}{g:02x}{b:02x}'
-            text_color = self.get_text_color(color)
-            
-            self.gantt_colors[p['pid']] = color
-            # Configure the tag in the Treeview to have this background/foreground
-            self.process_tree.tag_configure(f"PID_{p['pid']}", background=color, foreground=text_color)
-            
+            palette.append(f'#{r:02x}{g:02x}{b:02x}')
+        colors = [random.randrange(PALETTE_SIZE) for _ in range(len(self.processes))]
+        
+        self.gantt_colors = dict(zip(self.processes.column("pid").tolist(), (palette[i] for i in colors)))
         self.gantt_colors["Idle"] = "#e0e0e0"
+        return palette, colors
 
     def run_simulation(self):
         """Starts the tick-based simulation."""
@@ -421,133 +620,366 @@ class VisualSchedulingSimulator:
             messagebox.showerror("Invalid Input", "Delay must be a non-negative integer (e.g., 1000, 500, 0).")
             return
         
+        try:
+            cores = int(self.cores_entry.get())
+            if cores <= 0: raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "CPU Cores must be a positive integer.")
+            return
+        
+        render = self.render_var.get()
+        if render:
+            try:
+                workers = int(self.workers_entry.get())
+                if workers <= 0: raise ValueError
+            except ValueError:
+                messagebox.showerror("Invalid Input", "Workers must be a positive integer.")
+                return
+        
         # Clear any active highlight before running
         self.clear_highlight()
         
         self.simulation_running = True
         self.run_button.config(state="disabled")
+        self.compare_button.config(state="disabled")
+        self.tune_button.config(state="disabled")
         self.stop_button.config(state="normal")
         self.algo_dropdown.config(state="disabled")
+        self.queue_mode_dropdown.config(state="disabled")
         self.generate_procs_button.config(state="disabled")
         self.random_arrival_check.config(state="disabled") # Disable checkbox
+        self.turbo_check.config(state="disabled")
+        self.render_check.config(state="disabled")
+        self.replay_scale.config(state="disabled")
+        self.trace = None
+        self.metrics = None
+        
+        # A previous run left its results in the table and its picture on screen
+        self.processes.reset_progress()
+        self.current_time = 0
+        self.replay_drawn = None
+        self.stats_label.config(text="")
+        self.draw_initial_image_canvas()
+        
+        if render:
+            self.start_render_farm(workers)
+            self.schedule_profile_refresh()
+            return
         
-        # Start the simulation loop
-        self.simulation_tick()
+        # Build the headless scheduling core and start the simulation loop
+        # One Gantt lane per simulated CPU
+        self.gantt_chart.reset(lanes=cores)
+        turbo = self.turbo_var.get()
+        if cores > 1:
+            self.engine = MultiCoreEngine(self.processes, self.selected_algorithm, self.time_quantum, 
+                                          cores, self.queue_mode_var.get())
+        else:
+            self.engine = SchedulingEngine(self.processes, self.selected_algorithm, self.time_quantum)
+        # Turbo applies thousands of queue changes per frame, so only visible rows are kept
+        self.queue_view.reset(virtual=turbo or len(self.processes) > self.virtual_queue_threshold)
+        self.recorder = TraceRecorder(self.processes, self.selected_algorithm, self.time_quantum, cores, 
+                                      self.queue_mode_var.get() if cores > 1 else None, 
+                                      self.source_path, self.grid_size)
+        self.metrics = SchedulingMetrics(self.processes, cores)
+        
+        # The engine runs ahead on a worker thread (at most the job's queue of
+        # steps ahead); the loops below only show what it has sent
+        self.pending_steps = deque()
+        self.stream_horizon = 0
+        self.cpu_view = [None] * cores
+        self.shown_remaining = self.processes.column("burst").copy()
+        self.job = BackgroundJob(lambda job: stream_engine(job, self.engine, self.recorder), 
+                                 name="scheduler").start()
+        
+        if turbo:
+            self.simulation_frame()
+        else:
+            self.simulation_tick()
+        self.schedule_profile_refresh()
+        self.schedule_metrics_refresh()
 
     def simulation_tick(self):
-        """The main simulation loop, runs once per time unit."""
+        """Draws one time unit, consuming the scheduling core's events up to it."""
         if not self.simulation_running:
             return
+        profiler = self.profiler
             
-        # --- 1. Check for New Arrivals ---
-        new_arrivals = [p for p in self.processes if p['arrival'] == self.current_time]
-        for p in new_arrivals:
-            self.ready_queue.append(p)
+        # --- 1. Apply the Scheduler's Steps up to This Tick ---
+        # Arrivals, dispatches, completions and quantum expiries, as streamed by the worker
+        with profiler.phase("schedule"):
+            known = self.take_steps(self.current_time)
+        if self.stream_failed():
+            return
+        if not known:
+            # The worker has not simulated this far yet: try again shortly
+            self.root.after(max(1, self.simulation_delay), self.simulation_tick)
+            return
+        
+        if self.metrics.completed == len(self.processes):
+            # Simulation Finished (once the worker has also built the recording)
+            if self.job.finished:
+                self.finish_simulation()
+            else:
+                self.root.after(self.poll_ms, self.simulation_tick)
+            return
             
-        # Sort ready queue based on algorithm (SJF/Priority)
-        # FCFS/RR just append, so no sort needed here
-        if self.selected_algorithm == "SJF":
-            self.ready_queue = deque(sorted(self.ready_queue, key=lambda p: p['burst']))
-        elif self.selected_algorithm == "Priority":
-            self.ready_queue = deque(sorted(self.ready_queue, key=lambda p: p['priority']))
+        with profiler.phase("queue"):
+            self.update_ready_queue_listbox()
+        
+        # --- 2. Update Visuals (one Gantt lane per CPU) ---
+        for core, view in enumerate(self.cpu_view):
+            if view is None:
+                # CPU is Idle
+                with profiler.phase("canvas"):
+                    self.release_overlay(core)
+                with profiler.phase("gantt"):
+                    self.draw_gantt_block("Idle", core)
+                continue
+            process, remaining, since = view
+            remaining -= self.current_time + 1 - since # Once this tick has executed
+            with profiler.phase("canvas"):
+                self.draw_image_block(process, remaining, core)
+                # A finished block lives on in the framebuffer; its own image is freed
+                if remaining == 0:
+                    self.block_images.release(process['pid'])
+            with profiler.phase("gantt"):
+                self.draw_gantt_block(process['pid'], core)
+        
+        # --- 3. Update UI & Loop ---
+        with profiler.phase("ui"):
+            self.time_label.config(text=f"Current Time: {self.current_time}")
+        
+        # Continue to next tick
+        self.current_time += 1
+        self.root.after(self.simulation_delay, self.simulation_tick) # Use variable delay
+            
+    def simulation_frame(self):
+        """Turbo loop: advances as many ticks as fit in the frame budget, then draws once."""
+        if not self.simulation_running:
+            return
             
-        self.update_ready_queue_listbox()
-        
-        # --- 2. Increment Wait Times ---
-        for p in self.ready_queue:
-            p['wait_time'] += 1
-
-        # --- 3. CPU Scheduler Logic ---
-        
-        # If CPU is free, select a new process
-        if self.current_process is None:
-            if self.ready_queue:
-                # Select process based on algorithm
-                if self.selected_algorithm in ["FCFS", "Round Robin"]:
-                    self.current_process = self.ready_queue.popleft()
-                elif self.selected_algorithm == "SJF":
-                    self.current_process = self.ready_queue.popleft() # Already sorted
-                elif self.selected_algorithm == "Priority":
-                    self.current_process = self.ready_queue.popleft() # Already sorted
+        profiler = self.profiler
+        dirty = {}                    # Stores {pid: process} for blocks whose progress changed
+        segments = []                 # Gantt runs since the last frame
+        deadline = time.perf_counter() + self.frame_budget
+        
+        # --- 1. Show the worker's steps, event to event, until the frame budget is spent ---
+        with profiler.phase("schedule"):
+            self.receive_steps()
+            pending = self.pending_steps
+            while pending and time.perf_counter() < deadline:
+                step = pending.popleft()
+                t = step.time
                 
-                # Set start time if it's the first run
-                if self.current_process['start_time'] == -1:
-                    self.current_process['start_time'] = self.current_time
+                # Whatever was on each CPU ran from current_time up to this event
+                if t > self.current_time:
+                    for core, view in enumerate(self.cpu_view):
+                        pid = view[0]['pid'] if view is not None else "Idle"
+                        segments.append((self.current_time, pid, self.gantt_colors.get(pid, "#333"), 
+                                         t - self.current_time, core))
                 
-                # Reset time slice for RR
-                if self.selected_algorithm == "Round Robin":
-                    self.time_slice_remaining = self.time_quantum
-            else:
-                # CPU is Idle
-                self.total_idle_time += 1
-                self.draw_gantt_block("Idle")
-        
-        # --- 4. Process Execution ---
-        if self.current_process:
-            # Execute for one time unit
-            self.current_process['remaining_burst'] -= 1
-            if self.selected_algorithm == "Round Robin":
-                self.time_slice_remaining -= 1
+                self.apply_step(step)
+                for event in step.events:
+                    if event.kind in ("dispatch", "preempt", "complete"):
+                        dirty[event.pid] = self.process_map[event.pid]
+                self.current_time = t
+        if self.stream_failed():
+            return
+            
+        # --- 2. Apply the accumulated visual changes once ---
+        with profiler.phase("canvas"):
+            # Each CPU's overlay follows its running block; blocks that left a CPU are repainted
+            for core, view in enumerate(self.cpu_view):
+                if view is None:
+                    self.release_overlay(core)
+                    continue
+                process, remaining, since = view
+                dirty.pop(process['pid'], None)
+                remaining -= self.current_time - since
+                self.draw_image_block(process, remaining, core)
+                if remaining == 0:
+                    self.block_images.release(process['pid'])
+            for pid, process in dirty.items():
+                self.paint_block(process, int(self.shown_remaining[pid - 1]))
                 
-            # Update Visuals
-            self.draw_image_block(self.current_process)
-            self.draw_gantt_block(self.current_process['pid'])
-
-            # --- 5. Check for Completion or Preemption ---
+        with profiler.phase("gantt"):
+            self.gantt_chart.add_segments(segments)
+        with profiler.phase("queue"):
+            self.update_ready_queue_listbox()
+        with profiler.phase("ui"):
+            self.time_label.config(text=f"Current Time: {self.current_time}")
+        
+        if self.metrics.completed == len(self.processes) and self.job.finished:
+            self.finish_simulation()
+        else:
+            self.root.after(1, self.simulation_frame) # Let Tk repaint between frames
             
-            # Process finished
-            if self.current_process['remaining_burst'] == 0:
-                self.current_process['completion_time'] = self.current_time + 1
-                self.completed_processes.append(self.current_process)
-                self.current_process = None
+    # --- Worker stream ---
+    
+    def receive_steps(self):
+        """Moves the simulation steps the worker has sent so far into pending_steps."""
+        for steps, horizon in self.job.drain():
+            self.pending_steps.extend(steps)
+            self.stream_horizon = horizon
+
+    def take_steps(self, until):
+        """
+        Applies every received step up to time until. Returns False when the
+        worker has not simulated that far yet, so the state at until is unknown.
+        """
+        self.receive_steps()
+        pending = self.pending_steps
+        while pending and pending[0].time <= until:
+            self.apply_step(pending.popleft())
+        return bool(pending) or self.stream_horizon is None or until < self.stream_horizon
+
+    def apply_step(self, step):
+        """Brings the metrics, ready queue view and per-CPU state up to one step."""
+        self.metrics.record(step.events)
+        process_map = self.process_map
+        for op in step.queue_ops:
+            if op[0] == "push":
+                self.queue_view.on_push(process_map[op[1]], op[2], op[3])
+            else:
+                self.queue_view.on_pop(process_map[op[1]])
+        for pid, remaining in step.remaining.items():
+            self.shown_remaining[pid - 1] = remaining
+        self.cpu_view = [None if running is None else (process_map[running[0]], running[1], step.time)
+                         for running in step.running]
+
+    def stream_failed(self):
+        """Reports a worker that died with an error and stops the run; True if it did."""
+        job = self.job
+        if job is None or job.error is None or not job.finished:
+            return False
+        messagebox.showerror("Simulation Error", f"The scheduler failed: {job.error}")
+        self.reset_simulation()
+        return True
             
-            # Round Robin quantum expired
-            elif self.selected_algorithm == "Round Robin" and self.time_slice_remaining == 0:
-                # Add back to queue (if not finished)
-                self.ready_queue.append(self.current_process)
-                self.current_process = None
-        
-        # --- 6. Update UI & Loop ---
-        self.time_label.config(text=f"Current Time: {self.current_time}")
+    def start_render_farm(self, workers):
+        """Real rendering mode: dispatches actual block filter jobs onto a worker pool."""
+        self.farm = RenderFarm(self.block_images.source, self.processes, self.selected_algorithm, 
+                               workers, self.time_quantum, FILTER_CHAINS[self.filter_var.get()])
+        self.queue_view.reset(virtual=True)
+        self.farm.ready_queue.listener = self.queue_view
+        self.farm_segments_drawn = 0
+        
+        # One Gantt lane per worker, timeline in milliseconds of real time
+        self.gantt_chart.reset(lanes=workers, scale=2, label_every=50)
+        self.farm.start()
+        self.render_frame()
+
+    def render_frame(self):
+        """Polls the worker pool and paints whatever finished since the last frame."""
+        if not self.simulation_running:
+            return
+        farm = self.farm
+        
+        with self.profiler.phase("schedule"):
+            try:
+                results = farm.poll()
+            except Exception as e:
+                # A filter raised in a worker: without this the run would wait forever
+                messagebox.showerror("Render Error", f"A render worker failed: {e}")
+                self.finish_simulation()
+                return
         
-        if len(self.completed_processes) == len(self.processes):
-            # Simulation Finished
+        with self.profiler.phase("canvas"):
+            for process, image, remaining in results:
+                self.paint_rendered_block(process, image, remaining)
+        
+        with self.profiler.phase("gantt"):
+            new_segments = farm.segments[self.farm_segments_drawn:]
+            self.farm_segments_drawn = len(farm.segments)
+            self.gantt_chart.add_segments([
+                (start * 1000, pid, self.gantt_colors.get(pid, "#333"), (end - start) * 1000, slot)
+                for slot, pid, start, end in new_segments
+            ])
+        with self.profiler.phase("queue"):
+            self.update_ready_queue_listbox()
+        self.time_label.config(text=f"Current Time: {farm.now() * 1000:.0f} ms")
+        
+        if farm.finished:
             self.finish_simulation()
         else:
-            # Continue to next tick
-            self.current_time += 1
-            self.root.after(self.simulation_delay, self.simulation_tick) # Use variable delay
-            
+            self.root.after(15, self.render_frame)
+
+    def paint_rendered_block(self, process, image, remaining):
+        """Paints a block's real rendered pixels into the framebuffer, with its progress darkened in."""
+        x, y = process['coords']
+        self.copy_to_framebuffer(ImageTk.PhotoImage(self.darken_pending(image, process, remaining)), x, y)
+
+    def format_render_stats(self, stats, finished=True):
+        utilization = ", ".join(f"{u:.0%}" for u in stats['utilization'])
+        heading = "Rendering Complete!" if finished else f"Rendering Stopped ({stats['completed']} blocks done)"
+        return (
+            f"{heading}\n"
+            f"Throughput: {stats['throughput']:.1f} blocks/s\n"
+            f"Latency: mean {stats['mean_latency'] * 1000:.1f} ms, p95 {stats['p95_latency'] * 1000:.1f} ms\n"
+            f"Worker Utilization: {utilization}"
+        )
+
     def finish_simulation(self):
         """Calculates final stats and resets the UI."""
         self.simulation_running = False
         
-        total_wait = 0
-        total_tat = 0
-        n = len(self.completed_processes)
-        
-        if n > 0:
-            for p in self.completed_processes:
-                tat = p['completion_time'] - p['arrival']
-                wait = tat - p['burst']
-                total_wait += wait
-                total_tat += tat
+        stats_text = None
+        if self.farm is not None:
+            self.farm.shutdown()
+            stats_text = self.format_render_stats(self.farm.stats(), self.farm.finished)
+        elif self.engine.completed_processes:
+            # Every process has completed: one vectorized pass over the table
+            avg_wait, avg_tat = average_times(self.processes)
             
-            avg_wait = total_wait / n
-            avg_tat = total_tat / n
+            metrics = self.metrics.summary()
             
             stats_text = (
                 f"Simulation Complete!\n"
-                f"Avg. Waiting Time: {avg_wait:.2f}\n"
-                f"Avg. Turnaround Time: {avg_tat:.2f}"
+                f"Avg. Waiting Time: {avg_wait:.2f} (p95 {metrics['waiting_time_p95']:.0f}, p99 {metrics['waiting_time_p99']:.0f})\n"
+                f"Avg. Turnaround Time: {avg_tat:.2f} (p95 {metrics['turnaround_time_p95']:.0f}, p99 {metrics['turnaround_time_p99']:.0f})\n"
+                f"Avg. Response Time: {metrics['response_time_mean']:.2f} (p95 {metrics['response_time_p95']:.0f}, p99 {metrics['response_time_p99']:.0f})\n"
+                f"Throughput: {metrics['throughput']:.3f}/unit, CPU Utilization: {metrics['utilization']:.0%}, "
+                f"Idle Time: {metrics['idle_time']}\n"
+                f"Context Switches: {metrics['context_switches']}, Fairness (Jain): {metrics['fairness_slowdown']:.3f}"
             )
+            if self.engine.cores > 1:
+                utilization = ", ".join(f"{s['utilization']:.0%}" for s in self.engine.core_stats())
+                stats_text += (
+                    f"\nCore Utilization: {utilization}\n"
+                    f"Load Imbalance: {self.engine.load_imbalance():.1%}"
+                )
+            
+        # Every block is finished and painted into the framebuffer; the overlays stay hidden
+        self.overlay_pids = [None] * len(self.overlay_pids)
+        
+        if self.recorder is not None:
+            # Built on the worker thread once the engine was done
+            self.trace = self.job.result
+            self.job = None
+            self.recorder = None
+            # The canvas and Gantt chart already show the end of the run
+            end = self.trace.end_time
+            self.replay_drawn = self.trace.remaining_at(self.trace.state_at(end), end)
+            self.replay_gantt_end = end
+            self.replay_scale.config(to=end, state="normal")
+            self.replay_scale.set(end)
+            
+        if stats_text:
             self.stats_label.config(text=stats_text)
-            messagebox.showinfo("Simulation Complete", stats_text)
+            if self.farm is None or self.farm.finished:
+                messagebox.showinfo("Simulation Complete", stats_text)
         
         self.run_button.config(state="normal")
+        self.compare_button.config(state="normal")
+        self.tune_button.config(state="normal")
         self.algo_dropdown.config(state="normal")
+        self.queue_mode_dropdown.config(state="readonly")
         self.generate_procs_button.config(state="normal")
         self.random_arrival_check.config(state="normal") # Re-enable checkbox
+        self.turbo_check.config(state="normal")
+        self.render_check.config(state="normal")
+        self.update_profile_panel()
+        self.update_metrics_panel()
 
     def reset_simulation(self):
         """Stops and resets the entire simulation state."""
@@ -555,27 +987,61 @@ class VisualSchedulingSimulator:
         self.processes = []
         self.process_map = {}
         self.gantt_colors = {}
-        self.ready_queue.clear()
-        self.completed_processes = []
-        self.current_process = None
+        self.engine = None
+        if self.job is not None:
+            self.job.cancel() # The worker stops at its next step or progress report
+        self.job = None
+        self.pending_steps = deque()
+        self.recorder = None
+        self.metrics = None
+        self.trace = None
+        self.replay_drawn = None
+        if self.farm is not None:
+            self.farm.shutdown()
+        self.farm = None
+        if self.comparison is not None:
+            self.comparison.shutdown()
+        self.comparison = None
+        if self.comparison_window is not None:
+            self.comparison_window.destroy()
+        self.comparison_window = None
+        self.comparison_tree = None
+        if self.tuner is not None:
+            self.tuner.shutdown()
+        self.tuner = None
+        if self.tuning_window is not None:
+            self.tuning_window.destroy()
+        self.tuning_window = None
+        if self.block_images is not None:
+            self.block_images.clear()
+        self.block_images = None
+        self.framebuffer = None
         self.current_time = 0
-        self.time_slice_remaining = 0
-        self.total_idle_time = 0
         self.simulation_delay = 1000 # Reset delay to default
         
-        self.process_tree.delete(*self.process_tree.get_children())
+        self.process_view.clear()
         self.image_canvas.delete("all")
-        self.gantt_canvas.delete("all")
-        self.queue_listbox.delete(0, tk.END)
+        self.gantt_chart.reset()
+        self.queue_view.reset()
         
         self.time_label.config(text="Current Time: 0")
         self.stats_label.config(text="")
+        self.metrics_label.config(text="")
+        self.generate_progress.config(value=0)
+        self.generate_status.config(text="")
         
         self.run_button.config(state="disabled" if self.base_image is None else "normal")
+        self.compare_button.config(state="disabled")
+        self.tune_button.config(state="disabled")
         self.stop_button.config(state="disabled")
         self.algo_dropdown.config(state="normal")
+        self.queue_mode_dropdown.config(state="readonly")
         self.generate_procs_button.config(state="disabled" if self.base_image is None else "normal")
         self.random_arrival_check.config(state="normal") # Re-enable checkbox
+        self.turbo_check.config(state="normal")
+        self.render_check.config(state="normal")
+        self.replay_scale.config(state="disabled")
+        self.replay_scale.set(0)
         
         # Reset algorithm dropdown based on checkbox state
         if self.random_arrival_var.get():
@@ -588,84 +1054,428 @@ class VisualSchedulingSimulator:
         # Clear selection and highlight
         self.clear_highlight()
 
-    def update_ready_queue_listbox(self):
-        """Refreshes the ready queue visual."""
-        self.queue_listbox.delete(0, tk.END)
-        for p in self.ready_queue:
-            self.queue_listbox.insert(tk.END, f" PID: {p['pid']} (Burst: {p['remaining_burst']})")
-            
-    def draw_image_block(self, process):
-        """Draws the image block, including a 'loading bar' for progress."""
-        pid = process['pid']
-        x, y = process['coords']
-        w, h = process['block_size']
+    def compare_policies(self):
+        """Runs every policy on the current workload in worker processes and shows them side by side."""
+        if not self.processes:
+            messagebox.showwarning("No Processes", "Please generate processes from an image first.")
+            return
+        if self.simulation_running:
+            return
+        try:
+            quantum = int(self.time_quantum_entry.get())
+            if quantum <= 0: raise ValueError
+            cores = int(self.cores_entry.get())
+            if cores <= 0: raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Time Quantum and CPU Cores must be positive integers.")
+            return
         
-        # Delete ALL items for this block (gray box, old image, old progress)
-        self.image_canvas.delete(f"block_{pid}")
+        # The policies the dropdown offers, with Round Robin at the usual quanta and the entered one
+        runs = comparison_runs(self.algo_dropdown.cget("values"), sorted({*COMPARISON_QUANTA, quantum}), quantum)
+        queue_mode = self.queue_mode_var.get()
+        self.comparison = ComparisonRunner(self.processes, runs, cores, queue_mode)
         
-        # Draw the full-color image block
-        # We re-tag it with block_{pid} so it can be deleted next tick
-        self.image_canvas.create_image(x, y, image=process['tk_image'], anchor="nw", tags=(f"block_{pid}", f"img_{pid}"))
+        self.clear_highlight()
+        self.simulation_running = True
+        self.run_button.config(state="disabled")
+        self.compare_button.config(state="disabled")
+        self.tune_button.config(state="disabled")
+        self.stop_button.config(state="normal")
+        self.generate_procs_button.config(state="disabled")
+        self.random_arrival_check.config(state="disabled")
+        self.replay_scale.config(state="disabled")
+        self.trace = None
+        self.metrics = None
+        self.update_metrics_panel()
+        self.stats_label.config(text="")
         
-        # Calculate progress
-        percent_done = 1.0 - (process['remaining_burst'] / process['burst'])
+        # One Gantt lane per run (per run and CPU on several cores), drawn from time 0
+        labels = [run_label(algorithm, q) for algorithm, q in runs]
+        lane_names = labels if cores == 1 else [f"{label} CPU {c}" for label in labels for c in range(cores)]
+        self.gantt_chart.reset(lanes=len(lane_names), lane_names=lane_names)
+        self.gantt_chart.follow = False
+        self.open_comparison_table(labels)
+        self.time_label.config(text=f"Comparing {len(runs)} Policies...")
         
-        # Draw a semi-transparent "loading" rectangle over the top
-        if percent_done < 1.0:
-            overlay_height = h * (1.0 - percent_done)
-            self.image_canvas.create_rectangle(
-                x, y, x + w, y + overlay_height, 
-                fill="#000000", stipple="gray50", outline="", 
-                tags=(f"block_{pid}", f"progress_{pid}") # Also tag with block_{pid}
-            )
+        self.comparison.start()
+        self.poll_comparison(self.comparison)
+
+    def poll_comparison(self, runner):
+        """Draws each policy's lane and table row as soon as its worker is done."""
+        if runner is not self.comparison:
+            return # Stopped by Stop & Reset
+        try:
+            done = runner.poll()
+        except Exception as e:
+            messagebox.showerror("Comparison Error", f"A policy run failed: {e}")
+            self.reset_simulation()
+            return
+        
+        cores = runner.cores
+        for i, result in done:
+            colors = self.gantt_colors
+            self.gantt_chart.add_segments([
+                (start, pid, colors.get(pid, "#333"), length, i * cores + core)
+                for core, start, pid, length in zip(*(column.tolist() for column in result["segments"]))
+            ])
+            self.show_comparison_row(i, result["summary"])
+        
+        if runner.finished:
+            self.finish_comparison(runner)
+        else:
+            self.root.after(self.poll_ms, self.poll_comparison, runner)
+
+    def open_comparison_table(self, labels):
+        """Opens (or clears) the metrics table, with a pending row per run."""
+        if self.comparison_window is None or not self.comparison_window.winfo_exists():
+            self.comparison_window = tk.Toplevel(self.root)
+            self.comparison_window.title("Policy Comparison")
+            self.comparison_window.protocol("WM_DELETE_WINDOW", self.close_comparison_table)
+            columns = ("Policy",) + tuple(heading for _, heading in TABLE_FIELDS)
+            self.comparison_tree = ttk.Treeview(self.comparison_window, columns=columns, show="headings", height=len(labels))
+            for column in columns:
+                self.comparison_tree.heading(column, text=column)
+                self.comparison_tree.column(column, width=120 if column == "Policy" else 90, anchor="center")
+            self.comparison_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        tree = self.comparison_tree
+        tree.delete(*tree.get_children())
+        tree.configure(height=len(labels))
+        for i, label in enumerate(labels):
+            tree.insert("", "end", iid=str(i), values=(label,) + ("...",) * len(TABLE_FIELDS))
+
+    def show_comparison_row(self, i, summary):
+        if self.comparison_tree is None:
+            return
+        values = [
+            f"{summary[name]:.0%}" if name == "utilization" else
+            f"{summary[name]:.3f}" if isinstance(summary[name], float) else str(summary[name])
+            for name, _ in TABLE_FIELDS
+        ]
+        label = self.comparison_tree.set(str(i), "Policy")
+        self.comparison_tree.item(str(i), values=(label, *values))
+
+    def close_comparison_table(self):
+        self.comparison_window.destroy()
+        self.comparison_window = None
+        self.comparison_tree = None
 
-    def draw_gantt_block(self, pid):
-        """Draws one time-unit block on the live Gantt chart."""
+    def finish_comparison(self, runner):
+        """Summarizes the winners once every policy has finished."""
+        self.comparison = None
+        self.simulation_running = False
+        results = runner.results
+        labels = [r["label"] for r in results]
+        
+        def best(name, lowest=True):
+            values = [r["summary"][name] for r in results]
+            i = values.index(min(values) if lowest else max(values))
+            return f"{labels[i]} ({values[i]:.2f})"
+        
+        self.time_label.config(text=f"Compared {len(results)} Policies")
+        self.stats_label.config(text=(
+            f"Comparison Complete!\n"
+            f"Lowest Avg. Waiting Time: {best('avg_waiting_time')}\n"
+            f"Lowest Avg. Turnaround Time: {best('avg_turnaround_time')}\n"
+            f"Lowest Avg. Response Time: {best('response_time_mean')}\n"
+            f"Fairest (Jain): {best('fairness_slowdown', lowest=False)}"
+        ))
+        self.run_button.config(state="normal")
+        self.compare_button.config(state="normal")
+        self.tune_button.config(state="normal")
+        self.generate_procs_button.config(state="normal")
+        self.random_arrival_check.config(state="normal")
+
+    def tune_quantum(self):
+        """Searches for the best time quantum of the current workload on worker processes."""
+        if not self.processes:
+            messagebox.showwarning("No Processes", "Please generate processes from an image first.")
+            return
+        if self.simulation_running:
+            return
+        try:
+            switch_cost = int(self.switch_cost_entry.get())
+            if switch_cost < 0: raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Switch Cost must be a non-negative integer.")
+            return
+        try:
+            cores = int(self.cores_entry.get())
+            if cores <= 0: raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "CPU Cores must be a positive integer.")
+            return
+        try:
+            min_quantum = int(self.min_quantum_entry.get())
+            max_quantum = int(self.max_quantum_entry.get()) if self.max_quantum_entry.get().strip() else None
+            if min_quantum <= 0 or (max_quantum is not None and max_quantum < min_quantum): raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Tune Quanta must be positive integers, the first no larger "
+                                                  "than the second (leave the second empty for the longest burst).")
+            return
         
-        # Scale: 4 pixels per time unit
-        scale = 4 # Reduced from 5 to fit more
-        bar_height = 30 # Reduced from 50
-        y_offset = 10 # Reduced from 15
+        # Tunes the selected algorithm if it uses a quantum, else Round Robin
+        algorithm = self.algorithm_var.get()
+        if algorithm not in QUANTUM_ALGORITHMS:
+            algorithm = "Round Robin"
+        objective = OBJECTIVES[self.objective_var.get()]
+        self.tuner = QuantumTuner(self.processes, algorithm, min_quantum, max_quantum, objective, switch_cost, 
+                                  cores=cores, queue_mode=self.queue_mode_var.get())
         
-        x = self.current_time * scale
-        color = self.gantt_colors.get(pid, "#333")
+        self.simulation_running = True
+        self.run_button.config(state="disabled")
+        self.compare_button.config(state="disabled")
+        self.tune_button.config(state="disabled")
+        self.stop_button.config(state="normal")
+        self.generate_procs_button.config(state="disabled")
+        self.random_arrival_check.config(state="disabled")
+        self.time_label.config(text=f"Tuning {algorithm} Quantum...")
+        self.stats_label.config(text="")
         
-        self.gantt_canvas.create_rectangle(
-            x, y_offset, x + scale, y_offset + bar_height, 
-            fill=color, outline="#fff"
+        self.tuner.start()
+        self.poll_tuning(self.tuner)
+
+    def poll_tuning(self, tuner):
+        """Shows the search's progress, then fills in the best quantum."""
+        if tuner is not self.tuner:
+            return # Stopped by Stop & Reset
+        try:
+            tuner.poll()
+        except Exception as e:
+            messagebox.showerror("Tuning Error", f"A tuning run failed: {e}")
+            self.reset_simulation()
+            return
+        
+        best = tuner.best
+        if best is not None:
+            self.stats_label.config(text=(
+                f"Round {tuner.rounds}: {len(tuner.results)} quanta tried, searching {tuner.lo}-{tuner.hi}\n"
+                f"Best so far: {best} ({self.objective_var.get()} {tuner.results[best][tuner.objective]:.2f})"
+            ))
+        if tuner.finished:
+            self.finish_tuning(tuner)
+        else:
+            self.root.after(self.poll_ms, self.poll_tuning, tuner)
+
+    def finish_tuning(self, tuner):
+        self.tuner = None
+        self.simulation_running = False
+        best = tuner.best
+        summary = tuner.results[best]
+        self.time_quantum_entry.delete(0, tk.END)
+        self.time_quantum_entry.insert(0, str(best))
+        
+        self.time_label.config(text=f"Best Quantum: {best}")
+        self.stats_label.config(text=(
+            f"Tuning Complete! {tuner.algorithm} quantum {best} "
+            f"({len(tuner.results)} quanta in {tuner.rounds} rounds)\n"
+            f"Avg. Turnaround Time: {summary['avg_turnaround_time']:.2f} (p95 {summary['turnaround_time_p95']:.0f})\n"
+            f"Avg. Waiting Time: {summary['avg_waiting_time']:.2f} (p95 {summary['waiting_time_p95']:.0f})\n"
+            f"Context Switches: {summary['context_switches']}"
+        ))
+        self.show_tuning_plot(tuner)
+        self.run_button.config(state="normal")
+        self.compare_button.config(state="normal")
+        self.tune_button.config(state="normal")
+        self.generate_procs_button.config(state="normal")
+        self.random_arrival_check.config(state="normal")
+
+    def show_tuning_plot(self, tuner):
+        """Charts turnaround, waiting time and context switches against the quantum."""
+        if self.tuning_window is None or not self.tuning_window.winfo_exists():
+            self.tuning_window = tk.Toplevel(self.root)
+            self.tuning_window.title("Time Quantum Tuning")
+            self.tuning_plot_label = ttk.Label(self.tuning_window)
+            self.tuning_plot_label.pack(padx=10, pady=10)
+        self.tuning_plot = ImageTk.PhotoImage(plot_results(tuner.results, tuner.best))
+        self.tuning_plot_label.config(image=self.tuning_plot)
+
+    def save_recording(self):
+        """Saves the last run's event trace."""
+        if self.trace is None:
+            messagebox.showwarning("No Recording", "Run a simulation to completion first.")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save Recording",
+            defaultextension=".ostrace",
+            initialfile="run.ostrace",
+            filetypes=[("Scheduler Recordings", "*.ostrace")]
+        )
+        if not path:
+            return
+        try:
+            self.trace.save(path)
+        except OSError as e:
+            messagebox.showerror("Save Error", f"Failed to save recording: {e}")
+
+    def open_recording(self):
+        """Opens a saved trace and lets the replay bar scrub through it."""
+        if self.simulation_running:
+            return
+        path = filedialog.askopenfilename(
+            title="Open Recording",
+            filetypes=[("Scheduler Recordings", "*.ostrace")]
         )
+        if not path:
+            return
+        try:
+            trace = Trace.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Open Error", f"Failed to open recording: {e}")
+            return
         
-        # Add timestamp label every 10 units
-        if self.current_time % 10 == 0:
-            self.gantt_canvas.create_text(
-                x, y_offset + bar_height + 3, # Adjusted position
-                text=str(self.current_time), anchor="n", 
-                font=("Helvetica", 9)
-            )
+        # Blocks are cut from the recorded source image, or the loaded one if it has moved
+        source = trace.header.get("source")
+        if source and os.path.exists(source):
+            self.base_image = open_source(source)
+            self.source_path = source
+        
+        self.reset_simulation()
+        if self.base_image is not None:
+            img = load_for_grid(self.source_path or self.base_image, self.image_canvas_size)
+        else:
+            img = Image.new("RGB", (self.image_canvas_size, self.image_canvas_size), "#555")
+        self.processes = trace.processes()
+        self.grid_size = trace.header.get("grid_size")
+        self.show_processes(img)
+        
+        self.trace = trace
+        self.replay_drawn = trace.bursts.astype(np.int64)
+        self.replay_gantt_end = 0
+        self.gantt_chart.reset(lanes=trace.header["cores"])
+        self.queue_view.reset(virtual=True)
+        self.replay_scale.config(to=trace.end_time, state="normal")
+        self.replay_scale.set(0)
+        self.seek_replay(0)
+
+    def on_replay_scrub(self, value):
+        if self.trace is None or self.simulation_running:
+            return
+        self.seek_replay(int(float(value)))
+
+    def seek_replay(self, t):
+        """Shows the recorded run at time t: block progress, Gantt chart and ready queue."""
+        trace = self.trace
+        state = trace.state_at(t)
+        remaining = trace.remaining_at(state, t)
+        
+        # --- Only the blocks whose progress differs from what is drawn ---
+        for i in np.nonzero(remaining != self.replay_drawn)[0]:
+            self.paint_block(self.processes[int(i)], int(remaining[i]))
+        self.replay_drawn = remaining
+        
+        # --- Gantt chart: cut back, or extend from where it ends ---
+        if t < self.replay_gantt_end:
+            self.gantt_chart.truncate(t)
+        else:
+            self.gantt_chart.add_segments([
+                (start, pid, self.gantt_colors.get(pid, "#333"), length, core)
+                for start, pid, length, core in trace.segments(self.replay_gantt_end, t)
+            ])
+        self.replay_gantt_end = t
+        
+        # --- Ready queue ---
+        self.queue_view.show([(self.process_map[pid], int(remaining[pid - 1])) for pid in state.ready])
+        
+        self.time_label.config(text=f"Replay Time: {t}")
+
+    def update_ready_queue_listbox(self):
+        """Applies pending ready queue changes (rows are inserted/deleted as the queue changes)."""
+        self.queue_view.flush()
             
-        # Move canvas view to follow the drawing
-        # Add check for self.current_time > 0 to prevent ZeroDivisionError
-        if self.current_time > 0 and x > self.gantt_canvas.winfo_width() - 50:
-            fraction = (x - self.gantt_canvas.winfo_width() + 50) / (self.current_time * scale)
-            # Ensure fraction is valid (0.0 to 1.0)
-            if fraction < 0.0: fraction = 0.0
-            if fraction > 1.0: fraction = 1.0
-            self.gantt_canvas.xview_moveto(fraction)
-
-    def on_process_select(self, event):
-        """Highlights the corresponding image block when a process is selected in the tree."""
-        self.image_canvas.delete("highlight") # Clear previous highlight
+    def draw_image_block(self, process, remaining, core=0):
+        """Draws a running block, including a 'loading bar' for progress, using its CPU's overlay."""
+        pid = process['pid']
+        x, y = process['coords']
+        w, h = process['block_size']
         
-        selected_item = self.process_tree.focus()
-        if not selected_item:
+        # A newly dispatched block is copied into the framebuffer once;
+        # afterwards only the overlay moves
+        if core >= len(self.overlay_pids) or self.overlay_pids[core] != pid:
+            self.release_overlay(core)
+            for other, other_pid in enumerate(self.overlay_pids):
+                if other_pid == pid:
+                    # Migrated from another CPU: that overlay just lets go
+                    self.image_canvas.itemconfig(self.overlay_items[other], state="hidden")
+                    self.overlay_pids[other] = None
+            self.copy_to_framebuffer(self.block_images.get(process), x, y)
+            self.overlay_pids[core] = pid
+        
+        overlay = self.overlay_items[core]
+        if remaining > 0:
+            self.image_canvas.coords(overlay, x, y, x + w, y + h * remaining / process['burst'])
+            self.image_canvas.itemconfig(overlay, state="normal")
+        else:
+            self.image_canvas.itemconfig(overlay, state="hidden")
+
+    def release_overlay(self, core):
+        """Takes a CPU's overlay off its block, baking the block's progress into the framebuffer."""
+        while len(self.overlay_items) <= core:
+            # Created hidden, one per CPU, the first time that CPU runs something
+            self.overlay_items.append(self.image_canvas.create_rectangle(
+                0, 0, 0, 0, fill="#000000", stipple="gray50", outline="", state="hidden", tags="overlay"
+            ))
+            self.overlay_pids.append(None)
+        
+        pid = self.overlay_pids[core]
+        if pid is None:
+            return
+        self.image_canvas.itemconfig(self.overlay_items[core], state="hidden")
+        self.overlay_pids[core] = None
+        remaining = int(self.shown_remaining[pid - 1])
+        if remaining > 0:
+            self.paint_block(self.process_map[pid], remaining)
+
+    def paint_block(self, process, remaining):
+        """Repaints one block in the framebuffer: pending, partly done (darkened top) or finished."""
+        x, y = process['coords']
+        w, h = process['block_size']
+        if remaining >= process['burst']:
+            # Not started yet: back to the gray placeholder
+            photo = ImageTk.PhotoImage(self.placeholder.crop((x, y, x + w, y + h)))
+        elif remaining == 0:
+            photo = self.block_images.get(process)
+            self.block_images.release(process['pid']) # Lives on in the framebuffer
+        else:
+            block = self.block_images.source.crop((x, y, x + w, y + h))
+            photo = ImageTk.PhotoImage(self.darken_pending(block, process, remaining))
+        self.copy_to_framebuffer(photo, x, y)
+
+    def darken_pending(self, image, process, remaining):
+        """Returns a block image with its unfinished top part darkened, like the progress overlay."""
+        if remaining <= 0:
+            return image
+        rows = int(process['block_size'][1] * remaining / process['burst'])
+        if rows == 0:
+            return image
+        image = image.copy()
+        image.paste(image.crop((0, 0, image.width, rows)).point(lambda v: v // 2), (0, 0))
+        return image
+
+    def copy_to_framebuffer(self, photo, x, y):
+        self.framebuffer.tk.call(self.framebuffer, "copy", photo, "-to", x, y)
+
+    def draw_gantt_block(self, pid, core=0):
+        """Adds one time unit to a CPU's Gantt lane, extending the bar if pid is still running."""
+        color = self.gantt_colors.get(pid, "#333")
+        self.gantt_chart.add(self.current_time, pid, color, lane=core)
+
+    def apply_process_filter(self):
+        """Filters the process table on the chosen column's min/max (blank = unbounded)."""
+        try:
+            lo, hi = (int(entry.get()) if entry.get().strip() else None
+                      for entry in (self.filter_min_entry, self.filter_max_entry))
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Filter bounds must be integers (or blank).")
+            return
+        self.process_view.set_filter(self.filter_column_var.get().lower(), lo, hi)
+
+    def on_process_select(self, pid):
+        """Highlights the corresponding image block when a process is selected in the table."""
+        self.image_canvas.delete("highlight") # Clear previous highlight
+        if pid is None:
             return # User clicked off, highlight is cleared
 
         try:
-            item_values = self.process_tree.item(selected_item, 'values')
-            if not item_values:
-                return
-                
-            pid = int(item_values[0])
             process = self.process_map[pid]
             x, y = process['coords']
             w, h = process['block_size']
@@ -676,14 +1486,13 @@ class VisualSchedulingSimulator:
                 outline="#00FFFF", width=3, tags="highlight" # Bright cyan highlight
             )
         except (ValueError, KeyError, IndexError):
-            print(f"Error selecting process, item: {selected_item}") # Gracefully handle errors
+            print(f"Error selecting process, pid: {pid}") # Gracefully handle errors
 
     def clear_highlight(self, event=None):
         """Clears the highlight box and deselects the treeview item."""
         self.image_canvas.delete("highlight")
-        # De-select all items in the tree
-        if self.process_tree.selection():
-            self.process_tree.selection_set("") 
+        # De-select the table row
+        self.process_view.clear_selection()
             
     def get_text_color(self, hex_color):
         """Determines if black or white text is more readable on a given hex color."""
@@ -697,6 +1506,77 @@ class VisualSchedulingSimulator:
         except Exception:
             return "#000000" # Default to black on any error
 
+    def on_profile_toggle(self):
+        """Switches the phase timers on/off; turning them on starts a fresh profile."""
+        self.profiler.enabled = self.profile_var.get()
+        if self.profiler.enabled:
+            self.profiler.reset()
+            self.schedule_profile_refresh()
+        self.update_profile_panel()
+
+    def schedule_profile_refresh(self):
+        """Redraws the live stats panel every profile_refresh_ms while a run is active."""
+        self.update_profile_panel()
+        if self.simulation_running and self.profiler.enabled:
+            self.root.after(self.profile_refresh_ms, self.schedule_profile_refresh)
+
+    def update_profile_panel(self):
+        if self.profiler.enabled and self.profiler.histograms:
+            self.profile_label.config(text=self.profiler.format_table())
+        else:
+            self.profile_label.config(text="")
+
+    def schedule_metrics_refresh(self):
+        """Redraws the live metrics panel every metrics_refresh_ms while a run is active."""
+        self.update_metrics_panel()
+        if self.simulation_running and self.metrics is not None:
+            self.root.after(self.metrics_refresh_ms, self.schedule_metrics_refresh)
+
+    def update_metrics_panel(self):
+        if self.metrics is not None:
+            self.metrics_label.config(text=self.metrics.format_table(self.current_time))
+        else:
+            self.metrics_label.config(text="")
+
+    def export_metrics(self):
+        """Saves the last run's metrics (percentiles, throughput, utilization, fairness) as JSON."""
+        if self.metrics is None:
+            messagebox.showwarning("No Metrics", "Run a simulation first.")
+            return
+        filepath = filedialog.asksaveasfilename(
+            title="Export Metrics", initialfile="run-metrics.json", defaultextension=".json",
+            filetypes=[("JSON Files", "*.json")]
+        )
+        if not filepath:
+            return
+        try:
+            self.metrics.export_json(filepath)
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Failed to export metrics: {e}")
+
+    def export_profile_json(self):
+        """Saves per-phase statistics (counts, percentiles, histograms) as JSON."""
+        self._export_profile(self.profiler.export_json, "phase-profile.json")
+
+    def export_profile_trace(self):
+        """Saves the recorded phases as a Chrome trace (chrome://tracing, Perfetto)."""
+        self._export_profile(self.profiler.export_chrome_trace, "phase-trace.json")
+
+    def _export_profile(self, export, default_name):
+        if not self.profiler.histograms:
+            messagebox.showwarning("No Profile", "Enable 'Profile Phases?' and run a simulation first.")
+            return
+        filepath = filedialog.asksaveasfilename(
+            title="Export Profile", initialfile=default_name, defaultextension=".json",
+            filetypes=[("JSON Files", "*.json")]
+        )
+        if not filepath:
+            return
+        try:
+            export(filepath)
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Failed to export profile: {e}")
+
     def on_random_arrival_toggle(self):
         """Disables/Enables FCFS algorithm based on random arrival selection."""
         if self.random_arrival_var.get():
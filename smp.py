@@ -0,0 +1,256 @@
+from ready_queue import make_ready_queue
+from scheduler import ArrivalCursor, Event
+
+# Ready-queue layouts for MultiCoreEngine
+QUEUE_MODES = ("Global", "Per-Core", "Per-Core + Stealing")
+
+
+class _Core:
+    """State of one simulated CPU."""
+
+    def __init__(self, index):
+        self.index = index
+        self.current_process = None
+        self.dispatch_time = 0
+        self.run_start = 0          # When the running process starts executing (after the switch cost)
+        self.run_end = 0
+        self.last_pid = None
+        self.busy_time = 0
+        self.idle_time = 0
+        self.idle_since = 0         # When the core last became idle
+        self.completed = 0
+        self.steals = 0
+
+
+class MultiCoreEngine:
+    """
+    Event-driven scheduler for several CPUs.
+
+    Drop-in for SchedulingEngine (same advance/events/run interface). In
+    "Global" mode every core dispatches from one shared ready queue. In the
+    per-core modes an arriving process joins the core with the fewest
+    queued + running processes, a preempted process goes back to its own
+    core, and with stealing an idle core with an empty queue takes the next
+    process from the longest queue. Lazy process streams, keep_completed
+    and switch_cost work as in SchedulingEngine.
+    """
+
+    def __init__(self, processes, algorithm, time_quantum=4, cores=2, queue_mode="Global", keep_completed=True,
+                 switch_cost=0):
+        self.processes = processes
+        self.algorithm = algorithm
+        self.time_quantum = time_quantum
+        self.cores = cores
+        self.queue_mode = queue_mode
+        self.steal = queue_mode == "Per-Core + Stealing"
+        self.keep_completed = keep_completed
+        self.switch_cost = switch_cost
+
+        self._arrivals = ArrivalCursor(processes)
+        self._arrived = 0
+
+        self._cores = [_Core(i) for i in range(cores)]
+        if queue_mode == "Global":
+            shared = make_ready_queue(algorithm, time_quantum)
+            self.queues = [shared] * cores
+        else:
+            state = {}              # Per-process policy state (MLFQ level, vruntime), whichever core runs it
+            self.queues = [make_ready_queue(algorithm, time_quantum, state) for _ in range(cores)]
+        self.completed_processes = []
+        self.completed_count = 0
+        self.time = 0
+        self._ready_since = {}      # Stores {pid: time it last entered a ready queue}
+
+    @property
+    def finished(self):
+        """True once every process has arrived and completed."""
+        return self._arrivals.next_time is None and self.completed_count == self._arrived
+
+    @property
+    def total_idle_time(self):
+        return sum(core.idle_time for core in self._cores)
+
+    def ready_queues(self):
+        """The distinct ready queues (one in Global mode)."""
+        return self.queues[:1] if self.queue_mode == "Global" else self.queues
+
+    def running(self):
+        """Returns the process on each CPU (None when idle), indexed by core."""
+        return [core.current_process for core in self._cores]
+
+    def remaining_at(self, t, core=0):
+        """Remaining burst of a core's running process at time t."""
+        c = self._cores[core]
+        if c.current_process is None:
+            return 0
+        return c.current_process['remaining_burst'] - max(0, t - c.run_start)
+
+    def remaining_after(self, t, core=0):
+        return self.remaining_at(t + 1, core)
+
+    def next_event_time(self):
+        """Returns the time of the next event without applying it (None when done)."""
+        candidates = []
+        if self._arrivals.next_time is not None:
+            candidates.append(self._arrivals.next_time)
+        for core in self._cores:
+            if core.current_process is not None:
+                candidates.append(core.run_end)
+            elif self._has_work_for(core):
+                candidates.append(self.time)
+        return min(candidates) if candidates else None
+
+    def advance(self, until):
+        """Applies every event with time <= until and returns them in order."""
+        events = []
+        while not self.finished:
+            t = self.next_event_time()
+            if t is None or t > until:
+                break
+            events.extend(self._apply_next(t))
+        return events
+
+    def events(self):
+        """Yields the whole schedule as a stream of events."""
+        while not self.finished:
+            yield from self._apply_next(self.next_event_time())
+
+    def run(self):
+        """Runs the schedule to completion and returns the completed processes."""
+        for _ in self.events():
+            pass
+        return self.completed_processes
+
+    # --- Results ---
+
+    def core_stats(self):
+        """Per-core busy/idle time, utilization, completions and steals over the makespan."""
+        makespan = self.time
+        stats = []
+        for core in self._cores:
+            idle = core.idle_time
+            if core.current_process is None:
+                idle += makespan - core.idle_since # Still idle at the end of the run
+            stats.append({
+                "core": core.index,
+                "busy_time": core.busy_time,
+                "idle_time": idle,
+                "utilization": core.busy_time / makespan if makespan else 0.0,
+                "completed": core.completed,
+                "steals": core.steals,
+            })
+        return stats
+
+    def load_imbalance(self):
+        """(max busy - mean busy) / mean busy across cores; 0 means perfectly balanced."""
+        busy = [core.busy_time for core in self._cores]
+        mean = sum(busy) / len(busy)
+        return (max(busy) - mean) / mean if mean else 0.0
+
+    # --- Event application ---
+
+    def _apply_next(self, t):
+        """Applies all events at time t: run ends, then arrivals, then dispatches (core order)."""
+        self.time = t
+        events = []
+        # Queue clocks move first, so everything queued below joins at t
+        for queue in self.ready_queues():
+            queue.advance_to(t)
+
+        for core in self._cores:
+            if core.current_process is not None and core.run_end == t:
+                events.append(self._end_run(core, t))
+
+        arrivals = self._arrivals
+        while arrivals.next_time is not None and arrivals.next_time <= t:
+            p = arrivals.pop()
+            self._arrived += 1
+            self._enqueue(p, self._least_loaded(), t)
+            events.append(Event(t, "arrive", p['pid']))
+
+        for core in self._cores:
+            if core.current_process is None:
+                event = self._dispatch(core, t)
+                if event is not None:
+                    events.append(event)
+        self._preempt(t, events)
+        return events
+
+    def _preempt(self, t, events):
+        """Under a preemptive policy, hands the weakest running process's CPU to a better queued one."""
+        for queue in self.ready_queues():
+            cores = [core for core in self._cores if self.queues[core.index] is queue]
+            while queue:
+                busy = [core for core in cores if core.current_process is not None]
+                if not busy:
+                    break
+                victim = max(busy, key=lambda core: queue.running_key(core.current_process, max(0, t - core.run_start)))
+                if not queue.should_preempt(queue.peek(), victim.current_process, max(0, t - victim.run_start)):
+                    break
+                events.append(self._end_run(victim, t))
+                events.append(self._dispatch(victim, t))
+
+    def _least_loaded(self):
+        if self.queue_mode == "Global":
+            return 0
+        return min(range(self.cores),
+                   key=lambda i: len(self.queues[i]) + (self._cores[i].current_process is not None))
+
+    def _has_work_for(self, core):
+        if self.queues[core.index]:
+            return True
+        return self.steal and any(self.queues)
+
+    def _enqueue(self, p, index, t):
+        self._ready_since[p['pid']] = t
+        self.queues[index].push(p)
+
+    def _dispatch(self, core, t):
+        queue = self.queues[core.index]
+        if not queue and self.steal:
+            victim = max(self.queues, key=len)
+            if victim:
+                queue = victim
+                core.steals += 1
+        if not queue:
+            return None
+
+        p = queue.pop()
+        p['wait_time'] += t - self._ready_since.pop(p['pid'])
+        if p['start_time'] == -1:
+            p['start_time'] = t
+
+        run_length = p['remaining_burst']
+        time_slice = queue.time_slice(p)
+        if time_slice is not None:
+            run_length = min(run_length, time_slice)
+
+        core.idle_time += t - core.idle_since
+        switch = self.switch_cost if core.last_pid not in (None, p['pid']) else 0
+        core.current_process = p
+        core.last_pid = p['pid']
+        core.dispatch_time = t
+        core.run_start = t + switch
+        core.run_end = core.run_start + run_length
+        return Event(t, "dispatch", p['pid'], core.index)
+
+    def _end_run(self, core, t):
+        p = core.current_process
+        ran = max(0, t - core.run_start)
+        p['remaining_burst'] -= ran
+        self.queues[core.index].charge(p, ran)
+        core.busy_time += t - core.dispatch_time
+        core.current_process = None
+        core.idle_since = t
+
+        if p['remaining_burst'] == 0:
+            p['completion_time'] = t
+            core.completed += 1
+            self.completed_count += 1
+            if self.keep_completed:
+                self.completed_processes.append(p)
+            return Event(t, "complete", p['pid'], core.index)
+
+        # Time slice expired or preempted: back into this core's queue
+        self._enqueue(p, core.index, t)
+        return Event(t, "preempt", p['pid'], core.index)
@@ -0,0 +1,147 @@
+"""
+Synthetic workloads for stress-testing the schedulers without an image.
+
+synthetic_processes() lazily yields processes in arrival order from
+configurable distributions, generated in NumPy chunks from one seed, so
+millions of processes never exist at once: the engines pull them through
+ArrivalCursor as simulated time reaches their arrival.
+
+Example:
+    python synthetic.py --count 1000000 --arrival bursty --burst pareto \\
+        --algorithm SJF --cores 4
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+
+import numpy as np
+
+from metrics import SchedulingMetrics
+from scheduler import ALGORITHMS, SchedulingEngine
+from smp import QUEUE_MODES, MultiCoreEngine
+
+ARRIVAL_MODELS = ("poisson", "bursty")
+DISTRIBUTIONS = ("exponential", "pareto", "bimodal", "uniform")
+
+PARETO_SHAPE = 1.5          # Tail index of heavy-tailed draws (finite mean, infinite variance)
+BIMODAL_LONG_FRACTION = 0.1 # Share of draws from the long mode
+BIMODAL_RATIO = 10.0        # Long mode mean / short mode mean
+MAX_VALUE = 2**31 - 1       # Keeps draws within the process table's int32 columns
+
+
+def _draw(rng, model, mean, size):
+    """size non-negative floats with the given mean from one of DISTRIBUTIONS."""
+    if model == "exponential":
+        return rng.exponential(mean, size)
+    if model == "pareto":
+        # Lomax (Pareto II) shifted to start at scale, scaled so the mean comes out right
+        scale = mean * (PARETO_SHAPE - 1) / PARETO_SHAPE
+        return scale * (1.0 + rng.pareto(PARETO_SHAPE, size))
+    if model == "bimodal":
+        short = mean / (1 - BIMODAL_LONG_FRACTION + BIMODAL_LONG_FRACTION * BIMODAL_RATIO)
+        modes = np.where(rng.random(size) < BIMODAL_LONG_FRACTION, short * BIMODAL_RATIO, short)
+        return np.maximum(0.0, rng.normal(modes, modes * 0.2))
+    if model == "uniform":
+        return rng.uniform(0, 2 * mean, size)
+    raise ValueError(f"unknown distribution: {model}")
+
+
+def _interarrivals(rng, model, rate, size, burst_size, burst_factor):
+    """Gaps between consecutive arrivals averaging 1 / rate."""
+    if model == "poisson":
+        return rng.exponential(1 / rate, size)
+    if model == "bursty":
+        # Arrivals come burst_factor times faster than the mean rate, in bursts
+        # of about burst_size, separated by quiet gaps that restore the mean
+        fast = 1 / (rate * burst_factor)
+        gaps = rng.exponential(fast, size)
+        starts = rng.random(size) < 1 / burst_size
+        gaps[starts] += rng.exponential(burst_size * (1 / rate - fast), int(starts.sum()))
+        return gaps
+    raise ValueError(f"unknown arrival model: {model}")
+
+
+def synthetic_processes(count=None, arrival="poisson", rate=0.1, burst="exponential", mean_burst=8.0,
+                        priority="uniform", mean_priority=5.0, max_priority=10, seed=0, chunk=65536,
+                        burst_size=20, burst_factor=10.0):
+    """
+    Yields process dicts (PIDs from 1, arrivals non-decreasing) one at a time.
+
+    count=None streams forever. Arrivals are Poisson at `rate` per time unit,
+    or bursty with the same mean rate; bursts (at least 1) and priorities
+    (0 to max_priority, lower = higher priority) are drawn from DISTRIBUTIONS
+    with the given means. The same arguments always give the same stream.
+    """
+    rng = np.random.default_rng(seed)
+    clock = 0.0
+    pid = 1
+    for start in itertools.count(0, chunk):
+        size = chunk if count is None else min(chunk, count - start)
+        if size <= 0:
+            return
+        arrivals = clock + np.cumsum(_interarrivals(rng, arrival, rate, size, burst_size, burst_factor))
+        clock = float(arrivals[-1])
+        bursts = np.clip(np.rint(_draw(rng, burst, mean_burst, size)), 1, MAX_VALUE).astype(np.int64)
+        priorities = np.clip(np.rint(_draw(rng, priority, mean_priority, size)), 0, max_priority).astype(np.int64)
+        for a, b, pr in zip(arrivals.astype(np.int64).tolist(), bursts.tolist(), priorities.tolist()):
+            yield {
+                "pid": pid, "arrival": a, "burst": b, "priority": pr,
+                "remaining_burst": b, "wait_time": 0, "start_time": -1, "completion_time": -1,
+            }
+            pid += 1
+
+
+def run_stream(processes, algorithm, time_quantum=4, cores=1, queue_mode="Global"):
+    """Schedules a process stream without keeping finished processes; returns metrics.summary()."""
+    live = {}                   # Stores {pid: process} for processes in the system
+
+    def tracked(stream):
+        for p in stream:
+            live[p['pid']] = p
+            yield p
+
+    if cores > 1:
+        engine = MultiCoreEngine(tracked(processes), algorithm, time_quantum, cores, queue_mode, keep_completed=False)
+    else:
+        engine = SchedulingEngine(tracked(processes), algorithm, time_quantum, keep_completed=False)
+    metrics = SchedulingMetrics((), cores, lookup=live)
+    for event in engine.events():
+        metrics.record((event,))
+        if event.kind == "complete":
+            del live[event.pid]
+    return metrics.summary()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule a synthetic process stream headless and print its metrics.")
+    parser.add_argument("--count", type=int, default=100000, help="Processes to generate. Default: 100000.")
+    parser.add_argument("--arrival", choices=ARRIVAL_MODELS, default="poisson", help="Arrival process. Default: poisson.")
+    parser.add_argument("--rate", type=float, default=0.1, help="Mean arrivals per time unit. Default: 0.1.")
+    parser.add_argument("--burst", choices=DISTRIBUTIONS, default="exponential", help="Burst distribution. Default: exponential.")
+    parser.add_argument("--mean-burst", type=float, default=8.0, help="Mean burst time. Default: 8.")
+    parser.add_argument("--priority", choices=DISTRIBUTIONS, default="uniform", help="Priority distribution. Default: uniform.")
+    parser.add_argument("--mean-priority", type=float, default=5.0, help="Mean priority. Default: 5.")
+    parser.add_argument("--max-priority", type=int, default=10, help="Largest (lowest) priority. Default: 10.")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="FCFS", help="Scheduling algorithm. Default: FCFS.")
+    parser.add_argument("--quantum", type=int, default=4, help="Time quantum for Round Robin, MLFQ and CFS. Default: 4.")
+    parser.add_argument("--cores", type=int, default=1, help="Simulated CPUs. Default: 1.")
+    parser.add_argument("--queue-mode", choices=QUEUE_MODES, default="Global", help="Ready-queue layout with several CPUs.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for every distribution. Default: 0.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stream = synthetic_processes(args.count, args.arrival, args.rate, args.burst, args.mean_burst,
+                                 args.priority, args.mean_priority, args.max_priority, args.seed)
+    started = time.perf_counter()
+    summary = run_stream(stream, args.algorithm, args.quantum, args.cores, args.queue_mode)
+    summary["wall_time"] = round(time.perf_counter() - started, 3)
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
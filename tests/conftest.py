@@ -0,0 +1,34 @@
+import os
+import random
+import sys
+
+import pytest
+
+# The modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from process_table import ProcessTable  # noqa: E402
+
+
+def build_table(arrivals, bursts, priorities=None):
+    """A fresh ProcessTable with pids 1..n and 1x1 blocks."""
+    n = len(arrivals)
+    priorities = priorities if priorities is not None else [0] * n
+    return ProcessTable.from_columns(range(1, n + 1), arrivals, bursts, priorities,
+                                     range(n), [0] * n, [1] * n, [1] * n)
+
+
+@pytest.fixture
+def make_processes():
+    return build_table
+
+
+@pytest.fixture
+def random_workload():
+    """random_workload(seed, count) -> a ProcessTable with clustered arrivals, so queues build up."""
+    def make(seed, count=40, max_arrival=60, max_burst=25, max_priority=8):
+        rng = random.Random(seed)
+        return build_table([rng.randrange(max_arrival) for _ in range(count)],
+                           [rng.randint(1, max_burst) for _ in range(count)],
+                           [rng.randrange(max_priority) for _ in range(count)])
+    return make
@@ -0,0 +1,25 @@
+from benchmark import compare, median_results
+
+
+def test_compare_gates_on_threshold_and_noise_floor():
+    baseline = {
+        "startup": {"import scheduler": {"seconds": 0.05}},
+        "generate": {"N=10": {"seconds": 0.001, "peak_kib": 100.0}, "N=200": {"seconds": 1.0, "peak_kib": 100.0}},
+        "schedule": {"FCFS/N=10": {"ticks": 100, "ticks_per_second": 1e5},
+                     "FCFS/N=200": {"ticks": 10 ** 6, "ticks_per_second": 1e5}},
+    }
+    current = {
+        "startup": {"import scheduler": {"seconds": 0.2}},         # Import times are never gated
+        "generate": {"N=10": {"seconds": 0.003, "peak_kib": 100.0}, # Triple, but only 2 ms slower
+                     "N=200": {"seconds": 1.5, "peak_kib": 150.0}},
+        "schedule": {"FCFS/N=10": {"ticks": 100, "ticks_per_second": 5e4},   # 1 ms slower in all
+                     "FCFS/N=200": {"ticks": 10 ** 6, "ticks_per_second": 5e4}},
+    }
+    regressions = {name for name, _, _ in compare(current, baseline, 0.25)}
+    assert regressions == {"generate/N=200/seconds", "generate/N=200/peak_kib", "schedule/FCFS/N=200/ticks_per_second"}
+    assert "generate/N=10/seconds" in {name for name, _, _ in compare(current, baseline, 0.25, noise_floor=0)}
+
+
+def test_median_results():
+    runs = [{"ticks": 10, "seconds": 0.5}, {"ticks": 10, "seconds": 9.0}, {"ticks": 10, "seconds": 0.7}]
+    assert median_results(runs) == {"ticks": 10, "seconds": 0.7}
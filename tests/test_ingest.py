@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+import ingest  # noqa: E402
+
+
+def _source(tmp_path, name, mode, shape, seed=0):
+    pixels = (np.random.default_rng(seed).random(shape) * 255).astype(np.uint8)
+    path = str(tmp_path / name)
+    Image.fromarray(pixels, mode).save(path)
+    return path
+
+
+@pytest.mark.parametrize("name, mode, shape", [("a.bmp", "RGB", (613, 951, 3)), ("a.tif", "RGB", (613, 951, 3)),
+                                               ("a.ppm", "L", (500, 777))])
+@pytest.mark.parametrize("size", [60, 150, 400])
+def test_raw_sources_reduce_like_a_full_decode(tmp_path, monkeypatch, name, mode, shape, size):
+    path = _source(tmp_path, name, mode, shape)
+    monkeypatch.setattr(ingest, "STRIP_PIXELS", 1 << 14) # Many strips
+    with ingest.open_source(path) as image:
+        assert ingest._raw_layout(image) is not None
+    with Image.open(path) as image:
+        expected = image.resize((size, size), Image.Resampling.LANCZOS, reducing_gap=ingest.REDUCING_GAP)
+    assert np.array_equal(np.asarray(ingest.load_for_grid(path, size)), np.asarray(expected))
+
+
+@pytest.mark.parametrize("name", ["a.bmp", "a.png"])
+def test_source_block_attributes_match_across_strip_sizes(tmp_path, name):
+    path = _source(tmp_path, name, "RGB", (300, 420, 3), seed=2)
+    whole = ingest.source_block_attributes(path, 10, strip_pixels=1 << 30)
+    striped = ingest.source_block_attributes(path, 10, strip_pixels=1000)
+    for a, b in zip(whole, striped):
+        assert np.array_equal(a, b)
+
+
+def test_in_memory_image_is_resized_directly():
+    image = Image.fromarray((np.random.default_rng(3).random((90, 120, 3)) * 255).astype(np.uint8))
+    expected = image.resize((30, 30), Image.Resampling.LANCZOS, reducing_gap=ingest.REDUCING_GAP)
+    assert np.array_equal(np.asarray(ingest.load_for_grid(image, 30)), np.asarray(expected))
@@ -0,0 +1,152 @@
+import math
+import random
+
+import pytest
+
+from metrics import QUANTILES, LogHistogram, SchedulingMetrics, SlidingWindowCounter, StreamingSummary, jain_index
+from scheduler import SchedulingEngine
+from smp import MultiCoreEngine
+
+# A quantile lands in the same bucket as the exact one and reports its
+# midpoint, which is at most half a bucket (1/SUB_BUCKETS of the value) away
+RELATIVE_ERROR = 1 / (2 * LogHistogram.SUB_BUCKETS)
+
+
+def nearest_rank(values, q):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q * len(ordered))) - 1]
+
+
+def assert_close(estimate, exact):
+    assert abs(estimate - exact) <= exact * RELATIVE_ERROR, (estimate, exact)
+
+
+def test_histogram_exact_below_two_sub_buckets():
+    rng = random.Random(1)
+    values = [rng.randrange(2 * LogHistogram.SUB_BUCKETS) for _ in range(5000)]
+    histogram = LogHistogram()
+    for x in values:
+        histogram.add(x)
+    for q in (0.0, 0.01, 0.25, 0.5, 0.9, 0.99, 1.0):
+        assert histogram.quantile(q) == nearest_rank(values, q)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_histogram_quantiles_within_error_bound(seed):
+    rng = random.Random(seed)
+    # Log-uniform up to 10**9, so every bucket width is exercised
+    values = [int(10 ** rng.uniform(0, 9)) for _ in range(20000)]
+    histogram = LogHistogram()
+    for x in values:
+        histogram.add(x)
+    assert histogram.count == len(values)
+    for q in (0.001, 0.1, 0.5, 0.9, 0.95, 0.99, 0.999, 1.0):
+        assert_close(histogram.quantile(q), nearest_rank(values, q))
+
+
+def test_histogram_bound_holds_for_every_value():
+    # Each value alone: its own bucket's midpoint must be within the bound
+    for x in list(range(1, 5000)) + [2 ** k + d for k in range(12, 40) for d in (-1, 0, 1)]:
+        histogram = LogHistogram()
+        histogram.add(x)
+        assert_close(histogram.quantile(0.5), x)
+
+
+def test_histogram_edge_cases():
+    histogram = LogHistogram()
+    assert histogram.quantile(0.5) == 0.0
+    histogram.add(-3)               # Negative times count as 0
+    histogram.add(2.9)
+    assert histogram.quantile(0.0) == 0 and histogram.quantile(1.0) == 2
+
+
+def test_streaming_summary():
+    summary = StreamingSummary()
+    assert summary.mean == 0.0
+    values = [5, 0, 300, 12, 12, 7000]
+    for x in values:
+        summary.add(x)
+    stats = summary.summary()
+    assert stats["mean"] == pytest.approx(sum(values) / len(values))
+    assert stats["max"] == 7000
+    assert set(stats) == {"mean", "max"} | {f"p{q * 100:g}" for q in QUANTILES}
+    assert stats["p50"] == nearest_rank(values, 0.5)
+    assert_close(stats["p99"], nearest_rank(values, 0.99))
+
+
+def test_sliding_window_counter():
+    counter = SlidingWindowCounter(100, buckets=20)
+    for t in range(1000):
+        counter.add(t, 2)
+    # Steady 2 per time unit, short by at most the oldest bucket
+    assert 2 * (1 - counter.width / 100) - 1e-9 <= counter.rate(1000) <= 2
+    assert counter.rate(5000) == 0.0
+    assert SlidingWindowCounter(100).rate(0) == 0.0
+
+
+def test_jain_index():
+    assert jain_index(12, 48, 3) == pytest.approx(1.0) # 4, 4, 4
+    assert jain_index(5, 25, 5) == pytest.approx(1 / 5) # 5, 0, 0, 0, 0
+    assert jain_index(0, 0, 0) == 1.0
+
+
+@pytest.mark.parametrize("algorithm, cores", [("FCFS", 1), ("SRTF", 1), ("Round Robin", 1), ("MLFQ", 1),
+                                              ("Round Robin", 3), ("SJF", 4)])
+def test_scheduling_metrics_match_exact_values(random_workload, algorithm, cores):
+    for seed in range(5):
+        processes = random_workload(seed, count=300, max_arrival=400, max_burst=200)
+        if cores == 1:
+            engine = SchedulingEngine(processes, algorithm, 3)
+        else:
+            engine = MultiCoreEngine(processes, algorithm, 3, cores)
+        metrics = SchedulingMetrics(processes, cores)
+        events = list(engine.events())
+        metrics.record(events)
+        stats = metrics.summary()
+
+        exact = {
+            "waiting_time": [p['wait_time'] for p in processes],
+            "turnaround_time": [p['completion_time'] - p['arrival'] for p in processes],
+            "response_time": [p['start_time'] - p['arrival'] for p in processes],
+        }
+        assert stats["completed"] == len(processes)
+        assert stats["time"] == engine.time
+        for name, values in exact.items():
+            assert stats[f"{name}_mean"] == pytest.approx(sum(values) / len(values))
+            assert stats[f"{name}_max"] == max(values)
+            for q in QUANTILES:
+                assert_close(stats[f"{name}_p{q * 100:g}"], nearest_rank(values, q))
+
+        busy = sum(p['burst'] for p in processes)
+        assert stats["idle_time"] == engine.time * cores - busy
+        assert stats["utilization"] == pytest.approx(busy / (engine.time * cores))
+        assert stats["throughput"] == pytest.approx(len(processes) / engine.time)
+
+        switches = 0
+        last = {}
+        for event in events:
+            if event.kind == "dispatch":
+                switches += last.get(event.core, event.pid) != event.pid
+                last[event.core] = event.pid
+        assert stats["context_switches"] == switches
+
+        slowdowns = [(p['completion_time'] - p['arrival']) / p['burst'] for p in processes]
+        expected = sum(slowdowns) ** 2 / (len(slowdowns) * sum(s * s for s in slowdowns))
+        assert stats["fairness_slowdown"] == pytest.approx(expected)
+        assert stats["max_slowdown"] == pytest.approx(max(slowdowns))
+
+
+def test_scheduling_metrics_midway(random_workload):
+    processes = random_workload(9, count=100, max_arrival=200, max_burst=30)
+    engine = SchedulingEngine(processes, "Round Robin", 4)
+    metrics = SchedulingMetrics(processes)
+    metrics.record(engine.advance(150))
+    running = engine.current_process
+    stats = metrics.summary(150)
+    done = [p for p in processes if p['completion_time'] not in (-1, None) and p['completion_time'] <= 150]
+    assert stats["completed"] == len(done)
+    # Busy time counts the run still in progress at t=150
+    ran = sum(p['burst'] - p['remaining_burst'] for p in processes)
+    if running is not None:
+        ran += 150 - engine.dispatch_time
+    assert metrics.busy_time(150) == [ran]
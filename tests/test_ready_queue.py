@@ -0,0 +1,196 @@
+import random
+
+import pytest
+
+import ready_queue
+from ready_queue import MLFQ_AGING, IndexedHeap, MultilevelFeedbackQueue, make_ready_queue
+from scheduler import SchedulingEngine
+from smp import MultiCoreEngine
+
+
+def _watch_mlfq(queues):
+    """Records every aging/boost move as (time, time the process joined its level, target level)."""
+    moves = []
+    for queue in queues:
+        original = queue._move
+
+        def move(level, target, t, original=original):
+            moves.append((t, level[0][1], target))
+            original(level, target, t)
+        queue._move = move
+    return moves
+
+
+def _run_checking_joins(engine, quantum):
+    """Steps the engine, checking after every event time that queued MLFQ entries are stamped correctly."""
+    queues = engine.ready_queues()
+    moves = _watch_mlfq(queues)
+    while not engine.finished:
+        t = engine.next_event_time()
+        events = engine.advance(t)
+        requeued = {e.pid for e in events if e.kind in ("arrive", "preempt")}
+        for queue in queues:
+            for depth, level in enumerate(queue._levels):
+                for p, joined in level:
+                    # Anything queued at this event time joined now, not at the previous event
+                    if p['pid'] in requeued:
+                        assert joined == t, (p['pid'], joined, t)
+                    assert joined <= t
+                    if depth > 0:
+                        # Overdue processes have been promoted
+                        assert t - joined < MLFQ_AGING * quantum
+    return moves
+
+
+@pytest.mark.parametrize("quantum", [1, 2, 3])
+def test_mlfq_requeued_processes_join_at_event_time(random_workload, monkeypatch, quantum):
+    monkeypatch.setattr(ready_queue, "MLFQ_BOOST", 10 ** 9) # Aging only
+    promotions = 0
+    for seed in range(15):
+        engine = SchedulingEngine(random_workload(seed, count=30, max_arrival=40, max_burst=60), "MLFQ", quantum)
+        moves = _run_checking_joins(engine, quantum)
+        for t, joined, _ in moves:
+            # Promoted no earlier than MLFQ_AGING quanta after joining the level
+            assert t - joined >= MLFQ_AGING * quantum
+        promotions += len(moves)
+    assert promotions > 0 # The workloads do exercise aging
+
+
+@pytest.mark.parametrize("queue_mode", ["Global", "Per-Core", "Per-Core + Stealing"])
+def test_mlfq_requeued_processes_join_at_event_time_smp(random_workload, monkeypatch, queue_mode):
+    monkeypatch.setattr(ready_queue, "MLFQ_BOOST", 10 ** 9)
+    for seed in range(10):
+        engine = MultiCoreEngine(random_workload(seed, count=40, max_arrival=30, max_burst=60), "MLFQ", 2,
+                                 cores=2, queue_mode=queue_mode)
+        for t, joined, _ in _run_checking_joins(engine, 2):
+            assert t - joined >= MLFQ_AGING * 2
+
+
+def test_mlfq_requeued_process_ages_from_its_slice_end(make_processes, monkeypatch):
+    # pid 1 runs alone: 0-1 at level 0, 1-3 at level 1, then slices of 4 at
+    # level 2 (3-7, ..., 19-23). From t=23 a one-unit process arrives every
+    # unit and takes the CPU at level 0, so pid 1 goes back to level 2 when
+    # its slice ends at 23. It must be promoted MLFQ_AGING = 20 units after
+    # 23, not after the previous event at 19.
+    monkeypatch.setattr(ready_queue, "MLFQ_BOOST", 10 ** 9)
+    short = range(23, 60)
+    processes = make_processes([0, *short], [100] + [1] * len(short))
+    engine = SchedulingEngine(processes, "MLFQ", 1)
+    moves = _watch_mlfq([engine.ready_queue])
+    requeued = [event.time for event in engine.events() if event.kind == "preempt" and event.pid == 1]
+    assert requeued[:6] == [1, 3, 7, 11, 15, 19] and 23 in requeued
+    assert moves[0] == (43, 23, 1)
+
+
+def _dispatch_times(processes, quantum):
+    return [event.time for event in SchedulingEngine(processes, "MLFQ", quantum).events() if event.kind == "dispatch"]
+
+
+def test_mlfq_boost_applies_when_due(make_processes):
+    # A lone process arriving at 1 runs 1-2, 2-4, then slices of 4 at the
+    # bottom level, ending at 4 + 4k; one ends exactly at the boost (t=100)
+    # and must not be demoted again, so the next slice is a top-level 1.
+    runs = _dispatch_times(make_processes([1], [150]), 1)
+    assert 100 in runs
+    assert runs[runs.index(100) + 1] == 101
+
+    # Arriving at 0, the run from 99 to 103 spans the boost: the boost puts it
+    # on top, and having used its whole slice it drops to level 1 (slice 2)
+    runs = _dispatch_times(make_processes([0], [150]), 1)
+    assert 99 in runs
+    assert runs[runs.index(99) + 1:runs.index(99) + 3] == [103, 105]
+
+
+def test_mlfq_queue_levels_and_slices():
+    queue = MultilevelFeedbackQueue(2)
+    p = {'pid': 1, 'remaining_burst': 10}
+    queue.push(p)
+    assert queue.time_slice(p) == 2
+    assert queue.pop() is p
+    p['remaining_burst'] -= 2
+    queue.charge(p, 2)
+    assert queue.time_slice(p) == 4
+    queue.advance_to(5)
+    queue.push(p)
+    queue.advance_to(5 + MLFQ_AGING * 2 - 1)
+    assert queue.time_slice(p) == 4 # Not overdue yet
+    queue.advance_to(5 + MLFQ_AGING * 2)
+    assert queue.time_slice(p) == 2 # Promoted back to the top
+
+
+# --- Heap ordering ---
+
+@pytest.mark.parametrize("algorithm", ["SJF", "Priority"])
+def test_priority_queue_ties_leave_in_enqueue_order(random_workload, algorithm):
+    key = ready_queue.QUEUE_KEYS[algorithm]
+    for seed in range(10):
+        # Few distinct keys, so most pops are decided by the tie-breaker
+        processes = random_workload(seed, count=60, max_burst=4, max_priority=3)
+        arrived = sorted(processes, key=lambda p: (p['arrival'], p['pid']))
+        queue = make_ready_queue(algorithm)
+        for p in arrived:
+            queue.push(p)
+        # The stable re-sort the tick loop used to do
+        expected = [p['pid'] for p in sorted(arrived, key=key)]
+        assert [p['pid'] for p in queue.snapshot()] == expected
+        assert [p['pid'] for p in queue.snapshot(7)] == expected[:7]
+        assert [queue.pop()['pid'] for _ in range(len(queue))] == expected
+
+
+def test_priority_queue_interleaved_matches_stable_min(random_workload):
+    rng = random.Random(7)
+    queue = make_ready_queue("Priority")
+    reference = []                  # Queued processes in enqueue order
+    for p in sorted(random_workload(2, count=200, max_priority=4), key=lambda p: (p['arrival'], p['pid'])):
+        queue.push(p)
+        reference.append(p)
+        while reference and rng.random() < 0.4:
+            # min() returns the first of equal keys, i.e. the earliest enqueued
+            expected = min(reference, key=lambda q: q['priority'])
+            reference.remove(expected)
+            assert queue.pop() is expected
+    assert queue.snapshot() == sorted(reference, key=lambda q: q['priority'])
+
+
+def test_priority_queue_update_keeps_enqueue_order(make_processes):
+    processes = make_processes([0, 0, 0], [5, 3, 3])
+    queue = make_ready_queue("SRTF")
+    for p in processes:
+        queue.push(p)
+    processes[0]['remaining_burst'] = 3
+    queue.update(processes[0])
+    # Now tied with pids 2 and 3, and enqueued first
+    assert [p['pid'] for p in queue.snapshot()] == [1, 2, 3]
+    queue.remove(processes[1])
+    assert [queue.pop()['pid'] for _ in range(2)] == [1, 3]
+
+
+def test_indexed_heap_matches_sorted_reference():
+    rng = random.Random(11)
+    heap = IndexedHeap()
+    reference = {}                  # Stores {pid: key}
+    # Keys are made unique, as the queues do with their enqueue counter
+    next_pid = 0
+    for _ in range(3000):
+        op = rng.random()
+        if op < 0.4 or not reference:
+            next_pid += 1
+            reference[next_pid] = (rng.randrange(50), next_pid)
+            heap.push(reference[next_pid], next_pid, next_pid)
+        elif op < 0.6:
+            pid = min(reference, key=reference.get)
+            assert heap.peek() == pid
+            assert heap.pop() == pid
+            del reference[pid]
+        elif op < 0.8:
+            pid = rng.choice(list(reference))
+            reference[pid] = (rng.randrange(50), pid)
+            heap.update(reference[pid], pid)
+            assert heap.key_of(pid) == reference[pid]
+        else:
+            pid = rng.choice(list(reference))
+            assert heap.remove(pid) == pid
+            del reference[pid]
+        assert len(heap) == len(reference)
+        assert all(pid in heap for pid in reference)
+    assert [pid for _, pid, _ in sorted(heap)] == sorted(reference, key=reference.get)
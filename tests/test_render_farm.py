@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from render_farm import RenderFarm  # noqa: E402
+
+
+def _drive(farm, timeout=60):
+    deadline = time.monotonic() + timeout
+    farm.start()
+    try:
+        while not farm.finished:
+            assert time.monotonic() < deadline, "render farm stalled"
+            farm.poll()
+            time.sleep(0.002)
+    finally:
+        farm.shutdown()
+
+
+def test_rerun_on_the_same_table(make_processes):
+    source = Image.new("RGB", (8, 8), "gray")
+    processes = make_processes([0, 0, 1, 2], [3, 1, 2, 2])
+    for _ in range(2):
+        # As Run does before every run
+        processes.reset_progress()
+        farm = RenderFarm(source, processes, "Round Robin", workers=2, time_quantum=1, tick_seconds=0.001)
+        _drive(farm)
+        assert sorted(p['pid'] for p in farm.completed_processes) == [1, 2, 3, 4]
+        assert all(p['remaining_burst'] == 0 for p in processes)
+
+
+def test_poll_reraises_a_worker_error(make_processes):
+    farm = RenderFarm(Image.new("RGB", (4, 4)), make_processes([0], [1]), "FCFS", workers=1,
+                      chain=("no such filter",))
+    with pytest.raises(KeyError):
+        _drive(farm)
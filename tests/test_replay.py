@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+import replay
+from replay import Trace, TraceRecorder
+from scheduler import ALGORITHMS, SchedulingEngine
+from smp import MultiCoreEngine
+
+# Ready orders the trace can rebuild; MLFQ and CFS fall back to enqueue order
+ORDERED = ("FCFS", "SJF", "Priority", "Round Robin", "SRTF", "Preemptive Priority")
+
+
+def record(engine, processes, algorithm, cores=1, queue_mode=None):
+    """
+    Steps the engine one event time at a time, recording the trace and the
+    engine's own state after each step. Returns (trace, {time: expected}).
+    """
+    recorder = TraceRecorder(processes, algorithm, 3, cores, queue_mode)
+    expected = {}
+    t = 0
+    while True:
+        running = [None if p is None else p['pid'] for p in engine.running()]
+        remaining = processes.column("remaining_burst").copy()
+        ready = [p['pid'] for queue in engine.ready_queues() for p in queue.snapshot()]
+        expected[t] = (remaining, running, ready, engine.completed_count)
+        if engine.finished:
+            return recorder.finish(), expected
+        t = engine.next_event_time()
+        recorder.record(engine.advance(t))
+
+
+def check_every_time(trace, expected, ordered):
+    """state_at(t) for every t up to the end matches the state after the last event time <= t."""
+    latest = None
+    for t in range(trace.end_time + 1):
+        if t in expected:
+            latest = expected[t]
+        remaining, running, ready, completed = latest
+        state = trace.state_at(t)
+        assert state.time == t
+        assert np.array_equal(state.remaining, remaining), t
+        assert [None if entry is None else entry[0] for entry in state.running] == running, t
+        assert state.completed == completed, t
+        if ordered:
+            assert state.ready == ready, t
+        else:
+            assert sorted(state.ready) == sorted(ready), t
+    assert max(expected) == trace.end_time
+
+
+@pytest.fixture(params=[7, 4096])
+def snapshot_every(request, monkeypatch):
+    # A small interval makes state_at start from a snapshot most of the time
+    monkeypatch.setattr(replay, "SNAPSHOT_EVERY", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_state_at_matches_engine(random_workload, snapshot_every, algorithm):
+    for seed in range(3):
+        processes = random_workload(seed)
+        engine = SchedulingEngine(processes, algorithm, 3)
+        trace, expected = record(engine, processes, algorithm)
+        check_every_time(trace, expected, algorithm in ORDERED)
+
+
+@pytest.mark.parametrize("queue_mode", ["Global", "Per-Core", "Per-Core + Stealing"])
+def test_state_at_matches_multicore_engine(random_workload, snapshot_every, queue_mode):
+    for seed in range(3):
+        processes = random_workload(seed, count=60)
+        engine = MultiCoreEngine(processes, "Round Robin", 3, 3, queue_mode)
+        trace, expected = record(engine, processes, "Round Robin", 3, queue_mode)
+        # Per-core queues have no single dispatch order
+        check_every_time(trace, expected, queue_mode == "Global")
+
+
+def test_remaining_at_counts_runs_in_progress(random_workload):
+    processes = random_workload(4)
+    engine = SchedulingEngine(processes, "SRTF")
+    recorder = TraceRecorder(processes, "SRTF")
+    checked = 0
+    while not engine.finished:
+        t = engine.next_event_time()
+        recorder.record(engine.advance(t))
+        p = engine.current_process
+        if p is not None and engine.next_event_time() > t + 1:
+            # Partway to the next event the running process has run on
+            mid = t + 1
+            trace = recorder.finish()
+            assert trace.remaining_at(trace.state_at(mid), mid)[p['pid'] - 1] == engine.remaining_at(mid)
+            checked += 1
+    assert checked
+
+
+def test_save_load_round_trip(random_workload, tmp_path, monkeypatch):
+    monkeypatch.setattr(replay, "SNAPSHOT_EVERY", 16)
+    processes = random_workload(6)
+    recorder = TraceRecorder(processes, "Priority", 4, source="grid.png", grid_size=[8, 5])
+    recorder.record(SchedulingEngine(processes, "Priority", 4).events())
+    trace = recorder.finish()
+    path = tmp_path / "run.trace"
+    trace.save(path)
+
+    loaded = Trace.load(path)
+    assert loaded.header == trace.header
+    # The process table is an array member, not part of the JSON header
+    assert "processes" not in loaded.header
+    assert loaded.table.dtype == np.int32 and np.array_equal(loaded.table, trace.table)
+    for name in ("times", "kinds", "pids", "cores"):
+        assert np.array_equal(getattr(loaded, name), getattr(trace, name))
+    for t in range(0, trace.end_time + 1, 5):
+        a, b = loaded.state_at(t), trace.state_at(t)
+        assert np.array_equal(a.remaining, b.remaining)
+        assert (a.running, a.ready, a.completed) == (b.running, b.ready, b.completed)
+    assert loaded.segments(0, trace.end_time) == trace.segments(0, trace.end_time)
+
+    fresh = loaded.processes()
+    assert [p['pid'] for p in fresh] == [p['pid'] for p in processes]
+    assert all(p['remaining_burst'] == p['burst'] and p['start_time'] == -1 for p in fresh)
+    assert np.array_equal(fresh.column("priority"), processes.column("priority"))
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "not.trace"
+    path.write_bytes(b"PK\x03\x04")
+    with pytest.raises(ValueError):
+        Trace.load(path)
@@ -0,0 +1,205 @@
+from collections import deque
+
+import pytest
+
+from ready_queue import make_ready_queue
+from scheduler import ALGORITHMS, ArrivalCursor, SchedulingEngine, average_times
+from smp import MultiCoreEngine
+
+SEEDS = range(25)
+
+
+def tick_loop(processes, algorithm, quantum):
+    """
+    Reference scheduler that advances one time unit per iteration, as the GUI
+    used to. It drives the same ready queue the engine uses, but checks for
+    run ends and arrivals and moves the queue's clock on every tick, and
+    counts waiting time tick by tick. Preemptive policies are checked when
+    a process arrives, as documented for each of them. Returns ({pid: (start, completion, wait)}, pid or None per tick).
+    """
+    queue = make_ready_queue(algorithm, quantum)
+    arrivals = deque(sorted(processes, key=lambda p: (p['arrival'], p['pid'])))
+    result, timeline = {}, []
+    waiting = set()
+    running, ran, time_slice = None, 0, None
+    t = 0
+    while len(result) < len(processes):
+        queue.advance_to(t)
+        # 1. The running process ends its run
+        if running is not None and (ran == running['remaining_burst'] or ran == time_slice):
+            running['remaining_burst'] -= ran
+            queue.charge(running, ran)
+            if running['remaining_burst'] == 0:
+                result[running['pid']] = (running['start_time'], t, running['wait_time'])
+            else:
+                queue.push(running)
+                waiting.add(running['pid'])
+            running = None
+        if len(result) == len(processes):
+            break
+        # 2. Arrivals
+        arrived = False
+        while arrivals and arrivals[0]['arrival'] == t:
+            p = arrivals.popleft()
+            queue.push(p)
+            waiting.add(p['pid'])
+            arrived = True
+        # 3. Preemption
+        if arrived and running is not None and queue and queue.should_preempt(queue.peek(), running, ran):
+            running['remaining_burst'] -= ran
+            queue.charge(running, ran)
+            queue.push(running)
+            waiting.add(running['pid'])
+            running = None
+        # 4. Dispatch
+        if running is None and queue:
+            running = queue.pop()
+            waiting.discard(running['pid'])
+            if running['start_time'] == -1:
+                running['start_time'] = t
+            ran, time_slice = 0, queue.time_slice(running)
+        # Execute one tick
+        for p in processes:
+            if p['pid'] in waiting:
+                p['wait_time'] += 1
+        timeline.append(None if running is None else running['pid'])
+        if running is not None:
+            ran += 1
+        t += 1
+    return result, timeline
+
+
+def classic_tick_loop(processes, algorithm, quantum):
+    """
+    The original GUI tick loop for FCFS, SJF, Priority and Round Robin: a
+    deque re-sorted (stably) on every tick. Returns {pid: (start, completion)}.
+    """
+    ready, done = deque(), {}
+    running, slice_left, t = None, 0, 0
+    while len(done) < len(processes):
+        ready.extend(p for p in processes if p['arrival'] == t)
+        if algorithm == "SJF":
+            ready = deque(sorted(ready, key=lambda p: p['burst']))
+        elif algorithm == "Priority":
+            ready = deque(sorted(ready, key=lambda p: p['priority']))
+        if running is None and ready:
+            running = ready.popleft()
+            if running['start_time'] == -1:
+                running['start_time'] = t
+            slice_left = quantum
+        if running is not None:
+            running['remaining_burst'] -= 1
+            slice_left -= 1
+            if running['remaining_burst'] == 0:
+                done[running['pid']] = (running['start_time'], t + 1)
+                running = None
+            elif algorithm == "Round Robin" and slice_left == 0:
+                ready.append(running)
+                running = None
+        t += 1
+    return done
+
+
+def engine_timeline(events, end):
+    """pid (or None) per tick from the engine's dispatch/preempt/complete events."""
+    timeline = [None] * end
+    started = {}
+    for event in events:
+        if event.kind == "dispatch":
+            started[event.core] = (event.time, event.pid)
+        elif event.kind in ("preempt", "complete"):
+            start, pid = started.pop(event.core)
+            timeline[start:event.time] = [pid] * (event.time - start)
+    return timeline
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("quantum", [1, 3, 4])
+def test_engine_matches_tick_loop(random_workload, algorithm, quantum):
+    for seed in SEEDS:
+        reference = random_workload(seed)
+        expected, expected_timeline = tick_loop(reference, algorithm, quantum)
+
+        processes = random_workload(seed)
+        engine = SchedulingEngine(processes, algorithm, quantum)
+        events = list(engine.events())
+        got = {p['pid']: (p['start_time'], p['completion_time'], p['wait_time']) for p in processes}
+
+        assert got == expected, (algorithm, quantum, seed)
+        assert engine_timeline(events, engine.time) == expected_timeline, (algorithm, quantum, seed)
+        assert engine.total_idle_time == expected_timeline.count(None)
+
+
+@pytest.mark.parametrize("algorithm", ["FCFS", "SJF", "Priority", "Round Robin"])
+def test_engine_matches_original_tick_loop(random_workload, algorithm):
+    for seed in SEEDS:
+        expected = classic_tick_loop(random_workload(seed), algorithm, 4)
+        processes = random_workload(seed)
+        SchedulingEngine(processes, algorithm, 4).run()
+        assert {p['pid']: (p['start_time'], p['completion_time']) for p in processes} == expected, seed
+
+
+def test_all_at_time_zero(make_processes):
+    # The "all arrive at t=0" mode: ties resolve by pid
+    processes = make_processes([0] * 5, [3, 1, 3, 2, 1], [2, 2, 1, 0, 2])
+    SchedulingEngine(processes, "SJF").run()
+    order = sorted(processes, key=lambda p: p['start_time'])
+    assert [p['pid'] for p in order] == [2, 5, 4, 1, 3]
+
+
+def test_waiting_time_from_enqueue_timestamps(random_workload):
+    processes = random_workload(3)
+    engine = SchedulingEngine(processes, "Round Robin", 2)
+    completed = engine.run()
+    for p in completed:
+        assert p['wait_time'] == p['completion_time'] - p['arrival'] - p['burst']
+    avg_wait, avg_tat = average_times(completed)
+    assert avg_wait == pytest.approx(sum(p['wait_time'] for p in completed) / len(completed))
+    assert average_times(processes) == pytest.approx((avg_wait, avg_tat))
+
+
+def test_advance_stops_at_until(random_workload):
+    engine = SchedulingEngine(random_workload(1), "SRTF")
+    events = engine.advance(30)
+    assert events and all(event.time <= 30 for event in events)
+    assert engine.next_event_time() > 30
+    rest = list(engine.events())
+    assert rest[0].time > 30 and engine.finished
+
+
+def test_switch_cost_adds_to_makespan(random_workload):
+    plain = SchedulingEngine(random_workload(5, max_arrival=1), "Round Robin", 3)
+    events = list(plain.events())
+    switches = sum(1 for a, b in zip([e for e in events if e.kind == "dispatch"],
+                                     [e for e in events if e.kind == "dispatch"][1:]) if a.pid != b.pid)
+    costly = SchedulingEngine(random_workload(5, max_arrival=1), "Round Robin", 3, switch_cost=2)
+    costly.run()
+    assert costly.time == plain.time + 2 * switches
+
+
+def test_arrival_cursor_streams_in_order(make_processes):
+    processes = make_processes([4, 0, 4, 2], [1, 1, 1, 1])
+    cursor = ArrivalCursor(processes)
+    assert [cursor.pop()['pid'] for _ in range(4)] == [2, 4, 1, 3]
+    assert cursor.next_time is None
+
+    stream = ArrivalCursor(iter([{'pid': 1, 'arrival': 5}, {'pid': 2, 'arrival': 3}]))
+    with pytest.raises(ValueError):
+        stream.pop()
+
+
+@pytest.mark.parametrize("cores", [1, 3])
+def test_rerun_after_reset_progress_matches(random_workload, cores):
+    # What Run does with the same table a second time
+    processes = random_workload(8)
+    results = []
+    for _ in range(2):
+        processes.reset_progress()
+        if cores == 1:
+            SchedulingEngine(processes, "Round Robin", 3).run()
+        else:
+            MultiCoreEngine(processes, "Round Robin", 3, cores).run()
+        results.append([(p['start_time'], p['completion_time'], p['wait_time'], p['remaining_burst'])
+                        for p in processes])
+    assert results[0] == results[1]
+    assert average_times(processes)[0] >= 0
@@ -0,0 +1,49 @@
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+
+@pytest.fixture
+def app(monkeypatch):
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display (try xvfb-run)")
+    root.withdraw()
+    import simulator
+    from benchmark import synthetic_image
+
+    # Driven by hand, as benchmark.py does: no after() rescheduling, no modal dialogs
+    monkeypatch.setattr(simulator.messagebox, "showinfo", lambda *args, **kwargs: None)
+    app = simulator.VisualSchedulingSimulator(root)
+    app.workload_cache = None
+    app.root.after = lambda *args: None
+    app.base_image = synthetic_image(256)
+    app.grid_size_entry.delete(0, tk.END)
+    app.grid_size_entry.insert(0, "6")
+    app.delay_entry.delete(0, tk.END)
+    app.delay_entry.insert(0, "0")
+    app.generate_processes()
+    while app.job is not None:
+        app.poll_generation(app.job)
+    yield app
+    root.destroy()
+
+
+def _run(app):
+    app.run_simulation()
+    while app.simulation_running:
+        app.simulation_tick()
+    return ([(p['start_time'], p['completion_time'], p['wait_time']) for p in app.processes],
+            app.metrics.summary())
+
+
+@pytest.mark.parametrize("algorithm", ["Round Robin", "SJF"])
+def test_second_run_repeats_the_first(app, algorithm):
+    app.algorithm_var.set(algorithm)
+    first, first_metrics = _run(app)
+    assert str(app.run_button.cget("state")) == "normal"
+    second, second_metrics = _run(app)
+    assert second == first
+    assert second_metrics == first_metrics
+    assert all(wait >= 0 for _, _, wait in second)
@@ -0,0 +1,52 @@
+import pytest
+
+from smp import QUEUE_MODES, MultiCoreEngine
+
+
+def completion_order(engine):
+    """Runs the engine; returns the pids each core completed, in order."""
+    order = [[] for _ in range(engine.cores)]
+    for event in engine.events():
+        if event.kind == "complete":
+            order[event.core].append(event.pid)
+    return order
+
+
+def test_stealing_moves_work_to_an_idle_core(make_processes):
+    # Arrivals alternate between the two cores: 1, 3, 5 (long) on core 0, 2, 4 (short) on core 1
+    processes = make_processes([0] * 5, [10, 1, 10, 1, 10])
+    per_core = MultiCoreEngine(processes, "FCFS", cores=2, queue_mode="Per-Core")
+    assert completion_order(per_core) == [[1, 3, 5], [2, 4]]
+    assert per_core.time == 30
+    assert [core["steals"] for core in per_core.core_stats()] == [0, 0]
+
+    processes.reset_progress()
+    stealing = MultiCoreEngine(processes, "FCFS", cores=2, queue_mode="Per-Core + Stealing")
+    # Core 1 runs dry at t=2 and takes 3 from core 0's queue; core 0 is free for 5 at t=10
+    assert completion_order(stealing) == [[1, 5], [2, 4, 3]]
+    assert stealing.time == 20
+    assert [core["steals"] for core in stealing.core_stats()] == [0, 1]
+    assert stealing.load_imbalance() < per_core.load_imbalance()
+
+
+@pytest.mark.parametrize("queue_mode", QUEUE_MODES)
+def test_core_stats_account_for_every_burst(random_workload, queue_mode):
+    for seed in range(5):
+        processes = random_workload(seed, count=60)
+        engine = MultiCoreEngine(processes, "Round Robin", 3, 3, queue_mode)
+        completed = engine.run()
+        assert sorted(p['pid'] for p in completed) == list(range(1, 61))
+        assert all(p['remaining_burst'] == 0 and p['completion_time'] <= engine.time for p in processes)
+
+        stats = engine.core_stats()
+        assert sum(core["busy_time"] for core in stats) == sum(p['burst'] for p in processes)
+        assert sum(core["completed"] for core in stats) == len(processes)
+        for core in stats:
+            assert core["busy_time"] + core["idle_time"] == engine.time
+            assert core["utilization"] == pytest.approx(core["busy_time"] / engine.time)
+        if queue_mode != "Per-Core + Stealing":
+            assert all(core["steals"] == 0 for core in stats)
+
+        busy = [core["busy_time"] for core in stats]
+        mean = sum(busy) / len(busy)
+        assert engine.load_imbalance() == pytest.approx((max(busy) - mean) / mean)
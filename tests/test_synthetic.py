@@ -0,0 +1,58 @@
+import itertools
+
+import pytest
+
+from metrics import SchedulingMetrics
+from scheduler import SchedulingEngine
+from smp import MultiCoreEngine
+from synthetic import ARRIVAL_MODELS, DISTRIBUTIONS, run_stream, synthetic_processes
+
+
+@pytest.mark.parametrize("arrival", ARRIVAL_MODELS)
+@pytest.mark.parametrize("burst", DISTRIBUTIONS)
+def test_seeded_stream_is_reproducible(arrival, burst):
+    # A small chunk makes the stream span several NumPy batches
+    stream = list(synthetic_processes(500, arrival, burst=burst, max_priority=6, seed=7, chunk=64))
+    assert stream == list(synthetic_processes(500, arrival, burst=burst, max_priority=6, seed=7, chunk=64))
+    assert stream != list(synthetic_processes(500, arrival, burst=burst, max_priority=6, seed=8, chunk=64))
+
+    assert [p['pid'] for p in stream] == list(range(1, 501))
+    arrivals = [p['arrival'] for p in stream]
+    assert arrivals == sorted(arrivals)
+    assert all(p['burst'] >= 1 and p['remaining_burst'] == p['burst'] for p in stream)
+    assert all(0 <= p['priority'] <= 6 for p in stream)
+
+
+def test_unbounded_stream_keeps_going():
+    stream = synthetic_processes(None, chunk=16)
+    assert [p['pid'] for p in itertools.islice(stream, 100)] == list(range(1, 101))
+
+
+def test_unknown_models_are_rejected():
+    with pytest.raises(ValueError):
+        next(synthetic_processes(10, arrival="periodic"))
+    with pytest.raises(ValueError):
+        next(synthetic_processes(10, burst="lognormal"))
+
+
+def test_out_of_order_stream_is_rejected():
+    stream = list(synthetic_processes(200, seed=3))
+    # Swap two neighbours that arrive at different times
+    i = next(i for i in range(len(stream) - 1) if stream[i]['arrival'] < stream[i + 1]['arrival'])
+    stream[i], stream[i + 1] = stream[i + 1], stream[i]
+    with pytest.raises(ValueError, match=f"process {stream[i + 1]['pid']} arrives"):
+        SchedulingEngine(iter(stream), "FCFS").run()
+
+
+@pytest.mark.parametrize("cores, queue_mode", [(1, "Global"), (3, "Global"), (3, "Per-Core + Stealing")])
+def test_run_stream_matches_a_full_table(cores, queue_mode):
+    summary = run_stream(synthetic_processes(2000, "bursty", rate=0.3, seed=2), "SJF", 4, cores, queue_mode)
+
+    processes = list(synthetic_processes(2000, "bursty", rate=0.3, seed=2))
+    if cores == 1:
+        engine = SchedulingEngine(processes, "SJF", 4)
+    else:
+        engine = MultiCoreEngine(processes, "SJF", 4, cores, queue_mode)
+    metrics = SchedulingMetrics(processes, cores)
+    metrics.record(engine.events())
+    assert summary == metrics.summary()
@@ -0,0 +1,40 @@
+import pytest
+
+from tuning import QuantumTuner, parse_args, search_points
+
+
+def test_quantum_range_is_validated(random_workload):
+    processes = random_workload(0)
+    with pytest.raises(ValueError):
+        QuantumTuner(processes, lo=0)
+    with pytest.raises(ValueError):
+        QuantumTuner(processes, lo=8, hi=4)
+    assert QuantumTuner(processes, lo=4, hi=4).hi == 4
+    # Without hi the range ends at the longest burst, or at lo if that is longer
+    assert QuantumTuner(processes).hi == processes.column("burst").max()
+    assert QuantumTuner(processes, lo=1000).hi == 1000
+
+
+def test_parse_args_rejects_inverted_range(capsys):
+    with pytest.raises(SystemExit):
+        parse_args(["photo.jpg", "--min-quantum", "9", "--max-quantum", "3"])
+    assert "--max-quantum 3 is below --min-quantum 9" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        parse_args(["photo.jpg", "--min-quantum", "0"])
+    args = parse_args(["photo.jpg", "--min-quantum", "3", "--max-quantum", "3"])
+    assert (args.min_quantum, args.max_quantum) == (3, 3)
+
+
+def test_search_points():
+    assert search_points(2, 5, 8) == [2, 3, 4, 5]
+    points = search_points(1, 1000, 8, geometric=True)
+    assert points[0] == 1 and points[-1] == 1000 and len(points) == 8
+
+
+def test_negative_switch_cost_is_rejected(random_workload, capsys):
+    with pytest.raises(SystemExit):
+        parse_args(["photo.jpg", "--switch-cost", "-1"])
+    assert "must be a non-negative integer" in capsys.readouterr().err
+    assert parse_args(["photo.jpg", "--switch-cost", "0"]).switch_cost == 0
+    with pytest.raises(ValueError):
+        QuantumTuner(random_workload(0), switch_cost=-2)
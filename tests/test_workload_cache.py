@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from profiling import PhaseProfiler  # noqa: E402
+from workload_cache import WorkloadCache, cached_workload  # noqa: E402
+
+
+def _image(seed=0, size=64):
+    pixels = (np.random.default_rng(seed).random((size, size, 3)) * 255).astype(np.uint8)
+    return Image.fromarray(pixels)
+
+
+def _profiler():
+    profiler = PhaseProfiler()
+    profiler.enabled = True
+    return profiler
+
+
+def test_cached_workload_times_its_steps(tmp_path):
+    cache = WorkloadCache(str(tmp_path))
+    miss = _profiler()
+    img, processes = cached_workload(cache, _image(), 4, 32, seed=1, profiler=miss)
+    assert set(miss.histograms) == {"cache", "resize", "measure", "workload"}
+    assert miss.histograms["cache"].count == 2 # Lookup and store
+
+    hit = _profiler()
+    again, repeat = cached_workload(cache, _image(), 4, 32, seed=1, profiler=hit)
+    assert set(hit.histograms) == {"cache", "workload"}
+    assert np.array_equal(np.asarray(again), np.asarray(img))
+    assert np.array_equal(repeat.column("burst"), processes.column("burst"))
+
+    # A worker's phases show up in the UI's profiler, with their own start times
+    panel = _profiler()
+    panel.merge(miss)
+    assert {name: h.count for name, h in panel.histograms.items()} == \
+        {name: h.count for name, h in miss.histograms.items()}
+    assert [round(d, 9) for _, _, d in panel.trace] == [round(d, 9) for _, _, d in miss.trace]
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = PhaseProfiler()
+    cached_workload(None, _image(), 4, 32, profiler=profiler)
+    profiler.record("resize", 0.0, 1.0)
+    assert profiler.histograms == {} and not profiler.trace
+
+
+def _put(cache, key, seed=0):
+    rng = np.random.default_rng(seed)
+    cache.put(key, _image(seed, 32), rng.integers(0, 50, 16), rng.integers(1, 20, 16), rng.integers(0, 8, 16))
+    return os.path.join(cache.directory, key + ".wl")
+
+
+def test_put_get_round_trip(tmp_path):
+    cache = WorkloadCache(str(tmp_path))
+    assert cache.get("a") is None and cache.misses == 1
+
+    rng = np.random.default_rng(0)
+    arrivals, burst, priority = rng.integers(0, 50, 16), rng.integers(1, 20, 16), rng.integers(0, 8, 16)
+    cache.put("a", _image(0, 32), arrivals, burst, priority)
+    entry = cache.get("a")
+    assert cache.hits == 1
+    assert isinstance(entry["pixels"], np.memmap) # Read through the map, not copied
+    assert np.array_equal(entry["pixels"], np.asarray(_image(0, 32)))
+    for name, expected in (("arrivals", arrivals), ("burst", burst), ("priority", priority)):
+        assert entry[name].dtype == np.int64 and np.array_equal(entry[name], expected)
+
+    (tmp_path / "b.wl").write_bytes(b"not a workload")
+    assert cache.get("b") is None and cache.misses == 2
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = WorkloadCache(str(tmp_path))
+    paths = [_put(cache, key, seed) for seed, key in enumerate("abc")]
+    for i, path in enumerate(paths):
+        os.utime(path, ns=(0, (i + 1) * 10**9)) # a oldest, c newest
+
+    cache.get("a") # Now the most recently used
+    cache.max_bytes = sum(os.path.getsize(path) for path in paths[1:]) + 1
+    cache.evict()
+    assert sorted(os.listdir(tmp_path)) == ["a.wl", "c.wl"]
+
+    # A put past the limit evicts on its own
+    _put(cache, "d", 3)
+    assert sorted(os.listdir(tmp_path)) == ["a.wl", "d.wl"]
+
+    cache.clear()
+    assert os.listdir(tmp_path) == [] and cache.max_bytes > 0
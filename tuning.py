@@ -0,0 +1,262 @@
+"""
+Time-quantum tuner: finds the quantum that minimizes a run metric.
+
+Headless simulations of one workload run for many quanta at once in a
+process pool, with the workload shared as in compare.py. The search goes
+coarse to fine: each round evaluates up to `points` quanta spread over the
+current bracket in parallel (geometrically in the first round, since the
+effect of a quantum is roughly multiplicative), then narrows the bracket
+to the tried neighbours of the best quantum so far, until every integer in
+it has been tried. An optional switch cost charges each context switch.
+
+Example:
+    python tuning.py photo.jpg --grid-size 50 --max-quantum 64 --switch-cost 1 --plot quanta.png
+"""
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import math
+import os
+import random
+
+import numpy as np
+
+from batch import ARRIVAL_MODES, load_resized, non_negative_int, positive_int
+from compare import SharedWorkload, run_policy
+from scheduler import QUANTUM_ALGORITHMS
+from smp import QUEUE_MODES
+from workload import build_processes
+
+# Metrics the tuner can minimize, by display name
+OBJECTIVES = {
+    "Avg. Turnaround": "avg_turnaround_time",
+    "p95 Turnaround": "turnaround_time_p95",
+    "Avg. Waiting": "avg_waiting_time",
+    "p95 Waiting": "waiting_time_p95",
+    "Avg. Response": "response_time_mean",
+}
+POINTS_PER_ROUND = 8            # Quanta per search round, at least (more with more workers)
+# Plotted against the quantum: (title, ((summary field, legend), ...))
+PLOT_PANELS = (
+    ("Turnaround time", (("avg_turnaround_time", "avg"), ("turnaround_time_p95", "p95"))),
+    ("Waiting time", (("avg_waiting_time", "avg"), ("waiting_time_p95", "p95"))),
+    ("Context switches", (("context_switches", "switches"),)),
+)
+SERIES_COLORS = ("#005f9e", "#dc3545")
+
+
+def search_points(lo, hi, count, geometric=False):
+    """Up to count distinct integer quanta spread over [lo, hi], both ends included."""
+    if hi - lo + 1 <= count:
+        return list(range(lo, hi + 1))
+    spread = np.geomspace(lo, hi, count) if geometric else np.linspace(lo, hi, count)
+    return sorted(set(np.rint(spread).astype(int).tolist()))
+
+
+class QuantumTuner:
+    """
+    Coarse-to-fine search for the best time quantum of one workload.
+
+    Same start()/poll()/shutdown() cycle as ComparisonRunner: poll()
+    returns the quanta evaluated since the last call and submits the next
+    round once one is complete. results maps every evaluated quantum to
+    its metrics summary; best is the lowest objective (fewest context
+    switches on ties). hi defaults to the longest burst, beyond which Round
+    Robin no longer cuts any run short. Raises ValueError unless
+    1 <= lo <= hi and switch_cost >= 0.
+    """
+
+    def __init__(self, processes, algorithm="Round Robin", lo=1, hi=None, objective="avg_turnaround_time",
+                 switch_cost=0, cores=1, queue_mode="Global", workers=None, points=None):
+        if lo < 1:
+            raise ValueError(f"smallest quantum must be at least 1, got {lo}")
+        if hi is not None and hi < lo:
+            raise ValueError(f"largest quantum {hi} is below the smallest quantum {lo}")
+        if switch_cost < 0:
+            raise ValueError(f"switch cost must be non-negative, got {switch_cost}")
+        self.processes = processes
+        self.algorithm = algorithm
+        self.lo = lo                # Current bracket
+        self.hi = hi or max(lo, int(processes.column("burst").max()))
+        self.objective = objective
+        self.switch_cost = switch_cost
+        self.cores = cores
+        self.queue_mode = queue_mode
+        self.workers = workers or os.cpu_count() or 1
+        self.points = points or max(POINTS_PER_ROUND, self.workers)
+        self.results = {}           # Stores {quantum: metrics summary}
+        self.rounds = 0
+        self.finished = False
+        self._futures = {}          # Stores {future: quantum}
+        self._pool = None
+        self._workload = None
+
+    @property
+    def best(self):
+        if not self.results:
+            return None
+        return min(self.results, key=lambda q: (self.results[q][self.objective],
+                                                self.results[q]["context_switches"], q))
+
+    def start(self):
+        self._workload = SharedWorkload(self.processes)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._submit_round()
+        return self
+
+    def poll(self):
+        """Collects evaluated quanta; re-raises a worker's exception."""
+        done = []
+        for future in [f for f in self._futures if f.done()]:
+            quantum = self._futures.pop(future)
+            self.results[quantum] = future.result()["summary"]
+            done.append(quantum)
+        if done and not self._futures:
+            self._narrow()
+            self._submit_round()
+        return done
+
+    def shutdown(self):
+        """Stops the pool, dropping queued runs, and frees the shared workload."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._workload is not None:
+            self._workload.close()
+            self._workload = None
+
+    def run(self):
+        """Blocks until the search is done; returns the best quantum."""
+        self.start()
+        try:
+            while not self.finished:
+                wait(list(self._futures), return_when=FIRST_COMPLETED)
+                self.poll()
+        finally:
+            self.shutdown()
+        return self.best
+
+    def _submit_round(self):
+        quanta = [q for q in search_points(self.lo, self.hi, self.points, geometric=self.rounds == 0)
+                  if q not in self.results]
+        if not quanta:
+            # Every quantum in the bracket has been tried
+            self.finished = True
+            self.shutdown()
+            return
+        self.rounds += 1
+        for quantum in quanta:
+            future = self._pool.submit(run_policy, self._workload.handle, self.algorithm, quantum,
+                                       self.cores, self.queue_mode, self.switch_cost, False)
+            self._futures[future] = quantum
+
+    def _narrow(self):
+        """Shrinks the bracket to the tried quanta on either side of the best one."""
+        best = self.best
+        tried = sorted(q for q in self.results if self.lo <= q <= self.hi)
+        i = tried.index(best)
+        self.lo = tried[i - 1] if i > 0 else best
+        self.hi = tried[i + 1] if i + 1 < len(tried) else best
+
+
+def plot_results(results, best=None, size=(640, 560)):
+    """
+    Stacked line charts of PLOT_PANELS against the quantum (log scale), with
+    the best quantum marked; returns a PIL image for the GUI or a PNG.
+    """
+    from PIL import Image, ImageDraw
+
+    width, height = size
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    quanta = sorted(results)
+    if not quanta:
+        return img
+    left, right, top = 60, width - 20, 10
+    panel_h = (height - top) // len(PLOT_PANELS)
+    lo, hi = math.log(quanta[0]), math.log(quanta[-1])
+
+    def x_of(q):
+        return left + (right - left) * ((math.log(q) - lo) / (hi - lo) if hi > lo else 0.5)
+
+    for n, (title, series) in enumerate(PLOT_PANELS):
+        y0 = top + n * panel_h + 18
+        y1 = top + (n + 1) * panel_h - 24
+        values = [results[q][field] for q in quanta for field, _ in series]
+        v_lo, v_hi = min(values), max(values)
+        span = (v_hi - v_lo) or 1
+
+        def y_of(v):
+            return y1 - (y1 - y0) * (v - v_lo) / span
+
+        draw.text((left, y0 - 16), title, fill="#333")
+        draw.rectangle((left, y0, right, y1), outline="#999")
+        draw.text((4, y0), f"{v_hi:.6g}", fill="#555")
+        draw.text((4, y1 - 10), f"{v_lo:.6g}", fill="#555")
+        for q in (quanta[0], best, quanta[-1]):
+            if q is not None:
+                draw.text((x_of(q) - 6, y1 + 4), str(q), fill="#555")
+        if best is not None:
+            draw.line((x_of(best), y0, x_of(best), y1), fill="#28a745", width=1)
+
+        legend_x = right - 80
+        for (field, label), color in zip(series, SERIES_COLORS):
+            points = [(x_of(q), y_of(results[q][field])) for q in quanta]
+            if len(points) > 1:
+                draw.line(points, fill=color, width=2)
+            for x, y in points:
+                draw.ellipse((x - 2, y - 2, x + 2, y + 2), fill=color)
+            draw.text((legend_x, y0 - 16), label, fill=color)
+            legend_x += 40
+    return img
+
+
+def format_results(results, best=None):
+    """Plain-text table of every evaluated quantum."""
+    fields = [field for _, series in PLOT_PANELS for field, _ in series]
+    lines = [f"{'quantum':>8}" + "".join(f"{field:>22}" for field in fields)]
+    for q in sorted(results):
+        marker = " *" if q == best else ""
+        lines.append(f"{q:>8}" + "".join(f"{results[q][field]:>22.3f}" for field in fields) + marker)
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Find the best time quantum for one image workload.")
+    parser.add_argument("image", help="Source image file.")
+    parser.add_argument("--grid-size", type=positive_int, default=10, metavar="N", help="Grid size N. Default: 10.")
+    parser.add_argument("--arrival", choices=ARRIVAL_MODES, default="random", help="Arrival mode. Default: random.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for random arrivals. Default: 0.")
+    parser.add_argument("--algorithm", choices=QUANTUM_ALGORITHMS, default="Round Robin",
+                        help="Algorithm to tune. Default: Round Robin.")
+    parser.add_argument("--objective", choices=tuple(OBJECTIVES.values()), default="avg_turnaround_time",
+                        help="Metric to minimize. Default: avg_turnaround_time.")
+    parser.add_argument("--min-quantum", type=positive_int, default=1, help="Smallest quantum. Default: 1.")
+    parser.add_argument("--max-quantum", type=positive_int, help="Largest quantum. Default: the longest burst.")
+    parser.add_argument("--switch-cost", type=non_negative_int, default=0,
+                        help="Time units per context switch. Default: 0.")
+    parser.add_argument("--cores", type=positive_int, default=1, help="Simulated CPUs. Default: 1.")
+    parser.add_argument("--queue-mode", choices=QUEUE_MODES, default="Global", help="Ready-queue layout with several CPUs.")
+    parser.add_argument("--workers", type=positive_int, help="Worker processes. Default: one per CPU.")
+    parser.add_argument("--plot", help="Save the charts to this image file (e.g. quanta.png).")
+    args = parser.parse_args(argv)
+    if args.max_quantum is not None and args.max_quantum < args.min_quantum:
+        parser.error(f"--max-quantum {args.max_quantum} is below --min-quantum {args.min_quantum}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    processes = build_processes(load_resized(args.image), args.grid_size, args.arrival == "random",
+                                random.Random(args.seed))
+    tuner = QuantumTuner(processes, args.algorithm, args.min_quantum, args.max_quantum, args.objective,
+                         args.switch_cost, args.cores, args.queue_mode, args.workers)
+    best = tuner.run()
+    print(format_results(tuner.results, best))
+    print(f"best quantum: {best} ({args.objective} = {tuner.results[best][args.objective]:.3f}, "
+          f"{len(tuner.results)} quanta in {tuner.rounds} rounds)")
+    if args.plot:
+        plot_results(tuner.results, best).save(args.plot)
+
+
+if __name__ == "__main__":
+    main()
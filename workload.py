@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+
+from process_table import ProcessTable
+
+
+def block_attributes(img, N):
+    """
+    Computes burst time and priority for every block of an N x N grid.
+
+    The image is converted to grayscale once and viewed as an
+    (N, N, block_h, block_w) array, so the per-block statistics are a few
+    vectorized reductions. Returns two (N, N) integer arrays indexed [y, x]
+    with exactly the values the per-block ImageStat loop produced.
+    """
+    width, height = img.size
+    block_w, block_h = width // N, height // N
+
+    # --- Burst Time (Complexity) ---
+    # Grayscale pixel standard deviation, computed the way ImageStat does
+    if block_w * block_h == 0:
+        burst = np.ones((N, N), dtype=np.int64)
+    else:
+        gray = np.asarray(img.convert("L"), dtype=np.int64)
+        blocks = gray[:N * block_h, :N * block_w].reshape(N, block_h, N, block_w).swapaxes(1, 2)
+        burst = burst_from_sums(blocks.sum(axis=(2, 3)), (blocks * blocks).sum(axis=(2, 3)), block_w * block_h)
+
+    return burst, grid_priorities(N)
+
+
+def burst_from_sums(total, total2, count):
+    """Burst times from per-block pixel sums and sums of squares (count pixels per block)."""
+    total = np.asarray(total, dtype=np.float64)
+    total2 = np.asarray(total2, dtype=np.float64)
+    stddev = np.sqrt((total2 - total ** 2.0 / count) / count)
+    return np.maximum(1, (stddev / 5).astype(np.int64) + 1)
+
+
+def grid_priorities(N):
+    """Priority of every block: distance from the center, lower number = higher priority."""
+    # int(2 * dist) is taken on doubled integer offsets, so it is exact
+    offsets = 2 * np.arange(N, dtype=np.int64) - N
+    dist2 = offsets[:, None] ** 2 + offsets[None, :] ** 2
+    return np.sqrt(dist2).astype(np.int64)
+
+
+def resize_for_grid(image, size):
+    """Resizes a source image to the square canvas the grid is laid over."""
+    from PIL import Image # Only needed with an image, so headless runs never load Pillow
+    return image.resize((size, size), Image.Resampling.LANCZOS)
+
+
+def make_arrival_times(count, random_arrival, rng=random):
+    """All zero, or staggered by 2 and shuffled with rng (random.Random or the random module)."""
+    if not random_arrival:
+        return [0] * count # All arrive at time 0
+    arrival_times = [i*2 for i in range(count)] # Stagger arrivals
+    rng.shuffle(arrival_times)
+    return arrival_times
+
+
+def build_processes(img, N, random_arrival=True, rng=random, attributes=None, arrivals=None):
+    """
+    Divides an already-resized image into an N x N grid of processes.
+
+    Returns a ProcessTable in PID order (row by row); its rows support the
+    same p['key'] access the old per-process dicts did. No Tk objects are
+    created, so this runs headless. attributes can pass precomputed
+    (burst, priority) arrays, e.g. measured on the full-resolution source,
+    and arrivals precomputed arrival times in PID order.
+    """
+    block_w = img.size[0] // N
+    block_h = img.size[1] // N
+    burst_times, priorities = attributes if attributes is not None else block_attributes(img, N)
+    arrival_times = arrivals if arrivals is not None else make_arrival_times(N * N, random_arrival, rng)
+
+    index = np.arange(N * N)
+    ys, xs = np.divmod(index, N)
+    return ProcessTable.from_columns(
+        pid=index + 1,
+        arrival=arrival_times,
+        burst=np.ravel(burst_times),
+        priority=np.ravel(priorities),
+        x=xs * block_w,
+        y=ys * block_h,
+        w=block_w,
+        h=block_h,
+    )
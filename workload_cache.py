@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import random
+import struct
+import tempfile
+from contextlib import nullcontext
+
+import numpy as np
+from PIL import Image
+
+from ingest import load_for_grid, source_block_attributes
+from workload import block_attributes, build_processes, make_arrival_times
+
+MAGIC = b"OSWLOAD1"
+ALIGN = 64                      # Array offsets are aligned so they can be mapped directly
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "os-scheduler-simulator", "workloads")
+
+
+class WorkloadCache:
+    """
+    Content-addressed, size-bounded cache of generated workloads on disk.
+
+    An entry is keyed by the source image's content hash and every parameter
+    that shapes the workload (canvas size, grid size, arrival mode, seed,
+    statistics mode). It holds the resized canvas pixels and the arrival,
+    burst and priority arrays in one file: a JSON header followed by
+    aligned raw arrays, read back through a memory map. File modification
+    times serve as the LRU clock; once the directory grows past max_bytes
+    the least recently used entries are deleted.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._digests = {}          # Stores {(path, size, mtime): content hash}
+        self.hits = 0
+        self.misses = 0
+
+    def image_digest(self, source, progress=None):
+        """SHA-256 of a source file's bytes (memoized per path and mtime), or of an Image's pixels."""
+        if not isinstance(source, str):
+            h = hashlib.sha256(f"{source.mode}{source.size}".encode())
+            h.update(source.tobytes())
+            return h.hexdigest()
+
+        stat = os.stat(source)
+        memo = (os.path.abspath(source), stat.st_size, stat.st_mtime_ns)
+        digest = self._digests.get(memo)
+        if digest is None:
+            h = hashlib.sha256()
+            done = 0
+            with open(source, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+                    done += len(chunk)
+                    if progress is not None:
+                        progress(done / stat.st_size)
+            digest = self._digests[memo] = h.hexdigest()
+        return digest
+
+    def key(self, digest, size, N, random_arrival, seed, source_stats=False):
+        params = {
+            "image": digest, "size": size, "N": N, "random_arrival": bool(random_arrival),
+            # The seed only matters for random arrivals
+            "seed": seed if random_arrival else None, "source_stats": bool(source_stats),
+        }
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".wl")
+
+    def get(self, key):
+        """Returns {"pixels", "arrivals", "burst", "priority"} arrays for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            data = np.memmap(path, dtype=np.uint8, mode="r")
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            self.misses += 1
+            return None
+
+        (header_len,) = struct.unpack_from("<I", data, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(data[start:start + header_len]))
+        entry = {}
+        for name, (dtype, shape, offset) in header["arrays"].items():
+            count = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            entry[name] = data[offset:offset + count].view(dtype).reshape(shape)
+        os.utime(path) # Mark as recently used
+        self.hits += 1
+        return entry
+
+    def put(self, key, img, arrivals, burst, priority):
+        """Stores one workload, then evicts least recently used entries past max_bytes."""
+        arrays = {
+            "pixels": np.asarray(img),
+            "arrivals": np.asarray(arrivals, dtype=np.int64),
+            "burst": np.asarray(burst, dtype=np.int64),
+            "priority": np.asarray(priority, dtype=np.int64),
+        }
+        layout, offset = {}, 0
+        for name, array in arrays.items():
+            layout[name] = [array.dtype.str, list(array.shape), offset]
+            offset += -(-array.nbytes // ALIGN) * ALIGN
+
+        # Offsets so far are relative to the end of the header; the 64 bytes of
+        # slack cover the header growing once the real offsets are filled in
+        header = {"arrays": layout}
+        base = -(-(len(MAGIC) + 4 + len(json.dumps(header)) + 64) // ALIGN) * ALIGN
+        for entry in layout.values():
+            entry[2] += base
+        encoded = json.dumps(header).encode()
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+            for name, array in arrays.items():
+                f.seek(layout[name][2])
+                f.write(np.ascontiguousarray(array).tobytes())
+        os.replace(tmp, self._path(key)) # Readers never see a half-written entry
+        self.evict()
+
+    def evict(self):
+        """Deletes least recently used entries until the cache fits in max_bytes."""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(".wl")]
+        except FileNotFoundError:
+            return
+        entries = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        saved, self.max_bytes = self.max_bytes, 0
+        try:
+            self.evict()
+        finally:
+            self.max_bytes = saved
+
+
+def _scaled(progress, start, end):
+    """Maps a sub-step's 0..1 progress onto start..end of the overall progress."""
+    if progress is None:
+        return None
+    return lambda fraction: progress(start + (end - start) * fraction)
+
+
+def cached_workload(cache, source, N, size, random_arrival=True, seed=0, source_stats=False, progress=None,
+                    profiler=None):
+    """
+    Returns (canvas image, processes) for a source path or Image, from the cache when possible.
+
+    On a miss the image is decoded at canvas size, the block statistics
+    and arrivals (random.Random(seed)) are computed and the result is
+    stored. cache may be None to always compute. progress, if given, is
+    called as progress(fraction, status=None) between steps, e.g. a
+    BackgroundJob's progress(), which also lets the job be cancelled there.
+    Each step is timed as a phase of profiler (a PhaseProfiler), if given.
+    """
+    report = progress or (lambda fraction, status=None: None)
+    phase = profiler.phase if profiler is not None else lambda name: nullcontext()
+    key = None
+    if cache is not None:
+        report(0.0, "Hashing image")
+        with phase("cache"):
+            key = cache.key(cache.image_digest(source, _scaled(progress, 0.0, 0.2)), size, N, random_arrival, seed,
+                            source_stats)
+            entry = cache.get(key)
+        if entry is not None:
+            report(0.9, "Reading cached workload")
+            with phase("workload"):
+                img = Image.fromarray(np.array(entry["pixels"]))
+                processes = build_processes(img, N, attributes=(entry["burst"], entry["priority"]),
+                                            arrivals=entry["arrivals"])
+            return img, processes
+
+    report(0.2, "Decoding image")
+    with phase("resize"):
+        img = load_for_grid(source, size)
+        if img.mode not in ("L", "RGB", "RGBA"):
+            img = img.convert("RGB") # Palette and other modes are stored as plain RGB
+    report(0.5, "Measuring blocks")
+    with phase("measure"):
+        if source_stats and isinstance(source, str):
+            burst, priority = source_block_attributes(source, N, progress=_scaled(progress, 0.5, 0.85))
+        else:
+            burst, priority = block_attributes(img, N)
+    report(0.85, "Building processes")
+    with phase("workload"):
+        arrivals = make_arrival_times(N * N, random_arrival, random.Random(seed))
+        processes = build_processes(img, N, attributes=(burst, priority), arrivals=arrivals)
+    if cache is not None:
+        with phase("cache"):
+            try:
+                cache.put(key, img, arrivals, burst, priority)
+            except OSError:
+                pass # A read-only or full cache directory only costs the speed-up
+    return img, processes